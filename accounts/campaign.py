@@ -0,0 +1,126 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F
+from django.template import Context, Template
+
+from accounts.models import AccountEmail, AccountEmailLog
+
+logger = logging.getLogger(__name__)
+
+
+def contact_context(contact):
+    name = " ".join(part for part in (contact.first_name, contact.last_name) if part)
+    return {"email": contact.primary_email or "", "name": name}
+
+
+class CampaignSender:
+    """
+    Send an AccountEmail to its recipient contacts.
+
+    The message template is compiled once, contacts that already have a
+    sent log are skipped with one query, messages go out in batches of
+    ``batch_size`` over a single mail connection and the logs of each
+    batch are bulk inserted. Totals are added to the email's
+    ``sent_count``/``failed_count``/``send_seconds`` with F() updates, so
+    chunks sent by parallel tasks add up.
+    """
+
+    def __init__(self, email, batch_size=None, connection=None):
+        self.email = email
+        self.batch_size = batch_size or settings.EMAIL_CAMPAIGN_BATCH_SIZE
+        self.connection = connection
+        self.template = Template(email.message_body or "")
+        self.stats = {"recipients": 0, "skipped": 0, "sent": 0, "failed": 0, "batches": 0}
+
+    def pending_contacts(self, contact_ids=None):
+        """Recipients (among ``contact_ids``) nothing was sent to yet."""
+        sent = set(
+            AccountEmailLog.objects.filter(email=self.email, is_sent=True).values_list(
+                "contact_id", flat=True
+            )
+        )
+        contacts = self.email.recipients.all()
+        if contact_ids is not None:
+            contacts = contacts.filter(id__in=contact_ids)
+        pending = []
+        for contact in contacts.only("id", "primary_email", "first_name", "last_name"):
+            self.stats["recipients"] += 1
+            if contact.id in sent or not contact.primary_email:
+                self.stats["skipped"] += 1
+            else:
+                pending.append(contact)
+        return pending
+
+    def message(self, contact):
+        html = self.template.render(Context(contact_context(contact)))
+        message = EmailMessage(
+            self.email.message_subject,
+            html,
+            from_email=self.email.from_email,
+            to=[contact.primary_email],
+        )
+        message.content_subtype = "html"
+        return message
+
+    def send_batch(self, connection, contacts, messages):
+        """
+        Contacts whose message went out. Messages go one by one over the open
+        connection: the SMTP backend stops at the first failure of a
+        send_messages() call after delivering the messages before it, so a
+        whole-batch retry would send those twice.
+        """
+        delivered = []
+        for contact, message in zip(contacts, messages):
+            try:
+                if connection.send_messages([message]):
+                    delivered.append(contact)
+            except Exception:
+                logger.exception("email %s: sending to %s failed", self.email.id, contact.id)
+        return delivered
+
+    def run(self, contact_ids=None):
+        start = time.perf_counter()
+        contacts = self.pending_contacts(contact_ids)
+        rendered_body = None
+        if contacts:
+            connection = self.connection or get_connection()
+            with connection:
+                for offset in range(0, len(contacts), self.batch_size):
+                    batch = contacts[offset : offset + self.batch_size]
+                    messages = [self.message(contact) for contact in batch]
+                    rendered_body = rendered_body or messages[0].body
+                    delivered = self.send_batch(connection, batch, messages)
+                    AccountEmailLog.objects.bulk_create(
+                        [
+                            AccountEmailLog(email=self.email, contact=contact, is_sent=True)
+                            for contact in delivered
+                        ]
+                    )
+                    self.stats["batches"] += 1
+                    self.stats["sent"] += len(delivered)
+                    self.stats["failed"] += len(batch) - len(delivered)
+
+        seconds = time.perf_counter() - start
+        self.stats["seconds"] = round(seconds, 4)
+        self.stats["per_second"] = round(self.stats["sent"] / seconds, 1) if seconds else 0
+        updates = {
+            "sent_count": F("sent_count") + self.stats["sent"],
+            "failed_count": F("failed_count") + self.stats["failed"],
+            "send_seconds": F("send_seconds") + seconds,
+        }
+        if rendered_body is not None:
+            updates["rendered_message_body"] = rendered_body
+        AccountEmail.objects.filter(id=self.email.id).update(**updates)
+        logger.info(
+            "email %s: sent %s, failed %s, skipped %s in %.2fs (%s/s)",
+            self.email.id,
+            self.stats["sent"],
+            self.stats["failed"],
+            self.stats["skipped"],
+            seconds,
+            self.stats["per_second"],
+        )
+        return self.stats
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.14 on 2026-10-18 15:11
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.timezone import localtime
+
+from common.utils import convert_to_custom_timezone
+
+
+def schedule_pending_emails(apps, schema_editor):
+    """Give scheduled emails nothing was sent for yet a due_at."""
+    AccountEmail = apps.get_model("accounts", "AccountEmail")
+    pending = AccountEmail.objects.filter(
+        scheduled_later=True, scheduled_date_time__isnull=False
+    ).exclude(email_log__is_sent=True)
+    for email in pending.iterator():
+        email.due_at = convert_to_custom_timezone(
+            localtime(email.scheduled_date_time), email.timezone or "UTC", to_utc=True
+        )
+        email.save(update_fields=["due_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_account_account_org_created_idx'),
+        ('contacts', '0006_contact_contact_org_created_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accountemail',
+            name='dispatched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='accountemail',
+            name='due_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='accountemail',
+            index=models.Index(condition=models.Q(('due_at__isnull', False)), fields=['due_at'], name='account_email_due_idx'),
+        ),
+        migrations.RunPython(schedule_pending_emails, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.14 on 2026-10-18 15:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_account_email_due_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accountemail',
+            name='failed_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='accountemail',
+            name='send_seconds',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='accountemail',
+            name='sent_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
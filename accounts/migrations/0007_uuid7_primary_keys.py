@@ -0,0 +1,34 @@
+# Generated by Django 5.0.14 on 2026-10-18 15:46
+
+import common.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_account_email_send_stats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='account',
+            name='id',
+            field=models.UUIDField(db_index=True, default=common.ids.uuid7, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='accountemail',
+            name='id',
+            field=models.UUIDField(db_index=True, default=common.ids.uuid7, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='accountemaillog',
+            name='id',
+            field=models.UUIDField(db_index=True, default=common.ids.uuid7, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='tags',
+            name='id',
+            field=models.UUIDField(db_index=True, default=common.ids.uuid7, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+    ]
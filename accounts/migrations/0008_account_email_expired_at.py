@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accountemail',
+            name='expired_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
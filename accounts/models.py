@@ -1,6 +1,7 @@
 import arrow
 from django.db import models
 from django.utils.text import slugify
+from django.utils.timezone import localtime
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import pgettext_lazy
 from phonenumber_field.modelfields import PhoneNumberField
@@ -93,6 +94,12 @@ class Account(BaseModel):
         verbose_name_plural = "Accounts"
         db_table = "accounts"
         ordering = ("-created_at",)
+        # keyset pagination of the list views (common.pagination)
+        indexes = [
+            models.Index(
+                fields=["org", "-created_at", "-id"], name="account_org_created_idx"
+            )
+        ]
 
     def __str__(self):
         return f"{self.name}"
@@ -152,16 +159,54 @@ class AccountEmail(BaseModel):
     scheduled_later = models.BooleanField(default=False)
     from_email = models.EmailField()
     rendered_message_body = models.TextField(null=True)
+    # scheduled_date_time in UTC, cleared once accounts.scheduler claims it
+    due_at = models.DateTimeField(null=True, blank=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    # set instead of dispatched_at when it was too late to send
+    expired_at = models.DateTimeField(null=True, blank=True)
+    # running totals of accounts.campaign.CampaignSender runs
+    sent_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    send_seconds = models.FloatField(default=0)
 
     class Meta:
         verbose_name = "Account Email"
         verbose_name_plural = "Account Emails"
         db_table = "account_email"
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(
+                fields=["due_at"],
+                name="account_email_due_idx",
+                condition=models.Q(due_at__isnull=False),
+            )
+        ]
 
     def __str__(self):
         return f"{self.message_subject}"
 
+    def save(self, *args, **kwargs):
+        if (
+            self.scheduled_later and self.scheduled_date_time
+            and not self.dispatched_at and not self.expired_at
+        ):
+            self.due_at = self.get_due_at()
+        super().save(*args, **kwargs)
+
+    def get_due_at(self):
+        """
+        scheduled_date_time is the wall-clock time the sender picked in
+        their ``timezone``; the same moment in UTC.
+        """
+        return utils.convert_to_custom_timezone(
+            localtime(self.scheduled_date_time), self.timezone or "UTC", to_utc=True
+        )
+
+    @property
+    def send_rate(self):
+        """Messages sent per second of sending, across all runs."""
+        return round(self.sent_count / self.send_seconds, 1) if self.send_seconds else 0
+
 class AccountEmailLog(BaseModel):
     """this model is used to track if the email is sent or not"""
 
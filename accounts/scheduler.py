@@ -0,0 +1,38 @@
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import AccountEmail
+
+
+def claim_due_emails(now=None, batch_size=None):
+    """
+    Claim up to ``batch_size`` scheduled emails whose due time has passed,
+    oldest first, and return (ids to send, ids expired).
+
+    Rows are locked with SKIP LOCKED and their ``due_at`` cleared in the
+    same transaction, so schedulers running on several workers at once
+    never claim the same email, and a late or missed run picks up
+    everything that fell due in the meantime. Emails more than
+    SCHEDULED_EMAIL_MAX_DELAY seconds overdue are expired instead of sent;
+    ``expired_at`` keeps a later save() from scheduling them again.
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or settings.SCHEDULED_EMAIL_BATCH_SIZE
+    oldest = now - datetime.timedelta(seconds=settings.SCHEDULED_EMAIL_MAX_DELAY)
+    with transaction.atomic():
+        rows = list(
+            AccountEmail.objects.select_for_update(skip_locked=True)
+            .filter(due_at__lte=now)
+            .order_by("due_at")
+            .values_list("id", "due_at")[:batch_size]
+        )
+        due = [pk for pk, due_at in rows if due_at >= oldest]
+        expired = [pk for pk, due_at in rows if due_at < oldest]
+        if due:
+            AccountEmail.objects.filter(id__in=due).update(due_at=None, dispatched_at=now)
+        if expired:
+            AccountEmail.objects.filter(id__in=expired).update(due_at=None, expired_at=now)
+    return due, expired
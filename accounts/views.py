@@ -7,7 +7,6 @@ from drf_rw_serializers import generics
 
 from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
 from rest_framework import status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -29,6 +28,7 @@ from accounts.serializer import (
 from teams.serializer import TeamsSerializer
 from accounts.tasks import send_email, send_email_to_assigned_user
 from cases.serializer import CaseSerializer
+from common.pagination import KeysetPagination
 from common.models import Attachments, Comment, Profile
 from leads.models import Lead
 from leads.serializer import LeadSerializer
@@ -56,7 +56,7 @@ from tasks.serializer import TaskSerializer
 from teams.models import Teams
 
 
-class AccountsListView(APIView, LimitOffsetPagination):
+class AccountsListView(APIView, KeysetPagination):
     #authentication_classes = (CustomDualAuthentication,)
     permission_classes = (IsAuthenticated,)
     model = Account
@@ -64,7 +64,7 @@ class AccountsListView(APIView, LimitOffsetPagination):
 
     def get_context_data(self, **kwargs):
         params = self.request.query_params
-        queryset = self.model.objects.filter(org=self.request.profile.org).order_by("-id")
+        queryset = self.model.objects.filter(org=self.request.profile.org)
         if self.request.profile.role != "ADMIN" and not self.request.profile.is_admin:
             queryset = queryset.filter(
                 Q(created_by=self.request.profile.user) | Q(assigned_to=self.request.profile)
@@ -85,14 +85,9 @@ class AccountsListView(APIView, LimitOffsetPagination):
         context = {}
         queryset_open = queryset.filter(status="open")
         results_accounts_open = self.paginate_queryset(
-            queryset_open.distinct(), self.request, view=self
+            queryset_open.distinct(), self.request, view=self, cursor_query_param="open_cursor"
         )
-        if results_accounts_open:
-            offset = queryset_open.filter(id__gte=results_accounts_open[-1].id).count()
-            if offset == queryset_open.count():
-                offset = None
-        else:
-            offset = 0
+        offset = self.get_next_offset(results_accounts_open)
         accounts_open = AccountSerializer(results_accounts_open, many=True).data
         context["per_page"] = 10
         page_number = (int(self.offset / 10) + 1,)
@@ -104,16 +99,9 @@ class AccountsListView(APIView, LimitOffsetPagination):
 
         queryset_close = queryset.filter(status="close")
         results_accounts_close = self.paginate_queryset(
-            queryset_close.distinct(), self.request, view=self
+            queryset_close.distinct(), self.request, view=self, cursor_query_param="close_cursor"
         )
-        if results_accounts_close:
-            offset = queryset_close.filter(
-                id__gte=results_accounts_close[-1].id
-            ).count()
-            if offset == queryset_close.count():
-                offset = None
-        else:
-            offset = 0
+        offset = self.get_next_offset(results_accounts_close)
         accounts_close = AccountSerializer(results_accounts_close, many=True).data
 
         contacts = Contact.objects.filter(org=self.request.profile.org).values(
@@ -621,11 +609,10 @@ class AccountCreateMailView(APIView):
                         email_obj.delete()
                         data["recipients"] = "Please enter valid recipient"
                         return Response({"error": True, "errors": data})
-            if data.get("scheduled_later") != "true":
+            # scheduled emails are queued by accounts.tasks.send_scheduled_emails
+            # once the due_at set by AccountEmail.save has passed
+            if not email_obj.scheduled_later:
                 send_email.delay(email_obj.id)
-            else:
-                email_obj.scheduled_later = True
-                email_obj.scheduled_date_time = scheduled_date_time
             return Response(
                 {"error": False, "message": "Email sent successfully"},
                 status=status.HTTP_200_OK,
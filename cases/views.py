@@ -3,7 +3,6 @@ import json
 from django.db.models import Q
 from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
 from rest_framework import status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -14,6 +13,7 @@ from cases import swagger_params1
 from cases.models import Case
 from cases.serializer import CaseCreateSerializer, CaseSerializer,CaseCreateSwaggerSerializer,CaseDetailEditSwaggerSerializer,CaseCommentEditSwaggerSerializer
 from cases.tasks import send_email_to_assigned_user
+from common.pagination import KeysetPagination
 from common.models import Attachments, Comment, Profile
 
 #from common.external_auth import CustomDualAuthentication
@@ -24,14 +24,14 @@ from contacts.serializer import ContactSerializer
 from teams.models import Teams
 
 
-class CaseListView(APIView, LimitOffsetPagination):
+class CaseListView(APIView, KeysetPagination):
     #authentication_classes = (CustomDualAuthentication,)
     permission_classes = (IsAuthenticated,)
     model = Case
 
     def get_context_data(self, **kwargs):
         params = self.request.query_params
-        queryset = self.model.objects.filter(org=self.request.profile.org).order_by("-id")
+        queryset = self.model.objects.filter(org=self.request.profile.org)
         accounts = Account.objects.filter(org=self.request.profile.org).order_by("-id")
         contacts = Contact.objects.filter(org=self.request.profile.org).order_by("-id")
         profiles = Profile.objects.filter(is_active=True, org=self.request.profile.org)
@@ -62,12 +62,7 @@ class CaseListView(APIView, LimitOffsetPagination):
         results_cases = self.paginate_queryset(queryset, self.request, view=self)
         cases = CaseSerializer(results_cases, many=True).data
 
-        if results_cases:
-            offset = queryset.filter(id__gte=results_cases[-1].id).count()
-            if offset == queryset.count():
-                offset = None
-        else:
-            offset = 0
+        offset = self.get_next_offset(results_cases)
         context.update(
             {
                 "cases_count": self.count,
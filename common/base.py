@@ -1,20 +1,111 @@
-import uuid
-
 # Django imports
 from django.db import models
+from django.utils import timezone
 
 # Third party imports
-from crum import get_current_user
+from crum import get_current_request, get_current_user
 
 # Module imports
+from common.ids import uuid7
 from common.mixins import AuditModel
 
+# "stamp the user of the current request", as BaseModel.save does
+CURRENT_USER = object()
+
+
+def audit_user(user=CURRENT_USER):
+    if user is CURRENT_USER:
+        user = get_current_user()
+    if user is None or user.is_anonymous:
+        return None
+    return user
+
+
+def audit_value(field, user, profile):
+    """Id for the audit foreign key ``field``: the user, or the profile on models
+    whose created_by points to Profile (the request's profile by default)."""
+    if field.related_model._meta.model_name != "profile":
+        return user.pk if user else None
+    if profile is None:
+        profile = getattr(get_current_request(), "profile", None)
+        if profile is None or user is None or profile.user_id != user.pk:
+            return None
+    return profile.pk
+
+
+class BaseQuerySet(models.QuerySet):
+    """
+    Bulk writes that keep the audit columns BaseModel.save fills in.
+
+    ``create_batch``/``update_batch`` stamp created_by/updated_by (the
+    current user unless ``user`` is given), ids and updated_at of the
+    whole batch at once and then write it with bulk_create/bulk_update;
+    ``set_m2m`` replaces the M2M links of many objects in two statements.
+    Like bulk_create they send no post_save signals.
+    """
+
+    def stamp(self, objs, user=CURRENT_USER, profile=None, adding=True):
+        user = audit_user(user)
+        now = timezone.now()
+        audit = {}
+        for name in ("created_by", "updated_by") if adding else ("updated_by",):
+            field = self.model._meta.get_field(name)
+            audit[field.attname] = audit_value(field, user, profile)
+        for obj in objs:
+            if adding:
+                if obj.pk is None:
+                    obj.pk = uuid7()
+                # explicit creators (e.g. of an import) are kept
+                if obj.created_by_id is None:
+                    obj.created_by_id = audit["created_by_id"]
+            else:
+                # bulk_update skips auto_now, bulk_create applies it
+                obj.updated_at = now
+            obj.updated_by_id = audit["updated_by_id"]
+        return objs
+
+    def create_batch(self, objs, user=CURRENT_USER, profile=None, batch_size=1000, **kwargs):
+        objs = self.stamp(list(objs), user, profile)
+        return self.bulk_create(objs, batch_size=batch_size, **kwargs)
+
+    def update_batch(self, objs, fields, user=CURRENT_USER, batch_size=1000):
+        objs = self.stamp(list(objs), user, adding=False)
+        fields = list(dict.fromkeys([*fields, "updated_at", "updated_by"]))
+        return self.bulk_update(objs, fields, batch_size=batch_size)
+
+    def set_m2m(self, field_name, links, clear=True, batch_size=1000):
+        """
+        ``links`` maps each object (or its pk) to the related pks it should
+        be linked to. Existing links of those objects are deleted first
+        unless ``clear`` is False.
+        """
+        field = self.model._meta.get_field(field_name)
+        through = field.remote_field.through
+        source = field.m2m_field_name() + "_id"
+        target = field.m2m_reverse_field_name() + "_id"
+        links = {getattr(obj, "pk", obj): related for obj, related in links.items()}
+        if clear:
+            through.objects.filter(**{source + "__in": list(links)}).delete()
+        rows = [
+            through(**{source: pk, target: related_pk})
+            for pk, related_objs in links.items()
+            for related_pk in dict.fromkeys(getattr(obj, "pk", obj) for obj in related_objs)
+        ]
+        return through.objects.bulk_create(
+            rows, batch_size=batch_size, ignore_conflicts=not clear
+        )
+
+
+BaseManager = models.Manager.from_queryset(BaseQuerySet)
+
 
 class BaseModel(AuditModel):
     id = models.UUIDField(
-        default=uuid.uuid4, unique=True, editable=False, db_index=True, primary_key=True
+        default=uuid7, unique=True, editable=False, db_index=True, primary_key=True
     )
 
+    objects = BaseManager()
+
     class Meta:
         abstract = True
 
@@ -35,4 +126,4 @@ class BaseModel(AuditModel):
             super(BaseModel, self).save(*args, **kwargs)
 
     def __str__(self):
-        return str(self.id)
\ No newline at end of file
+        return str(self.id)
@@ -0,0 +1,262 @@
+import json
+import math
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+import uuid
+
+from django.core.cache import cache
+from django.db import connection, models
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from common.ids import uuid7
+from common.middleware.get_company import GetProfileAndOrg
+from common.middleware.metrics import QueryCounter
+
+# name -> url of the list endpoints that grow with the org
+BENCHMARK_ENDPOINTS = {
+    "leads": "/api/leads/",
+    "leads-flat": "/api/leads/?flat=true",
+    "contacts": "/api/contacts/",
+    "accounts": "/api/accounts/",
+    "home": "/api/dashboard/",
+    "dashboard": "/api/dashboard/?mode=dashboard",
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def api_client(profile):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION="Bearer %s" % AccessToken.for_user(profile.user),
+        HTTP_ORG=str(profile.org_id),
+    )
+    return client
+
+
+def measure(client, url, repeat=20, warmup=2, cold=False):
+    """
+    Latency percentiles, SQL queries and peak Python memory of GET ``url``.
+
+    Timed runs go without tracemalloc, whose hooks slow allocations down;
+    one extra traced run measures the peak. ``cold`` clears the cache
+    before every request so cached views are measured on a miss.
+    """
+    for _ in range(warmup):
+        client.get(url)
+    durations = []
+    queries = []
+    status = None
+    for _ in range(repeat):
+        if cold:
+            cache.clear()
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            response = client.get(url)
+            durations.append(time.perf_counter() - start)
+        queries.append(counter.count)
+        status = response.status_code
+
+    if cold:
+        cache.clear()
+    tracemalloc.start()
+    try:
+        client.get(url)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "url": url,
+        "status": status,
+        "runs": repeat,
+        "p50_ms": round(percentile(durations, 50) * 1000, 2),
+        "p95_ms": round(percentile(durations, 95) * 1000, 2),
+        "mean_ms": round(statistics.mean(durations) * 1000, 2),
+        "queries": max(queries),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def measure_auth(profile, repeat=200, warmup=2):
+    """
+    Per-request cost of authenticating a JWT request on its own: the
+    profile middleware followed by the configured DRF authenticators,
+    without routing or a view.
+    """
+    token = str(AccessToken.for_user(profile.user))
+    factory = APIRequestFactory()
+    middleware = GetProfileAndOrg(lambda request: None)
+
+    def authenticate():
+        request = factory.get(
+            "/api/profile/", HTTP_AUTHORIZATION="Bearer %s" % token, HTTP_ORG=str(profile.org_id)
+        )
+        middleware.process_request(request)
+        authenticators = [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+        return Request(request, authenticators=authenticators).user
+
+    for _ in range(warmup):
+        authenticate()
+    durations = []
+    queries = []
+    user = None
+    for _ in range(repeat):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            user = authenticate()
+            durations.append(time.perf_counter() - start)
+        queries.append(counter.count)
+
+    tracemalloc.start()
+    try:
+        authenticate()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "url": "auth",
+        "status": 200 if user is not None and user.is_authenticated else 401,
+        "runs": repeat,
+        "p50_ms": round(percentile(durations, 50) * 1000, 3),
+        "p95_ms": round(percentile(durations, 95) * 1000, 3),
+        "mean_ms": round(statistics.mean(durations) * 1000, 3),
+        "queries": max(queries),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+# primary key generators compared by measure_pk_inserts
+PK_GENERATORS = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+def measure_pk_inserts(name, rows, batch_size=10000):
+    """
+    Insert ``rows`` rows keyed by the ``name`` generator into a scratch
+    table with a UUID primary key (the column type BaseModel uses) and
+    report the insert rate overall and over the batches holding the last
+    10% of the rows, when the primary key index is largest, plus its size
+    on PostgreSQL.
+    """
+    generate = PK_GENERATORS[name]
+    table = "benchmark_pk_%s" % name
+    quote = connection.ops.quote_name
+    id_field = models.UUIDField()
+    id_type = id_field.db_type(connection)
+    sql = "INSERT INTO %s (id, payload) VALUES (%%s, %%s)" % quote(table)
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS %s" % quote(table))
+        cursor.execute(
+            "CREATE TABLE %s (id %s PRIMARY KEY, payload varchar(64) NOT NULL)"
+            % (quote(table), id_type)
+        )
+    durations = []
+    tail_from = rows - rows // 10
+    tail_rows = tail_seconds = 0
+    try:
+        for offset in range(0, rows, batch_size):
+            count = min(batch_size, rows - offset)
+            values = [
+                (id_field.get_db_prep_value(generate(), connection), "row %s" % i)
+                for i in range(offset, offset + count)
+            ]
+            start = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.executemany(sql, values)
+            seconds = time.perf_counter() - start
+            durations.append(seconds)
+            if offset + count > tail_from:
+                tail_rows += count
+                tail_seconds += seconds
+        index_kb = None
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_relation_size(%s)", [table + "_pkey"])
+                index_kb = round(cursor.fetchone()[0] / 1024)
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS %s" % quote(table))
+    total = sum(durations)
+    return {
+        "generator": name,
+        "rows": rows,
+        "seconds": round(total, 2),
+        "rows_per_s": round(rows / total) if total else 0,
+        "tail_rows_per_s": round(tail_rows / tail_seconds) if tail_seconds else 0,
+        "index_kb": index_kb,
+    }
+
+
+def run_benchmark(profile, endpoints=None, repeat=20, warmup=2, cold=False):
+    """Measure every endpoint (name -> url) as ``profile``."""
+    client = api_client(profile)
+    endpoints = endpoints or BENCHMARK_ENDPOINTS
+    return {
+        name: measure(client, url, repeat=repeat, warmup=warmup, cold=cold)
+        for name, url in endpoints.items()
+    }
+
+
+def environment():
+    return {
+        "database": connection.vendor,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+    }
+
+
+def compare(results, baseline, tolerance=0.25):
+    """
+    Regressions of ``results`` against a stored baseline: p95 latency or
+    peak memory above the baseline by more than ``tolerance``, or any
+    extra SQL query (query counts are deterministic).
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        if result["status"] != before["status"]:
+            regressions.append(
+                "%s: status %s (baseline %s)" % (name, result["status"], before["status"])
+            )
+        if result["queries"] > before["queries"]:
+            regressions.append(
+                "%s: %s queries (baseline %s)" % (name, result["queries"], before["queries"])
+            )
+        for field in ("p95_ms", "peak_kb"):
+            if result[field] > before[field] * (1 + tolerance):
+                regressions.append(
+                    "%s: %s %s (baseline %s)" % (name, field, result[field], before[field])
+                )
+    return regressions
+
+
+def load_baseline(path):
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baseline(path, results, volumes):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as baseline_file:
+        json.dump(
+            {"environment": environment(), "volumes": volumes, "results": results},
+            baseline_file,
+            indent=2,
+            sort_keys=True,
+        )
+        baseline_file.write("\n")
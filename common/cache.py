@@ -0,0 +1,253 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS
+
+from common.models import Org, Profile, User
+
+VERSION_KEY_PREFIX = "crm:version:"
+
+
+def get_shared_cache():
+    """Cache backend shared between worker processes (Redis or local memory)."""
+    return caches[getattr(settings, "CRM_CACHE_ALIAS", "default")]
+
+
+def is_shared_between_processes(cache):
+    """False for backends each worker process keeps to itself."""
+    return not isinstance(cache, (LocMemCache, DummyCache))
+
+
+def cache_versions(*scopes):
+    """Return the current version token of every scope, "0" if never bumped."""
+    keys = [VERSION_KEY_PREFIX + scope for scope in scopes]
+    found = get_shared_cache().get_many(keys)
+    return {scope: found.get(key, "0") for scope, key in zip(scopes, keys)}
+
+
+def bump_cache_version(*scopes):
+    """Invalidate every cache entry that was built against one of the scopes."""
+    get_shared_cache().set_many(
+        {VERSION_KEY_PREFIX + scope: uuid.uuid4().hex for scope in scopes},
+        timeout=None,
+    )
+
+
+def dump_instance(instance, exclude=()):
+    """Serialize the concrete fields of a model instance to JSON-safe strings."""
+    data = {}
+    for field in instance._meta.concrete_fields:
+        if field.name in exclude:
+            continue
+        value = field.value_from_object(instance)
+        data[field.attname] = None if value is None else field.value_to_string(instance)
+    return data
+
+
+def load_instance(model, data):
+    """Rebuild an instance from ``dump_instance`` output; excluded fields are deferred."""
+    values = {}
+    for attname, value in data.items():
+        field = model._meta.get_field(attname)
+        values[attname] = None if value is None else field.to_python(value)
+    return model.from_db(DEFAULT_DB_ALIAS, list(values), list(values.values()))
+
+
+class LRUCache:
+    """Small thread-safe per-process LRU with a per-entry time to live."""
+
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class ProfileCache:
+    """
+    Two level cache for the Profile/Org pair and the User resolved by
+    common.request_auth.
+
+    Entries are kept in a per-process LRU and in the shared cache. Shared
+    entries are signed so a tampered cache cannot hand out a foreign profile,
+    and every entry records the version of the ``user:<id>`` and ``org:<id>``
+    scopes it was built from; the Profile/Org signals bump those versions.
+
+    The versions only reach other workers through a shared backend, so
+    with a per-process one (the LocMemCache default) every lookup goes to
+    the database unless ``enabled`` says otherwise.
+    """
+
+    salt = "common.cache.ProfileCache"
+
+    def __init__(self, maxsize=1024, timeout=300, enabled=None):
+        self.local = LRUCache(maxsize, timeout)
+        self.timeout = timeout
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.counters = {"local_hits": 0, "shared_hits": 0, "misses": 0}
+
+    def get_profile(self, user_id, org_id=None):
+        """Active profile of the user in ``org_id`` (or the first one), else None."""
+        key = "crm:profile:user:%s:%s" % (user_id, org_id or "-")
+        entry = self._get(key, lambda: self._load_user_entry(user_id, org_id))
+        return self._build(entry)[1] if entry else None
+
+    def get_user(self, user_id):
+        """The user (password deferred, it never enters the cache), else None."""
+        entry = self._get(
+            "crm:profile:user-object:%s" % user_id, lambda: self._load_user(user_id)
+        )
+        return load_instance(User, entry["user"]) if entry else None
+
+    def get_api_key_profile(self, api_key):
+        """Return ``(org, admin_profile)`` for an API key; ``(None, None)`` if unknown."""
+        digest = hashlib.sha256(api_key.encode()).hexdigest()
+        entry = self._get(
+            "crm:profile:apikey:%s" % digest, lambda: self._load_api_key_entry(api_key)
+        )
+        return self._build(entry) if entry else (None, None)
+
+    def invalidate(self, user_ids=(), org_ids=()):
+        scopes = ["user:%s" % pk for pk in user_ids if pk]
+        scopes += ["org:%s" % pk for pk in org_ids if pk]
+        if scopes:
+            bump_cache_version(*scopes)
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        lookups = sum(counters.values())
+        hits = counters["local_hits"] + counters["shared_hits"]
+        counters["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+        counters["local_size"] = len(self.local)
+        return counters
+
+    def reset(self):
+        self.local.clear()
+        with self._lock:
+            for name in self.counters:
+                self.counters[name] = 0
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _is_current(self, entry):
+        return cache_versions(*entry["versions"]) == entry["versions"]
+
+    def is_enabled(self):
+        if self.enabled is not None:
+            return self.enabled
+        return is_shared_between_processes(get_shared_cache())
+
+    def _get(self, key, loader):
+        if not self.is_enabled():
+            self._count("misses")
+            return loader()
+        entry = self.local.get(key)
+        if entry is not None and self._is_current(entry):
+            self._count("local_hits")
+            return entry
+
+        shared = get_shared_cache()
+        raw = shared.get(key)
+        if raw is not None:
+            try:
+                entry = signing.loads(raw, salt=self.salt)
+            except signing.BadSignature:
+                entry = None
+            if entry is not None and self._is_current(entry):
+                self._count("shared_hits")
+                self.local.set(key, entry)
+                return entry
+
+        self._count("misses")
+        entry = loader()
+        if entry is not None:
+            shared.set(key, signing.dumps(entry, salt=self.salt), self.timeout)
+            self.local.set(key, entry)
+        return entry
+
+    def _load_user_entry(self, user_id, org_id):
+        # Versions are read before the query so a concurrent invalidation
+        # leaves the stored entry already outdated.
+        scopes = ["user:%s" % user_id] + (["org:%s" % org_id] if org_id else [])
+        versions = cache_versions(*scopes)
+        profiles = Profile.objects.filter(user_id=user_id, is_active=True)
+        if org_id:
+            profiles = profiles.filter(org=org_id)
+        profile = profiles.select_related("org").first()
+        if profile is None:
+            return None
+        if profile.org_id and not org_id:
+            versions.update(cache_versions("org:%s" % profile.org_id))
+        return self._entry(versions, profile.org, profile)
+
+    def _load_user(self, user_id):
+        versions = cache_versions("user:%s" % user_id)
+        user = User.objects.filter(pk=user_id).first()
+        if user is None:
+            return None
+        return {"versions": versions, "user": dump_instance(user, exclude=("password",))}
+
+    def _load_api_key_entry(self, api_key):
+        org = Org.objects.filter(api_key=api_key).first()
+        if org is None:
+            return None
+        versions = cache_versions("org:%s" % org.id)
+        profile = Profile.objects.filter(org=org, role="ADMIN").first()
+        if profile is not None:
+            versions.update(cache_versions("user:%s" % profile.user_id))
+        return self._entry(versions, org, profile)
+
+    def _entry(self, versions, org, profile):
+        return {
+            "versions": versions,
+            "org": dump_instance(org, exclude=("api_key",)) if org else None,
+            "profile": dump_instance(profile) if profile else None,
+        }
+
+    def _build(self, entry):
+        org = load_instance(Org, entry["org"]) if entry["org"] else None
+        profile = load_instance(Profile, entry["profile"]) if entry["profile"] else None
+        if profile is not None and org is not None:
+            profile.org = org
+        return org, profile
+
+
+profile_cache = ProfileCache(**getattr(settings, "PROFILE_CACHE", {}))
@@ -0,0 +1,98 @@
+from django.db.models import Count, Q, Sum
+
+from accounts.models import Account
+from common.cache import cache_versions, get_shared_cache
+from contacts.models import Contact
+from leads.models import Lead
+from opportunity.models import Opportunity
+
+# Dashboard summaries are rebuilt when a record of the org changes, see the
+# dashboard receivers in common.signals.
+DASHBOARD_TIMEOUT = 60 * 15
+DASHBOARD_TOP_N = 5
+DASHBOARD_MAX_TOP_N = 50
+
+
+def dashboard_scope(org_id):
+    return "dashboard:org:%s" % org_id
+
+
+def sees_all(profile, user):
+    return profile.role == "ADMIN" or user.is_superuser
+
+
+def dashboard_querysets(profile, user):
+    """Open accounts, contacts, open leads and opportunities visible to the profile."""
+    querysets = {
+        "accounts": Account.objects.filter(status="open", org=profile.org_id),
+        "contacts": Contact.objects.filter(org=profile.org_id),
+        "leads": Lead.objects.filter(org=profile.org_id).exclude(
+            status__in=["converted", "closed"]
+        ),
+        "opportunities": Opportunity.objects.filter(org=profile.org_id),
+    }
+    if not sees_all(profile, user):
+        own = Q(assigned_to=profile) | Q(created_by=user)
+        querysets = {
+            # the assigned_to join can repeat rows, aggregate over distinct ids
+            name: qs.model.objects.filter(id__in=qs.filter(own).values("id"))
+            for name, qs in querysets.items()
+        }
+    return querysets
+
+
+def grouped(queryset, field, amount_field):
+    """``[{field, count, amount}]`` for one GROUP BY query."""
+    return list(
+        queryset.order_by()
+        .values(field)
+        .annotate(count=Count("id"), amount=Sum(amount_field))
+        .order_by(field)
+    )
+
+
+def build_dashboard(profile, user, top_n=DASHBOARD_TOP_N):
+    querysets = dashboard_querysets(profile, user)
+    leads_by_status = grouped(querysets["leads"], "status", "opportunity_amount")
+    pipeline = grouped(querysets["opportunities"], "stage", "amount")
+
+    def recent(name, *fields):
+        return list(querysets[name].order_by("-created_at").values(*fields)[:top_n])
+
+    return {
+        "accounts_count": querysets["accounts"].count(),
+        "contacts_count": querysets["contacts"].count(),
+        "leads_count": sum(group["count"] for group in leads_by_status),
+        "opportunities_count": sum(group["count"] for group in pipeline),
+        "leads_by_status": leads_by_status,
+        "opportunities_by_stage": pipeline,
+        "pipeline_amount": sum(group["amount"] or 0 for group in pipeline),
+        "accounts": recent("accounts", "id", "name", "industry", "created_at"),
+        "contacts": recent(
+            "contacts", "id", "first_name", "last_name", "primary_email", "created_at"
+        ),
+        "leads": recent(
+            "leads", "id", "title", "status", "opportunity_amount", "created_at"
+        ),
+        "opportunities": recent(
+            "opportunities", "id", "name", "stage", "amount", "created_at"
+        ),
+    }
+
+
+def get_dashboard(profile, user, top_n=DASHBOARD_TOP_N):
+    """
+    Cached ``build_dashboard``. Admins share one entry per org; other roles
+    only see their own records, so their entries are per profile.
+    """
+    org_version = cache_versions(dashboard_scope(profile.org_id))[
+        dashboard_scope(profile.org_id)
+    ]
+    audience = "ADMIN" if sees_all(profile, user) else "%s:%s" % (profile.role, profile.id)
+    key = "crm:dashboard:%s:%s:%s:%s" % (profile.org_id, org_version, audience, top_n)
+    cache = get_shared_cache()
+    dashboard = cache.get(key)
+    if dashboard is None:
+        dashboard = build_dashboard(profile, user, top_n)
+        cache.set(key, dashboard, DASHBOARD_TIMEOUT)
+    return dashboard
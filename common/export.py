@@ -0,0 +1,136 @@
+import csv
+import datetime
+import io
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from accounts.models import Account
+from contacts.models import Contact
+from leads.models import Lead
+from opportunity.models import Opportunity
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def admin_or_superuser(request):
+    return request.profile.role == "ADMIN" or request.user.is_superuser
+
+
+def admin_profile(request):
+    return request.profile.role == "ADMIN" or request.profile.is_admin
+
+
+# entity -> model, exported values() columns, the list view's admin check and
+# the rows that view leaves out
+EXPORTS = {
+    "leads": {
+        "model": Lead,
+        "fields": (
+            "id", "title", "first_name", "last_name", "email", "phone", "status",
+            "source", "account_name", "organization", "industry", "website",
+            "address_line", "city", "state", "postcode", "country",
+            "opportunity_amount", "probability", "close_date", "created_by__email",
+            "created_at",
+        ),
+        "is_admin": admin_or_superuser,
+        "exclude": {"status": "converted"},
+    },
+    "contacts": {
+        "model": Contact,
+        "fields": (
+            "id", "salutation", "first_name", "last_name", "title", "organization",
+            "department", "primary_email", "secondary_email", "mobile_number",
+            "secondary_number", "do_not_call", "address__city", "address__state",
+            "address__country", "country", "created_by__email", "created_at",
+        ),
+        "is_admin": admin_profile,
+    },
+    "accounts": {
+        "model": Account,
+        "fields": (
+            "id", "name", "email", "phone", "industry", "status", "website",
+            "billing_address_line", "billing_city", "billing_state", "billing_postcode",
+            "billing_country", "contact_name", "created_by__email", "created_at",
+        ),
+        "is_admin": admin_profile,
+    },
+    "opportunities": {
+        "model": Opportunity,
+        "fields": (
+            "id", "name", "account__name", "stage", "amount", "currency", "probability",
+            "lead_source", "closed_on", "created_by__email", "created_at",
+        ),
+        "is_admin": admin_or_superuser,
+    },
+}
+
+
+def export_queryset(entity, request):
+    """
+    The rows of ``entity`` the list view shows the requesting profile,
+    projected to the export columns. Assignment is a semi-join instead of
+    the list views' join + DISTINCT, which would sort the whole result.
+    """
+    spec = EXPORTS[entity]
+    model = spec["model"]
+    queryset = model.objects.filter(org=request.profile.org)
+    if spec.get("exclude"):
+        queryset = queryset.exclude(**spec["exclude"])
+    if not spec["is_admin"](request):
+        assigned = model.objects.filter(assigned_to=request.profile).values("pk")
+        queryset = queryset.filter(Q(pk__in=assigned) | Q(created_by=request.profile.user))
+    return queryset.order_by("-created_at").values_list(*spec["fields"])
+
+
+def export_value(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    # UUIDs, decimals, phone numbers
+    return str(value)
+
+
+def iter_rows(queryset):
+    return queryset.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+
+def stream_csv(queryset, fields):
+    """CSV text of the rows, yielded a database chunk at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for count, row in enumerate(iter_rows(queryset), 1):
+        writer.writerow(["" if value is None else export_value(value) for value in row])
+        if count % settings.EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_ndjson(queryset, fields):
+    """One JSON object per row and line, yielded a database chunk at a time."""
+    lines = []
+    for row in iter_rows(queryset):
+        values = {field: export_value(value) for field, value in zip(fields, row)}
+        lines.append(json.dumps(values, cls=DjangoJSONEncoder) + "\n")
+        if len(lines) >= settings.EXPORT_CHUNK_SIZE:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def stream_export(entity, request, output="csv"):
+    queryset = export_queryset(entity, request)
+    fields = EXPORTS[entity]["fields"]
+    if output == "ndjson":
+        return stream_ndjson(queryset, fields)
+    return stream_csv(queryset, fields)
@@ -0,0 +1,581 @@
+import datetime
+import random
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from accounts.models import Account, Tags
+from cases.models import Case
+from common.file_types import name_metadata
+from common.models import Address, Attachments, Comment, Org, Profile, User
+from common.utils import (
+    CASE_TYPE,
+    COUNTRIES,
+    CURRENCY_CODES,
+    INDCHOICES,
+    LEAD_SOURCE,
+    LEAD_STATUS,
+    PRIORITY_CHOICE,
+    SOURCES,
+    STAGES,
+    STATUS_CHOICE,
+)
+from contacts.models import Contact
+from events.models import Event
+from invoices.models import Invoice
+from leads.models import Lead
+from opportunity.models import Opportunity
+from tasks.models import Task
+from teams.models import Teams
+
+VOLUME_PRESETS = {
+    "small": {
+        "users": 10,
+        "teams": 5,
+        "tags": 20,
+        "accounts": 500,
+        "contacts": 1000,
+        "leads": 2000,
+        "opportunities": 500,
+        "cases": 200,
+        "tasks": 500,
+        "events": 200,
+        "invoices": 200,
+        "comments": 2000,
+        "attachments": 500,
+    },
+    "large": {
+        "users": 20,
+        "teams": 10,
+        "tags": 50,
+        "accounts": 10000,
+        "contacts": 50000,
+        "leads": 100000,
+        "opportunities": 10000,
+        "cases": 5000,
+        "tasks": 10000,
+        "events": 5000,
+        "invoices": 5000,
+        "comments": 100000,
+        "attachments": 20000,
+    },
+    "xl": {
+        "users": 100,
+        "teams": 20,
+        "tags": 100,
+        "accounts": 100000,
+        "contacts": 500000,
+        "leads": 1000000,
+        "opportunities": 200000,
+        "cases": 100000,
+        "tasks": 200000,
+        "events": 100000,
+        "invoices": 100000,
+        "comments": 1000000,
+        "attachments": 200000,
+    },
+}
+
+# volumes seeded once per org, every other volume can be split into shards
+BASE_VOLUMES = ("users", "teams", "tags")
+
+FIRST_NAMES = (
+    "Ada", "Alan", "Grace", "Linus", "Barbara", "Ken", "Margaret", "Dennis",
+    "Frances", "Edsger", "Radia", "Tim", "Anita", "Guido", "Sophie", "John",
+)
+LAST_NAMES = (
+    "Lovelace", "Turing", "Hopper", "Torvalds", "Liskov", "Thompson", "Hamilton",
+    "Ritchie", "Allen", "Dijkstra", "Perlman", "Berners-Lee", "Borg", "Rossum",
+)
+CITIES = ("Berlin", "Istanbul", "Lisbon", "Oslo", "Toronto", "Austin", "Pune", "Osaka")
+FILE_TYPES = ("pdf", "png", "docx", "csv")
+
+COUNTRY_CODES = [code for code, _ in COUNTRIES]
+INDUSTRIES = [code for code, _ in INDCHOICES]
+LEAD_STATUSES = [code for code, _ in LEAD_STATUS]
+LEAD_SOURCES = [code for code, _ in LEAD_SOURCE]
+STAGE_CODES = [code for code, _ in STAGES]
+OPPORTUNITY_SOURCES = [code for code, _ in SOURCES]
+CURRENCIES = [code for code, _ in CURRENCY_CODES]
+CASE_STATUSES = [code for code, _ in STATUS_CHOICE]
+CASE_PRIORITIES = [code for code, _ in PRIORITY_CHOICE]
+CASE_TYPES = [code for code, _ in CASE_TYPE]
+TASK_STATUSES = [code for code, _ in Task.STATUS_CHOICES]
+TASK_PRIORITIES = [code for code, _ in Task.PRIORITY_CHOICES]
+EVENT_STATUSES = [code for code, _ in Event.EVENT_STATUS]
+INVOICE_STATUSES = [code for code, _ in Invoice.INVOICE_STATUS]
+
+
+def batched(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def split_volumes(volumes, shards):
+    """
+    Split the record volumes over ``shards`` as (volumes, offsets) pairs,
+    offsets being where the numbering of each volume starts in that shard.
+    """
+    plans = []
+    offsets = {}
+    for shard in range(shards):
+        part = {
+            name: total // shards + (1 if shard < total % shards else 0)
+            for name, total in volumes.items()
+            if name not in BASE_VOLUMES
+        }
+        plans.append((part, dict(offsets)))
+        for name, count in part.items():
+            offsets[name] = offsets.get(name, 0) + count
+    return plans
+
+
+def through_rows(field, pairs):
+    """Through table rows of the M2M ``field`` for (owner id, target id) pairs."""
+    through = field.through
+    source = field.field.m2m_field_name() + "_id"
+    target = field.field.m2m_reverse_field_name() + "_id"
+    return (through(**{source: owner, target: pk}) for owner, pk in pairs)
+
+
+class OrgSeeder:
+    """
+    Fill one org with synthetic, relationally consistent records.
+
+    Primary keys are UUIDs assigned in Python, so every record is written
+    with ``bulk_create`` in batches of ``batch_size`` and its M2M links are
+    inserted straight into the through tables; ``BaseModel.save`` and the
+    post_save signals are bypassed, so ``created_by`` is set explicitly.
+    Generation is deterministic for a given ``seed``.
+
+    ``run`` seeds a whole org in this process. For parallel generation
+    ``seed_base`` creates the org, its users, teams and tags once and
+    every shard of ``split_volumes`` is then seeded by ``seed_shard``,
+    usually in a worker process.
+    """
+
+    def __init__(self, name, volumes=None, batch_size=2000, seed=0, offsets=None):
+        self.name = name
+        self.volumes = dict(VOLUME_PRESETS["small"], **(volumes or {}))
+        self.offsets = offsets or {}
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.today = datetime.date.today()
+        self.counts = {}
+
+    def write(self, model, objects):
+        count = 0
+        for batch in batched(objects, self.batch_size):
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+            count += len(batch)
+        self.counts[model._meta.db_table] = self.counts.get(model._meta.db_table, 0) + count
+        return count
+
+    def link(self, field, pairs):
+        return self.write(field.through, through_rows(field, pairs))
+
+    def pick(self, values, low=1, high=2):
+        return self.rng.sample(values, min(len(values), self.rng.randint(low, high)))
+
+    def name_pair(self):
+        return self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+
+    def account_name(self):
+        return "Account %s" % self.rng.randrange(max(self.volumes["accounts"], 1))
+
+    def maybe(self, ids):
+        return self.rng.choice(ids) if ids else None
+
+    def days_from_today(self, low, high):
+        return self.today + datetime.timedelta(days=self.rng.randint(low, high))
+
+    def seed_users(self):
+        self.org = Org.objects.create(name=self.name)
+        # the random tail, uuid7 ids of the same moment share their prefix
+        self.key = self.org.id.hex[-8:]
+        password = make_password(None)
+        users = [
+            User(email="user%s.%s@example.com" % (i, self.key), password=password)
+            for i in range(max(self.volumes["users"], 1))
+        ]
+        self.write(User, users)
+        profiles = [
+            Profile(
+                user=user,
+                org=self.org,
+                role="ADMIN" if i == 0 else "USER",
+                is_organization_admin=i == 0,
+                has_sales_access=True,
+                has_marketing_access=True,
+            )
+            for i, user in enumerate(users)
+        ]
+        self.write(Profile, profiles)
+        self.admin = profiles[0]
+        self.user_ids = [user.id for user in users]
+        self.profile_ids = [profile.id for profile in profiles]
+        self.owners = dict(zip(self.profile_ids, self.user_ids))
+
+    def seed_teams(self):
+        teams = [
+            Teams(
+                name="Team %s" % i,
+                description="Synthetic team %s" % i,
+                org=self.org,
+                created_by_id=self.admin.user_id,
+            )
+            for i in range(self.volumes["teams"])
+        ]
+        self.write(Teams, teams)
+        self.team_ids = [team.id for team in teams]
+        self.link(
+            Teams.users,
+            ((team, profile) for team in self.team_ids for profile in self.pick(self.profile_ids, 2, 5)),
+        )
+
+    def seed_tags(self):
+        tags = [
+            Tags(name="tag-%s" % i, slug="t%s-%s" % (self.key, i), created_by_id=self.admin.user_id)
+            for i in range(self.volumes["tags"])
+        ]
+        self.write(Tags, tags)
+        self.tag_ids = [tag.id for tag in tags]
+
+    def owner(self, field, profile_id):
+        """``profile_id`` or its user id, whichever ``field`` points to."""
+        return profile_id if field.related_model is Profile else self.owners[profile_id]
+
+    def seed_records(self, model, volume, build, relations):
+        """
+        Insert the ``volume`` records of ``model`` built by
+        ``build(i, profile_id)`` batch by batch, each followed by the
+        through rows of ``relations``, a list of (M2M field, candidate ids)
+        pairs; ``assigned_to`` links the owning profile. Returns the new ids.
+        """
+        start = self.offsets.get(volume, 0)
+        creator = model._meta.get_field("created_by")
+        assignee = model._meta.get_field("assigned_to")
+        ids = []
+        for batch in batched(range(start, start + self.volumes[volume]), self.batch_size):
+            objects = []
+            links = {field: [] for field, _ in relations}
+            for i in batch:
+                profile_id = self.rng.choice(self.profile_ids)
+                obj = build(i, profile_id)
+                obj.org = self.org
+                obj.created_by_id = self.owner(creator, profile_id)
+                objects.append(obj)
+                for field, candidates in relations:
+                    if field is model.assigned_to:
+                        links[field].append((obj.id, self.owner(assignee, profile_id)))
+                    elif candidates:
+                        links[field].extend((obj.id, pk) for pk in self.pick(candidates, 0, 2))
+            with transaction.atomic():
+                self.write(model, objects)
+                for field, pairs in links.items():
+                    self.link(field, pairs)
+            ids.extend(obj.id for obj in objects)
+        return ids
+
+    def build_account(self, i, profile_id):
+        return Account(
+            name="Account %s" % i,
+            email="account%s.%s@example.com" % (i, self.key),
+            industry=self.rng.choice(INDUSTRIES),
+            billing_city=self.rng.choice(CITIES),
+            billing_country=self.rng.choice(COUNTRY_CODES),
+            status=self.rng.choice(("open", "close")),
+            is_active=True,
+        )
+
+    def build_contact(self, i, profile_id):
+        first_name, last_name = self.name_pair()
+        return Contact(
+            first_name=first_name,
+            last_name=last_name,
+            primary_email="contact%s.%s@example.com" % (i, self.key),
+            organization=self.account_name(),
+            country=self.rng.choice(COUNTRY_CODES),
+            is_active=True,
+        )
+
+    def build_lead(self, i, profile_id):
+        first_name, last_name = self.name_pair()
+        return Lead(
+            title="Lead %s" % i,
+            first_name=first_name,
+            last_name=last_name,
+            email="lead%s.%s@example.com" % (i, self.key),
+            status=self.rng.choice(LEAD_STATUSES),
+            source=self.rng.choice(LEAD_SOURCES),
+            city=self.rng.choice(CITIES),
+            country=self.rng.choice(COUNTRY_CODES),
+            account_name=self.account_name(),
+            opportunity_amount=Decimal(self.rng.randrange(100, 100000)),
+            probability=self.rng.randrange(0, 101),
+            is_active=True,
+        )
+
+    def build_opportunity(self, i, profile_id):
+        stage = self.rng.choice(STAGE_CODES)
+        return Opportunity(
+            name="Opportunity %s" % i,
+            account_id=self.maybe(self.account_ids),
+            stage=stage,
+            currency=self.rng.choice(CURRENCIES),
+            amount=Decimal(self.rng.randrange(100, 100000)),
+            lead_source=self.rng.choice(OPPORTUNITY_SOURCES),
+            probability=self.rng.randrange(0, 101),
+            closed_on=self.days_from_today(-365, 0) if stage.startswith("CLOSED") else None,
+            is_active=True,
+        )
+
+    def build_case(self, i, profile_id):
+        return Case(
+            name="Case %s" % i,
+            status=self.rng.choice(CASE_STATUSES),
+            priority=self.rng.choice(CASE_PRIORITIES),
+            case_type=self.rng.choice(CASE_TYPES),
+            account_id=self.maybe(self.account_ids),
+            closed_on=self.days_from_today(-30, 90),
+            is_active=True,
+        )
+
+    def build_task(self, i, profile_id):
+        return Task(
+            title="Task %s" % i,
+            status=self.rng.choice(TASK_STATUSES),
+            priority=self.rng.choice(TASK_PRIORITIES),
+            due_date=self.days_from_today(-30, 90),
+            account_id=self.maybe(self.account_ids),
+        )
+
+    def build_event(self, i, profile_id):
+        start_date = self.days_from_today(-90, 90)
+        hour = self.rng.randint(8, 17)
+        return Event(
+            name="Event %s" % i,
+            event_type="Non-Recurring",
+            status=self.rng.choice(EVENT_STATUSES),
+            start_date=start_date,
+            start_time=datetime.time(hour),
+            end_date=start_date,
+            end_time=datetime.time(hour + 1),
+            date_of_meeting=start_date,
+        )
+
+    def build_invoice(self, i, profile_id):
+        quantity = self.rng.randint(1, 100)
+        rate = Decimal(self.rng.randrange(10, 500))
+        total = quantity * rate
+        status = self.rng.choice(INVOICE_STATUSES)
+        paid = total if status == "Paid" else Decimal(0)
+        first_name, last_name = self.name_pair()
+        return Invoice(
+            invoice_title="Invoice %s" % i,
+            invoice_number="INV-%s-%s" % (self.key, i),
+            from_address_id=self.rng.choice(self.address_ids),
+            to_address_id=self.rng.choice(self.address_ids),
+            name="%s %s" % (first_name, last_name),
+            email="invoice%s.%s@example.com" % (i, self.key),
+            quantity=quantity,
+            rate=rate,
+            total_amount=total,
+            amount_paid=paid,
+            amount_due=total - paid,
+            currency=self.rng.choice(CURRENCIES),
+            status=status,
+            due_date=self.days_from_today(0, 60),
+        )
+
+    def seed_addresses(self):
+        """A pool of addresses the invoices are sent from and to."""
+        addresses = [
+            Address(
+                address_line="%s Synthetic Street" % i,
+                street="Synthetic Street",
+                city=self.rng.choice(CITIES),
+                postcode="%05d" % self.rng.randrange(100000),
+                country=self.rng.choice(COUNTRY_CODES),
+                created_by_id=self.admin.user_id,
+            )
+            for i in range(min(max(self.volumes["invoices"] // 10, 1), 1000))
+        ]
+        self.write(Address, addresses)
+        self.address_ids = [address.id for address in addresses]
+
+    def parents(self, fields):
+        """(Comment/Attachments field, ids) pairs the extras are spread over."""
+        return [(field, ids) for field, ids in self.record_ids.items() if ids and field in fields]
+
+    def seed_comments(self):
+        parents = self.parents(
+            ("lead", "account", "contact", "opportunity", "case", "task", "invoice")
+        )
+        if not parents:
+            return
+        start = self.offsets.get("comments", 0)
+
+        def comments():
+            for i in range(start, start + self.volumes["comments"]):
+                field, ids = parents[i % len(parents)]
+                profile_id = self.rng.choice(self.profile_ids)
+                yield Comment(
+                    comment="Synthetic comment %s" % i,
+                    commented_by_id=profile_id,
+                    created_by_id=self.owners[profile_id],
+                    **{field + "_id": self.rng.choice(ids)}
+                )
+
+        self.write(Comment, comments())
+
+    def seed_attachments(self):
+        parents = self.parents(
+            ("lead", "account", "contact", "opportunity", "case", "task", "invoice", "event")
+        )
+        if not parents:
+            return
+        start = self.offsets.get("attachments", 0)
+
+        def attachments():
+            for i in range(start, start + self.volumes["attachments"]):
+                field, ids = parents[i % len(parents)]
+                file_name = "file-%s.%s" % (i, self.rng.choice(FILE_TYPES))
+                yield Attachments(
+                    file_name=file_name,
+                    attachment="attachments/synthetic/%s" % file_name,
+                    # bulk inserts skip save(), which fills these in; no file, no size
+                    **name_metadata(file_name),
+                    created_by_id=self.rng.choice(self.user_ids),
+                    **{field + "_id": self.rng.choice(ids)}
+                )
+
+        self.write(Attachments, attachments())
+
+    def seed_base(self):
+        self.seed_users()
+        self.seed_teams()
+        self.seed_tags()
+        return self.org
+
+    def load_base(self, org):
+        """Reuse the users, teams and tags ``seed_base`` created for ``org``."""
+        self.org = org
+        self.key = org.id.hex[-8:]
+        profiles = list(Profile.objects.filter(org=org).order_by("-is_organization_admin"))
+        self.admin = profiles[0]
+        self.profile_ids = [profile.id for profile in profiles]
+        self.user_ids = [profile.user_id for profile in profiles]
+        self.owners = dict(zip(self.profile_ids, self.user_ids))
+        self.team_ids = list(Teams.objects.filter(org=org).values_list("id", flat=True))
+        self.tag_ids = list(
+            Tags.objects.filter(slug__startswith="t%s-" % self.key).values_list("id", flat=True)
+        )
+
+    def seed_entities(self):
+        """Every record volume, on top of the org's users, teams and tags."""
+        contact_ids = self.seed_records(
+            Contact,
+            "contacts",
+            self.build_contact,
+            [(Contact.assigned_to, None), (Contact.teams, self.team_ids)],
+        )
+        self.account_ids = self.seed_records(
+            Account,
+            "accounts",
+            self.build_account,
+            [
+                (Account.assigned_to, None),
+                (Account.tags, self.tag_ids),
+                (Account.teams, self.team_ids),
+                (Account.contacts, contact_ids),
+            ],
+        )
+        lead_ids = self.seed_records(
+            Lead,
+            "leads",
+            self.build_lead,
+            [
+                (Lead.assigned_to, None),
+                (Lead.tags, self.tag_ids),
+                (Lead.teams, self.team_ids),
+                (Lead.contacts, contact_ids),
+            ],
+        )
+        opportunity_ids = self.seed_records(
+            Opportunity,
+            "opportunities",
+            self.build_opportunity,
+            [
+                (Opportunity.assigned_to, None),
+                (Opportunity.tags, self.tag_ids),
+                (Opportunity.teams, self.team_ids),
+                (Opportunity.contacts, contact_ids),
+            ],
+        )
+        case_ids = self.seed_records(
+            Case,
+            "cases",
+            self.build_case,
+            [(Case.assigned_to, None), (Case.teams, self.team_ids), (Case.contacts, contact_ids)],
+        )
+        task_ids = self.seed_records(
+            Task,
+            "tasks",
+            self.build_task,
+            [(Task.assigned_to, None), (Task.teams, self.team_ids), (Task.contacts, contact_ids)],
+        )
+        event_ids = self.seed_records(
+            Event,
+            "events",
+            self.build_event,
+            [(Event.assigned_to, None), (Event.teams, self.team_ids), (Event.contacts, contact_ids)],
+        )
+        invoice_ids = []
+        if self.volumes["invoices"]:
+            self.seed_addresses()
+            invoice_ids = self.seed_records(
+                Invoice,
+                "invoices",
+                self.build_invoice,
+                [
+                    (Invoice.assigned_to, None),
+                    (Invoice.accounts, self.account_ids),
+                    (Invoice.teams, self.team_ids),
+                ],
+            )
+        self.record_ids = {
+            "lead": lead_ids,
+            "account": self.account_ids,
+            "contact": contact_ids,
+            "opportunity": opportunity_ids,
+            "case": case_ids,
+            "task": task_ids,
+            "event": event_ids,
+            "invoice": invoice_ids,
+        }
+        self.seed_comments()
+        self.seed_attachments()
+
+    def run(self):
+        self.seed_base()
+        self.seed_entities()
+        return self.org
+
+
+def seed_shard(org_id, volumes, offsets, batch_size=2000, seed=0):
+    """
+    Seed one ``split_volumes`` shard of an org created by
+    ``OrgSeeder.seed_base``; returns the inserted row counts per table.
+    """
+    seeder = OrgSeeder(None, volumes, batch_size, seed, offsets)
+    seeder.load_base(Org.objects.get(id=org_id))
+    seeder.seed_entities()
+    return seeder.counts
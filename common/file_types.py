@@ -0,0 +1,647 @@
+import mimetypes
+import os
+from types import MappingProxyType
+
+# Extensions per attachment category. A few extensions appear in more than
+# one list; the category listed first in CATEGORY_ICONS wins.
+
+AUDIO_EXTENSIONS = ["aif", "iff", "m3u", "m4a", "mid", "mp3", "mpa", "wav", "wma"]
+
+VIDEO_EXTENSIONS = [
+    "3g2",
+    "3gp",
+    "asf",
+    "avi",
+    "flv",
+    "m4v",
+    "mov",
+    "mp4",
+    "mpg",
+    "rm",
+    "srt",
+    "swf",
+    "vob",
+    "wmv",
+]
+
+IMAGE_EXTENSIONS = [
+    "bmp",
+    "dds",
+    "gif",
+    "jpg",
+    "jpeg",
+    "png",
+    "psd",
+    "pspimage",
+    "tga",
+    "thm",
+    "tif",
+    "tiff",
+    "yuv",
+]
+
+PDF_EXTENSIONS = ["indd", "pct", "pdf"]
+
+CODE_EXTENSIONS = [
+    "aspx",
+    "json",
+    "jsp",
+    "do",
+    "htm",
+    "html",
+    "ser",
+    "php",
+    "jad",
+    "cfm",
+    "xml",
+    "js",
+    "pod",
+    "asp",
+    "atomsvc",
+    "rdf",
+    "pou",
+    "jsf",
+    "abs",
+    "pl",
+    "asm",
+    "srz",
+    "luac",
+    "cod",
+    "lib",
+    "arxml",
+    "bas",
+    "ejs",
+    "fs",
+    "hbs",
+    "s",
+    "ss",
+    "cms",
+    "pyc",
+    "vcxproj",
+    "jse",
+    "smali",
+    "xla",
+    "lxk",
+    "pdb",
+    "src",
+    "cs",
+    "ipb",
+    "ave",
+    "mst",
+    "vls",
+    "rcc",
+    "sax",
+    "scr",
+    "dtd",
+    "axd",
+    "mrl",
+    "xsl",
+    "ino",
+    "spr",
+    "xsd",
+    "cgi",
+    "isa",
+    "ws",
+    "rss",
+    "dvb",
+    "nupkg",
+    "xlm",
+    "v4e",
+    "rss",
+    "prg",
+    "form",
+    "bat",
+    "mrc",
+    "asi",
+    "jdp",
+    "fmb",
+    "graphml",
+    "gcode",
+    "aia",
+    "py",
+    "atp",
+    "mzp",
+    "o",
+    "scs",
+    "mm",
+    "cpp",
+    "java",
+    "gypi",
+    "idb",
+    "txml",
+    "c",
+    "vip",
+    "tra",
+    "rc",
+    "action",
+    "vlx",
+    "asta",
+    "pyo",
+    "lua",
+    "gml",
+    "prl",
+    "rfs",
+    "cpb",
+    "sh",
+    "rbf",
+    "gp",
+    "phtml",
+    "bp",
+    "scb",
+    "sln",
+    "vbp",
+    "wbf",
+    "bdt",
+    "mac",
+    "rpy",
+    "eaf",
+    "mc",
+    "mwp",
+    "gnt",
+    "h",
+    "swift",
+    "e",
+    "styl",
+    "cxx",
+    "as",
+    "liquid",
+    "dep",
+    "fas",
+    "vbs",
+    "aps",
+    "vbe",
+    "lss",
+    "cmake",
+    "resx",
+    "csb",
+    "dpk",
+    "pdml",
+    "txx",
+    "dbg",
+    "jsa",
+    "sxs",
+    "sasf",
+    "pm",
+    "csx",
+    "r",
+    "wml",
+    "au3",
+    "stm",
+    "cls",
+    "cc",
+    "ins",
+    "jsc",
+    "dwp",
+    "rpg",
+    "arb",
+    "bml",
+    "inc",
+    "eld",
+    "sct",
+    "sm",
+    "wbt",
+    "csproj",
+    "tcz",
+    "html5",
+    "gbl",
+    "cmd",
+    "dlg",
+    "tpl",
+    "rbt",
+    "xcp",
+    "tpm",
+    "qry",
+    "mfa",
+    "ptx",
+    "lsp",
+    "pag",
+    "ebc",
+    "php3",
+    "cob",
+    "csc",
+    "pyt",
+    "dwt",
+    "rb",
+    "wsdl",
+    "lap",
+    "textile",
+    "sfx",
+    "x",
+    "a5r",
+    "dbp",
+    "pmp",
+    "ipr",
+    "fwx",
+    "pbl",
+    "vbw",
+    "phl",
+    "cbl",
+    "pas",
+    "mom",
+    "dbmdl",
+    "lol",
+    "wdl",
+    "ppam",
+    "plx",
+    "vb",
+    "cgx",
+    "lst",
+    "lmp",
+    "vd",
+    "bcp",
+    "thtml",
+    "scpt",
+    "isu",
+    "mrd",
+    "perl",
+    "dtx",
+    "f",
+    "wpk",
+    "ipf",
+    "ptl",
+    "luca",
+    "hx",
+    "uvproj",
+    "qvs",
+    "vba",
+    "xjb",
+    "appxupload",
+    "ti",
+    "svn-base",
+    "bsc",
+    "mak",
+    "vcproj",
+    "dsd",
+    "ksh",
+    "pyw",
+    "bxml",
+    "mo",
+    "irc",
+    "gcl",
+    "dbml",
+    "mlv",
+    "wsf",
+    "tcl",
+    "dqy",
+    "ssi",
+    "pbxproj",
+    "bal",
+    "trt",
+    "sal",
+    "hkp",
+    "vbi",
+    "dob",
+    "htc",
+    "p",
+    "ats",
+    "seam",
+    "loc",
+    "pli",
+    "rptproj",
+    "pxml",
+    "pkb",
+    "dpr",
+    "scss",
+    "dsb",
+    "bb",
+    "vbproj",
+    "ash",
+    "rml",
+    "nbk",
+    "nvi",
+    "lmv",
+    "mw",
+    "jl",
+    "dso",
+    "cba",
+    "jks",
+    "ary",
+    "run",
+    "vps",
+    "clm",
+    "brml",
+    "msha",
+    "mdp",
+    "tmh",
+    "rdf",
+    "jsx",
+    "sdl",
+    "ptxml",
+    "fxl",
+    "wmw",
+    "dcr",
+    "bcc",
+    "cbp",
+    "bmo",
+    "bsv",
+    "less",
+    "gss",
+    "ctl",
+    "rpyc",
+    "ascx",
+    "odc",
+    "wiki",
+    "obr",
+    "l",
+    "axs",
+    "bpr",
+    "ppa",
+    "rpo",
+    "sqlproj",
+    "smm",
+    "dsr",
+    "arq",
+    "din",
+    "jml",
+    "jsonp",
+    "ml",
+    "rc2",
+    "myapp",
+    "cla",
+    "xme",
+    "obj",
+    "jsdtscope",
+    "gyp",
+    "datasource",
+    "cp",
+    "rh",
+    "lpx",
+    "a2w",
+    "ctp",
+    "ulp",
+    "nt",
+    "script",
+    "bxl",
+    "gs",
+    "xslt",
+    "mg",
+    "pch",
+    "mhl",
+    "zpd",
+    "psm1",
+    "asz",
+    "m",
+    "jacl",
+    "pym",
+    "rws",
+    "acu",
+    "ssq",
+    "wxs",
+    "coffee",
+    "ncb",
+    "akt",
+    "pyx",
+    "zero",
+    "hs",
+    "mkb",
+    "tru",
+    "xul",
+    "mfl",
+    "sca",
+    "sbr",
+    "master",
+    "opv",
+    "matlab",
+    "sami",
+    "agc",
+    "slim",
+    "tea",
+    "pbl",
+    "m51",
+    "mec",
+    "asc",
+    "gch",
+    "enml",
+    "ino",
+    "kst",
+    "jade",
+    "dfb",
+    "ips",
+    "rgs",
+    "vbx",
+    "cspkg",
+    "ncx",
+    "brs",
+    "wfs",
+    "ifp",
+    "nse",
+    "xtx",
+    "j",
+    "cx",
+    "ps1",
+    "nas",
+    "mk",
+    "ccs",
+    "vrp",
+    "lnp",
+    "cml",
+    "c#",
+    "idl",
+    "exp",
+    "apb",
+    "nsi",
+    "asmx",
+    "tdo",
+    "pjt",
+    "fdt",
+    "s5d",
+    "mvba",
+    "mf",
+    "odl",
+    "bzs",
+    "jardesc",
+    "tgml",
+    "moc",
+    "wxi",
+    "cpz",
+    "fsx",
+    "jav",
+    "ocb",
+    "agi",
+    "tec",
+    "txl",
+    "amw",
+    "mscr",
+    "dfd",
+    "dpd",
+    "pun",
+    "f95",
+    "vdproj",
+    "xsc",
+    "diff",
+    "wxl",
+    "dgml",
+    "airi",
+    "kmt",
+    "ksc",
+    "io",
+    "rbw",
+    "sas",
+    "vcp",
+    "resources",
+    "param",
+    "cg",
+    "hlsl",
+    "vssscc",
+    "bgm",
+    "xn",
+    "targets",
+    "sl",
+    "gsc",
+    "qs",
+    "owl",
+    "devpak",
+    "phps",
+    "hdf",
+    "pri",
+    "nbin",
+    "xaml",
+    "s4e",
+    "scm",
+    "tk",
+    "poc",
+    "uix",
+    "clw",
+    "factorypath",
+    "s43",
+    "awd",
+    "htr",
+    "php2",
+    "classpath",
+    "pickle",
+    "rob",
+    "msil",
+    "ebx",
+    "tsq",
+    "lml",
+    "f90",
+    "lds",
+    "vup",
+    "pbi",
+    "swt",
+    "vap",
+    "ig",
+    "pdo",
+    "frt",
+    "fcg",
+    "c++",
+    "xcl",
+    "dfn",
+    "aar",
+    "for",
+    "re",
+    "twig",
+    "ebm",
+    "dhtml",
+    "hc",
+    "pro",
+    "ahk",
+    "rule",
+    "bsh",
+    "jcs",
+    "zrx",
+    "wsdd",
+    "csp",
+    "drc",
+    "appxsym",
+]
+
+TEXT_EXTENSIONS = [
+    "doc",
+    "docx",
+    "log",
+    "msg",
+    "odt",
+    "pages",
+    "rtf",
+    "tex",
+    "txt",
+    "wpd",
+    "wps",
+]
+
+SHEET_EXTENSIONS = ["csv", "xls", "xlsx", "xlsm", "xlsb", "xltx", "xltm", "xlt"]
+
+ZIP_EXTENSIONS = [
+    "zip",
+    "7Z",
+    "gz",
+    "rar",
+    "ZIPX",
+    "ACE",
+    "tar",
+]
+
+
+# category -> icon class, in precedence order
+CATEGORY_ICONS = {
+    "audio": "fa fa-file-audio",
+    "video": "fa fa-file-video",
+    "image": "fa fa-file-image",
+    "pdf": "fa fa-file-pdf",
+    "code": "fa fa-file-code",
+    "text": "fa fa-file-alt",
+    "sheet": "fa fa-file-excel",
+    "zip": "fa fa-file-archive",
+    "file": "fa fa-file",
+}
+CATEGORY_CHOICES = [(category, category) for category in CATEGORY_ICONS]
+
+
+def build_category_map():
+    lists = {
+        "audio": AUDIO_EXTENSIONS,
+        "video": VIDEO_EXTENSIONS,
+        "image": IMAGE_EXTENSIONS,
+        "pdf": PDF_EXTENSIONS,
+        "code": CODE_EXTENSIONS,
+        "text": TEXT_EXTENSIONS,
+        "sheet": SHEET_EXTENSIONS,
+        "zip": ZIP_EXTENSIONS,
+    }
+    categories = {}
+    for category in CATEGORY_ICONS:
+        for extension in lists.get(category, ()):
+            categories.setdefault(extension.lower(), category)
+    return MappingProxyType(categories)
+
+
+# extension (lowercase, no dot) -> category, built once at import
+FILE_CATEGORIES = build_category_map()
+
+
+def file_extension(name):
+    """Lowercase extension of a file name or URL, "" if it has none."""
+    extension = os.path.splitext(name or "")[1]
+    return extension[1:].lower()[:16]
+
+
+def file_category(extension):
+    return FILE_CATEGORIES.get(extension.lower(), "file")
+
+
+def name_metadata(name):
+    """Extension, category and MIME type guessed from a file name."""
+    name = name or ""
+    extension = file_extension(name)
+    return {
+        "extension": extension,
+        "category": file_category(extension),
+        "mime_type": mimetypes.guess_type(name)[0] or "application/octet-stream",
+    }
+
+
+def file_metadata(field_file, with_size=True):
+    """
+    Extension, category, MIME type and size of an uploaded file, for the
+    columns of common.mixins.FileMetadataModel. The size is None when the
+    storage cannot tell (e.g. the file is missing); ``with_size=False``
+    leaves it out, it costs a storage request for stored files.
+    """
+    metadata = name_metadata(field_file.name)
+    if with_size:
+        try:
+            metadata["size"] = field_file.size
+        except (OSError, ValueError):
+            metadata["size"] = None
+    return metadata
@@ -0,0 +1,154 @@
+import sys
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from common.benchmark import (
+    BENCHMARK_ENDPOINTS,
+    compare,
+    load_baseline,
+    measure_auth,
+    run_benchmark,
+    save_baseline,
+)
+from common.fake_data import VOLUME_PRESETS, OrgSeeder
+
+BASELINE_DIR = Path(settings.BASE_DIR) / "benchmarks"
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database with a large synthetic org and report "
+        "p50/p95 latency, SQL queries and peak memory of the list endpoints"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--preset", choices=sorted(VOLUME_PRESETS), default="small")
+        for name in VOLUME_PRESETS["small"]:
+            parser.add_argument(
+                "--%s" % name, type=int, help="Override the %s volume of the preset" % name
+            )
+        parser.add_argument(
+            "--endpoint", choices=sorted(BENCHMARK_ENDPOINTS), action="append",
+            help="Only measure these endpoints (repeatable)",
+        )
+        parser.add_argument(
+            "--auth", action="store_true",
+            help="Also measure the authentication pipeline on its own (as \"auth\")",
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--cold", action="store_true", help="Clear the cache before every request"
+        )
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--baseline", help="Baseline file (default benchmarks/baseline-<preset>.json)"
+        )
+        parser.add_argument(
+            "--save-baseline", action="store_true",
+            help="Store the results as the new baseline instead of comparing",
+        )
+        parser.add_argument(
+            "--tolerance", type=float, default=0.25,
+            help="Allowed relative p95/peak memory growth over the baseline",
+        )
+        parser.add_argument(
+            "--keepdb", action="store_true",
+            help="Keep the test database and reuse its seeded org on the next run",
+        )
+
+    def handle(self, *args, **options):
+        volumes = {
+            name: default if options[name] is None else options[name]
+            for name, default in VOLUME_PRESETS[options["preset"]].items()
+        }
+        options["baseline"] = options["baseline"] or str(
+            BASELINE_DIR / ("baseline-%s.json" % options["preset"])
+        )
+        endpoints = {
+            name: BENCHMARK_ENDPOINTS[name]
+            for name in options["endpoint"] or BENCHMARK_ENDPOINTS
+        }
+        baseline = None
+        if not options["save_baseline"] and Path(options["baseline"]).exists():
+            baseline = load_baseline(options["baseline"])
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options["keepdb"]
+        )
+        try:
+            profile = self.seed(volumes, options)
+            results = run_benchmark(
+                profile,
+                endpoints,
+                repeat=options["repeat"],
+                warmup=options["warmup"],
+                cold=options["cold"],
+            )
+            if options["auth"]:
+                results["auth"] = measure_auth(
+                    profile, repeat=options["repeat"] * 10, warmup=options["warmup"]
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options["keepdb"])
+            teardown_test_environment()
+
+        self.report(results)
+        if options["save_baseline"]:
+            save_baseline(options["baseline"], results, volumes)
+            self.stdout.write("Baseline written to %s" % options["baseline"])
+            return
+        if baseline is None:
+            return
+        if baseline["volumes"] != volumes:
+            self.stderr.write("Volumes differ from the baseline, skipping the comparison")
+            return
+        if baseline["environment"]["database"] != connection.vendor:
+            self.stderr.write("Baseline was taken on %s, skipping the comparison"
+                              % baseline["environment"]["database"])
+            return
+        regressions = compare(results, baseline["results"], options["tolerance"])
+        for regression in regressions:
+            self.stderr.write("REGRESSION %s" % regression)
+        if regressions:
+            raise CommandError("%s regressions against %s" % (len(regressions), options["baseline"]))
+        self.stdout.write("No regressions against %s" % options["baseline"])
+
+    def seed(self, volumes, options):
+        from common.models import Org, Profile
+
+        name = "benchmark-%s" % "-".join(str(volumes[key]) for key in sorted(volumes))
+        org = Org.objects.filter(name=name).first()
+        if org is None:
+            self.stderr.write("Seeding %s ..." % name)
+            seeder = OrgSeeder(name, volumes, options["batch_size"], options["seed"])
+            org = seeder.run()
+            for table, count in sorted(seeder.counts.items()):
+                self.stderr.write("  %-40s %9d" % (table, count))
+        return Profile.objects.select_related("user").get(org=org, role="ADMIN")
+
+    def report(self, results):
+        self.stdout.write(
+            "%-12s %6s %9s %9s %9s %8s %10s"
+            % ("endpoint", "status", "p50 ms", "p95 ms", "mean ms", "queries", "peak KB")
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                "%-12s %6s %9.1f %9.1f %9.1f %8d %10.1f"
+                % (
+                    name,
+                    result["status"],
+                    result["p50_ms"],
+                    result["p95_ms"],
+                    result["mean_ms"],
+                    result["queries"],
+                    result["peak_kb"],
+                )
+            )
+        sys.stdout.flush()
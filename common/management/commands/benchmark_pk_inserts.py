@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from common.benchmark import PK_GENERATORS, measure_pk_inserts
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the insert throughput of uuid4 and uuid7 primary keys on a "
+        "multi-million row scratch table in a throwaway test database"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=2000000)
+        parser.add_argument("--batch-size", type=int, default=10000)
+        parser.add_argument(
+            "--generator", choices=sorted(PK_GENERATORS), action="append",
+            help="Only measure these generators (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = [
+                measure_pk_inserts(name, options["rows"], options["batch_size"])
+                for name in options["generator"] or PK_GENERATORS
+            ]
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(
+            "%-10s %10s %9s %11s %15s %10s"
+            % ("generator", "rows", "seconds", "rows/s", "last 10% rows/s", "index KB")
+        )
+        for result in results:
+            self.stdout.write(
+                "%-10s %10d %9.2f %11d %15d %10s"
+                % (
+                    result["generator"],
+                    result["rows"],
+                    result["seconds"],
+                    result["rows_per_s"],
+                    result["tail_rows_per_s"],
+                    "-" if result["index_kb"] is None else result["index_kb"],
+                )
+            )
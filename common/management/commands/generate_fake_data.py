@@ -0,0 +1,97 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+
+from common.fake_data import VOLUME_PRESETS, OrgSeeder, seed_shard, split_volumes
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-generate synthetic orgs with records in every app for load testing, "
+        "split into shards seeded by parallel worker processes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orgs", type=int, default=1, help="Number of orgs to generate")
+        parser.add_argument("--preset", choices=sorted(VOLUME_PRESETS), default="small")
+        for name in VOLUME_PRESETS["small"]:
+            parser.add_argument(
+                "--%s" % name, type=int, help="Override the %s volume of the preset" % name
+            )
+        parser.add_argument(
+            "--workers", type=int, default=os.cpu_count() or 1,
+            help="Worker processes (SQLite always uses one)",
+        )
+        parser.add_argument(
+            "--shards", type=int,
+            help="Shards each org's records are split into (default: --workers)",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--name", default="loadtest", help="Org name prefix")
+
+    def handle(self, *args, **options):
+        volumes = {
+            name: default if options[name] is None else options[name]
+            for name, default in VOLUME_PRESETS[options["preset"]].items()
+        }
+        workers = max(options["workers"], 1)
+        if workers > 1 and connection.vendor == "sqlite":
+            self.stderr.write("SQLite allows a single writer, seeding in this process")
+            workers = 1
+        shards = max(options["shards"] or workers, 1)
+        started = time.monotonic()
+        totals = {}
+
+        jobs = []
+        for number in range(options["orgs"]):
+            seed = "%s:%s" % (options["seed"], number)
+            seeder = OrgSeeder(
+                "%s-%s" % (options["name"], number), volumes, options["batch_size"], seed
+            )
+            org = seeder.seed_base()
+            self.merge(totals, seeder.counts)
+            self.stderr.write("Created %s (%s)" % (org.name, org.id))
+            for shard, (part, offsets) in enumerate(split_volumes(volumes, shards)):
+                jobs.append(
+                    (org.id, part, offsets, options["batch_size"], "%s:%s" % (seed, shard))
+                )
+
+        if workers == 1:
+            for done, job in enumerate(jobs, 1):
+                self.merge(totals, seed_shard(*job))
+                self.progress(done, len(jobs), totals, started)
+        else:
+            # forked workers must not share the parent's database sockets
+            connections.close_all()
+            with ProcessPoolExecutor(
+                workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=connections.close_all,
+            ) as pool:
+                futures = [pool.submit(seed_shard, *job) for job in jobs]
+                for done, future in enumerate(as_completed(futures), 1):
+                    self.merge(totals, future.result())
+                    self.progress(done, len(jobs), totals, started)
+
+        elapsed = time.monotonic() - started
+        for table, count in sorted(totals.items()):
+            self.stdout.write("%-40s %10d" % (table, count))
+        rows = sum(totals.values())
+        self.stdout.write(
+            "%d rows in %.1fs (%d rows/s)" % (rows, elapsed, rows / max(elapsed, 0.001))
+        )
+
+    def merge(self, totals, counts):
+        for table, count in counts.items():
+            totals[table] = totals.get(table, 0) + count
+
+    def progress(self, done, total, totals, started):
+        self.stderr.write(
+            "  shard %s/%s, %d rows, %.1fs"
+            % (done, total, sum(totals.values()), time.monotonic() - started)
+        )
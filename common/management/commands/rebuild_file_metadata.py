@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from common.mixins import FILE_METADATA_FIELDS
+from common.models import Attachments, Document
+
+MODELS = {"attachments": Attachments, "documents": Document}
+
+
+class Command(BaseCommand):
+    help = "Fill the extension/category/MIME type/size columns of attachments and documents"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model", choices=sorted(MODELS), action="append",
+            help="Only rebuild these models (repeatable)",
+        )
+        parser.add_argument(
+            "--all", action="store_true",
+            help="Rebuild every row, not only the ones without metadata",
+        )
+        parser.add_argument(
+            "--no-size", action="store_true",
+            help="Skip the file sizes, each one is a storage request (S3 HEAD)",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with_size = not options["no_size"]
+        fields = [name for name in FILE_METADATA_FIELDS if with_size or name != "size"]
+        for name in options["model"] or MODELS:
+            model = MODELS[name]
+            file_field = model.metadata_file_field
+            queryset = model.objects.exclude(**{file_field: ""}).only("id", file_field)
+            if not options["all"]:
+                queryset = queryset.filter(category="")
+            updated = 0
+            batch = []
+            for obj in queryset.order_by().iterator(chunk_size=options["batch_size"]):
+                obj.set_file_metadata(with_size)
+                batch.append(obj)
+                if len(batch) >= options["batch_size"]:
+                    # plain bulk_update: a backfill is not a user edit
+                    updated += model.objects.bulk_update(batch, fields)
+                    batch = []
+            if batch:
+                updated += model.objects.bulk_update(batch, fields)
+            self.stdout.write("%s: updated %s rows" % (name, updated))
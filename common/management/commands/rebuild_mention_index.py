@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from common.mentions import index_queryset
+from common.models import Comment
+
+
+class Command(BaseCommand):
+    help = "Rebuild the @mention rows of comments"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", help="Only rebuild the comments of this org's members")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        queryset = Comment.objects.all()
+        if options["org"]:
+            queryset = queryset.filter(commented_by__org=options["org"])
+        indexed = index_queryset(queryset, batch_size=options["batch_size"])
+        self.stdout.write("indexed %s mentions" % indexed)
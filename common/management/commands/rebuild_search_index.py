@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from common.search import SEARCH_ENTITIES, index_queryset
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search documents of leads, contacts, accounts and opportunities"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--entity", choices=sorted(SEARCH_ENTITIES), action="append",
+            help="Only rebuild these entities (repeatable)",
+        )
+        parser.add_argument("--org", help="Only rebuild the records of this org id")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        for entity in options["entity"] or SEARCH_ENTITIES:
+            model = SEARCH_ENTITIES[entity][0]
+            queryset = model.objects.all()
+            if options["org"]:
+                queryset = queryset.filter(org=options["org"])
+            indexed = index_queryset(queryset, batch_size=options["batch_size"])
+            self.stdout.write("%s: indexed %s records" % (entity, indexed))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from common.models import Attachments
+from common.tasks import generate_attachment_thumbnails
+from common.thumbnails import THUMBNAIL_CATEGORIES
+
+
+class Command(BaseCommand):
+    help = "Render thumbnails of image and PDF attachments that have none"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--inline", action="store_true",
+            help="Render in this process instead of queueing celery tasks",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Attachments.objects.filter(category__in=THUMBNAIL_CATEGORIES, thumbnails={})
+        count = 0
+        for attachment_id in queryset.values_list("id", flat=True).iterator():
+            if options["inline"]:
+                generate_attachment_thumbnails(str(attachment_id))
+            else:
+                generate_attachment_thumbnails.delay(str(attachment_id))
+            count += 1
+        self.stdout.write("%s attachments %s" % (count, "rendered" if options["inline"] else "queued"))
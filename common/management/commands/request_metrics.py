@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+
+from common.metrics import empty_series, merge_series, request_metrics
+
+SORT_KEYS = {
+    "queries": lambda series: series["queries"] / series["requests"],
+    "db_time": lambda series: series["db_time"] / series["requests"],
+    "latency": lambda series: series["latency_sum"] / series["requests"],
+    "requests": lambda series: series["requests"],
+}
+
+
+class Command(BaseCommand):
+    help = "Show the views with the most SQL queries, SQL time or latency per request"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=20)
+        parser.add_argument("--sort", choices=sorted(SORT_KEYS), default="queries")
+        parser.add_argument(
+            "--by-org", action="store_true", help="Keep the orgs apart instead of adding them up"
+        )
+        parser.add_argument(
+            "--clear", action="store_true", help="Drop the collected metrics afterwards"
+        )
+
+    def handle(self, *args, **options):
+        totals = {}
+        for (view, org), series in request_metrics.collect().items():
+            key = (view, org if options["by_org"] else "all")
+            merge_series(totals.setdefault(key, empty_series()), series)
+        rows = sorted(
+            (item for item in totals.items() if item[1]["requests"]),
+            key=lambda item: SORT_KEYS[options["sort"]](item[1]),
+            reverse=True,
+        )[: options["top"]]
+
+        self.stdout.write(
+            "%-50s %-36s %9s %9s %9s %11s %11s"
+            % ("view", "org", "requests", "q/req", "max q", "db ms/req", "ms/req")
+        )
+        for (view, org), series in rows:
+            requests = series["requests"]
+            self.stdout.write(
+                "%-50s %-36s %9d %9.1f %9d %11.1f %11.1f"
+                % (
+                    view[:50],
+                    org,
+                    requests,
+                    series["queries"] / requests,
+                    series["queries_max"],
+                    series["db_time"] * 1000 / requests,
+                    series["latency_sum"] * 1000 / requests,
+                )
+            )
+        if options["clear"]:
+            request_metrics.clear()
@@ -0,0 +1,97 @@
+import re
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+from common.models import CommentMention, Profile
+
+# the Comment foreign keys naming what was commented on
+COMMENT_ENTITIES = (
+    "account", "contact", "lead", "opportunity", "case", "task", "invoice", "event", "profile",
+)
+
+# "@jane" (the local part of jane@example.com) or "@jane@example.com"
+MENTION_RE = re.compile(r"(?<![\w@])@([\w+-]+(?:\.[\w+-]+)*(?:@[\w-]+(?:\.[\w-]+)+)?)")
+
+
+def parse_mentions(text):
+    """The distinct lowercased handles @mentioned in ``text``, in order."""
+    return list(dict.fromkeys(h.lower() for h in MENTION_RE.findall(text or "")))
+
+
+def resolve_mentions(handles, org_id):
+    """
+    The active profiles of the org the handles name, with one query. A
+    handle is a full email or the part before the "@"; a part that more
+    than one member shares is ambiguous and names nobody.
+    """
+    if not handles or not org_id:
+        return []
+    lookups = [
+        Q(user__email__iexact=handle) if "@" in handle
+        else Q(user__email__istartswith=handle + "@")
+        for handle in handles
+    ]
+    profiles = Profile.objects.filter(
+        reduce(or_, lookups), org_id=org_id, is_active=True, user__is_active=True
+    ).select_related("user")
+    by_handle = {}
+    for profile in profiles:
+        email = profile.user.email.lower()
+        for handle in (email, email.split("@", 1)[0]):
+            by_handle.setdefault(handle, []).append(profile)
+    resolved = {}
+    for handle in handles:
+        matches = by_handle.get(handle, [])
+        if len(matches) == 1:
+            resolved.setdefault(matches[0].id, matches[0])
+    return list(resolved.values())
+
+
+def comment_org_id(comment):
+    commented_by = comment.commented_by if comment.commented_by_id else None
+    return commented_by.org_id if commented_by else None
+
+
+def index_mentions(comment):
+    """Store the profiles @mentioned in a saved comment, dropping stale ones."""
+    profiles = resolve_mentions(parse_mentions(comment.comment), comment_org_id(comment))
+    CommentMention.objects.filter(comment=comment).exclude(
+        profile__in=[profile.id for profile in profiles]
+    ).delete()
+    CommentMention.objects.bulk_create(
+        [
+            CommentMention(comment=comment, profile=profile, created_at=comment.created_at)
+            for profile in profiles
+        ],
+        ignore_conflicts=True,
+    )
+    return profiles
+
+
+def index_queryset(queryset, batch_size=1000):
+    """(Re)index the mentions of many comments, for backfills."""
+    indexed = 0
+    comments = queryset.filter(comment__contains="@").select_related("commented_by")
+    for comment in comments.iterator(chunk_size=batch_size):
+        indexed += len(index_mentions(comment))
+    return indexed
+
+
+def mentions_of(profile):
+    """The profile's mentions, newest comment first."""
+    return (
+        CommentMention.objects.filter(profile=profile)
+        .select_related("comment__commented_by__user")
+        .order_by("-created_at")
+    )
+
+
+def comment_entity(comment):
+    """(entity, id) of the record the comment is on, (None, None) if none."""
+    for entity in COMMENT_ENTITIES:
+        object_id = getattr(comment, entity + "_id")
+        if object_id:
+            return entity, object_id
+    return None, None
@@ -0,0 +1,153 @@
+import os
+import socket
+import threading
+import time
+
+from django.conf import settings
+
+from common.cache import get_shared_cache
+
+# upper bounds (seconds) of the request latency histogram
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROCESSES_KEY = "crm:metrics:processes"
+SNAPSHOT_TIMEOUT = 60 * 60 * 24
+
+
+def empty_series():
+    return {
+        "requests": 0,
+        "errors": 0,
+        "latency_sum": 0.0,
+        "latency_buckets": [0] * len(LATENCY_BUCKETS),
+        "queries": 0,
+        "queries_max": 0,
+        "db_time": 0.0,
+    }
+
+
+def merge_series(into, series):
+    into["requests"] += series["requests"]
+    into["errors"] += series["errors"]
+    into["latency_sum"] += series["latency_sum"]
+    into["latency_buckets"] = [
+        a + b for a, b in zip(into["latency_buckets"], series["latency_buckets"])
+    ]
+    into["queries"] += series["queries"]
+    into["queries_max"] = max(into["queries_max"], series["queries_max"])
+    into["db_time"] += series["db_time"]
+    return into
+
+
+class RequestMetrics:
+    """
+    Per-process request metrics keyed by (url name, org id).
+
+    Recording only touches process memory; every ``flush_interval`` seconds
+    the process writes its totals to the shared cache under its own key, so
+    the metrics endpoint and the ``request_metrics`` command can add up all
+    worker processes.
+    """
+
+    def __init__(self, flush_interval=10):
+        self.flush_interval = flush_interval
+        self.series = {}
+        self.last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def process_key(self):
+        return "crm:metrics:process:%s:%s" % (socket.gethostname(), os.getpid())
+
+    def record(self, view, org, duration, queries, db_time, error=False):
+        with self._lock:
+            series = self.series.setdefault((view, org), empty_series())
+            series["requests"] += 1
+            series["errors"] += int(error)
+            series["latency_sum"] += duration
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if duration <= bound:
+                    series["latency_buckets"][index] += 1
+            series["queries"] += queries
+            series["queries_max"] = max(series["queries_max"], queries)
+            series["db_time"] += db_time
+            due = time.monotonic() - self.last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            self.last_flush = time.monotonic()
+            snapshot = [
+                [view, org, dict(series, latency_buckets=list(series["latency_buckets"]))]
+                for (view, org), series in self.series.items()
+            ]
+        cache = get_shared_cache()
+        cache.set(self.process_key, snapshot, SNAPSHOT_TIMEOUT)
+        processes = set(cache.get(PROCESSES_KEY) or ())
+        if self.process_key not in processes:
+            processes.add(self.process_key)
+            cache.set(PROCESSES_KEY, sorted(processes), SNAPSHOT_TIMEOUT)
+
+    def reset(self):
+        with self._lock:
+            self.series = {}
+
+    def collect(self):
+        """Totals of every process that flushed, keyed by (view, org)."""
+        if self.series:
+            self.flush()
+        cache = get_shared_cache()
+        keys = cache.get(PROCESSES_KEY) or []
+        totals = {}
+        for snapshot in cache.get_many(keys).values():
+            for view, org, series in snapshot:
+                merge_series(totals.setdefault((view, org), empty_series()), series)
+        return totals
+
+    def clear(self):
+        """Drop the collected metrics of all processes."""
+        self.reset()
+        cache = get_shared_cache()
+        cache.delete_many(list(cache.get(PROCESSES_KEY) or []) + [PROCESSES_KEY])
+
+
+def label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(totals):
+    """Prometheus text exposition (format 0.0.4) of ``RequestMetrics.collect``."""
+    metrics = (
+        ("crm_http_requests_total", "counter", "API requests.", "requests"),
+        ("crm_http_request_errors_total", "counter", "API requests answered with 5xx.", "errors"),
+        ("crm_db_queries_total", "counter", "SQL queries run by API requests.", "queries"),
+        ("crm_db_queries_max", "gauge", "Most SQL queries run by one request.", "queries_max"),
+        ("crm_db_query_seconds_total", "counter", "Time spent in SQL queries.", "db_time"),
+    )
+    lines = []
+    items = sorted(totals.items())
+    for name, kind, help_text, field in metrics:
+        lines.append("# HELP %s %s" % (name, help_text))
+        lines.append("# TYPE %s %s" % (name, kind))
+        for (view, org), series in items:
+            lines.append(
+                '%s{view="%s",org="%s"} %s' % (name, label(view), label(org), series[field])
+            )
+
+    name = "crm_http_request_duration_seconds"
+    lines.append("# HELP %s API request latency." % name)
+    lines.append("# TYPE %s histogram" % name)
+    for (view, org), series in items:
+        labels = 'view="%s",org="%s"' % (label(view), label(org))
+        for bound, count in zip(LATENCY_BUCKETS, series["latency_buckets"]):
+            lines.append('%s_bucket{%s,le="%s"} %s' % (name, labels, bound, count))
+        lines.append('%s_bucket{%s,le="+Inf"} %s' % (name, labels, series["requests"]))
+        lines.append("%s_sum{%s} %s" % (name, labels, series["latency_sum"]))
+        lines.append("%s_count{%s} %s" % (name, labels, series["requests"]))
+    return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics(
+    flush_interval=getattr(settings, "REQUEST_METRICS_FLUSH_INTERVAL", 10)
+)
@@ -0,0 +1,60 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from common.metrics import request_metrics
+
+
+class QueryCounter:
+    """``connection.execute_wrapper`` counting queries and their duration."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, SQL query count and SQL time of every request under
+    its URL name and the org of ``request.profile``. Enabled with
+    REQUEST_METRICS_ENABLED, see common.metrics.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = (match.view_name if match else None) or "unresolved"
+        profile = getattr(request, "profile", None)
+        org = getattr(profile, "org_id", None) or "-"
+        request_metrics.record(
+            view,
+            str(org),
+            duration,
+            counter.count,
+            counter.duration,
+            error=response.status_code >= 500,
+        )
+        return response
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:38
+
+from django.conf import settings
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_gin_index(apps, schema_editor):
+    # tsvector search is PostgreSQL only, other databases use the fallback
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX search_document_vector_idx ON search_document "
+            "USING gin (search_vector)"
+        )
+
+
+def drop_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS search_document_vector_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0010_alter_attachments_created_by'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(choices=[('lead', 'Lead'), ('contact', 'Contact'), ('account', 'Account'), ('opportunity', 'Opportunity')], max_length=20)),
+                ('object_id', models.UUIDField()),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField(blank=True, default='')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('org', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_documents', to='common.org')),
+            ],
+            options={
+                'db_table': 'search_document',
+                'indexes': [models.Index(fields=['org', 'entity'], name='search_document_org_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('entity', 'object_id'), name='search_document_object_uniq'),
+        ),
+        migrations.RunPython(create_gin_index, drop_gin_index),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.14 on 2026-10-18 15:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0011_searchdocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentMention',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('comment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mentions', to='common.comment')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comment_mentions', to='common.profile')),
+            ],
+            options={
+                'db_table': 'comment_mention',
+                'indexes': [models.Index(fields=['profile', '-created_at'], name='comment_mention_profile_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='commentmention',
+            constraint=models.UniqueConstraint(fields=('comment', 'profile'), name='comment_mention_uniq'),
+        ),
+    ]
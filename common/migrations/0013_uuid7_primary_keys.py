@@ -0,0 +1,59 @@
+# Generated by Django 5.0.14 on 2026-10-18 15:46
+
+import common.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0012_comment_mention'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='address',
+            name='id',
+            field=models.UUIDField(db_index=True, default=common.ids.uuid7, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='apisettings',
+            name='id',
+            field=models.UUIDField(db_index=True, default=common.ids.uuid7, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='attachments',
+            name='id',
+            field=models.UUIDField(db_index=True, default=common.ids.uuid7, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='id',
+            field=models.UUIDField(db_index=True, default=common.ids.uuid7, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='commentfiles',
+            name='id',
+            field=models.UUIDField(db_index=True, default=common.ids.uuid7, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='document',
+            name='id',
+            field=models.UUIDField(db_index=True, default=common.ids.uuid7, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='org',
+            name='id',
+            field=models.UUIDField(db_index=True, default=common.ids.uuid7, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='id',
+            field=models.UUIDField(db_index=True, default=common.ids.uuid7, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='id',
+            field=models.UUIDField(db_index=True, default=common.ids.uuid7, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+    ]
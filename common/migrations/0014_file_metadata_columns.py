@@ -0,0 +1,53 @@
+# Generated by Django 5.0.14 on 2026-10-18 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0013_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachments',
+            name='category',
+            field=models.CharField(blank=True, choices=[('audio', 'audio'), ('video', 'video'), ('image', 'image'), ('pdf', 'pdf'), ('code', 'code'), ('text', 'text'), ('sheet', 'sheet'), ('zip', 'zip'), ('file', 'file')], db_index=True, default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='attachments',
+            name='extension',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='attachments',
+            name='mime_type',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='attachments',
+            name='size',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='category',
+            field=models.CharField(blank=True, choices=[('audio', 'audio'), ('video', 'video'), ('image', 'image'), ('pdf', 'pdf'), ('code', 'code'), ('text', 'text'), ('sheet', 'sheet'), ('zip', 'zip'), ('file', 'file')], db_index=True, default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='extension',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='mime_type',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='size',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 16:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0015_chunked_uploads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachments',
+            name='thumbnails',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
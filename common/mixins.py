@@ -4,6 +4,17 @@ import uuid
 # Django imports
 from common.models import models
 
+# Module imports
+from common.file_types import (
+    CATEGORY_CHOICES,
+    CATEGORY_ICONS,
+    file_category,
+    file_extension,
+    file_metadata,
+)
+
+FILE_METADATA_FIELDS = ("extension", "category", "mime_type", "size")
+
 
 class TimeAuditModel(models.Model):
 
@@ -47,4 +58,46 @@ class AuditModel(TimeAuditModel, UserAuditModel):
     """To path when the record was created and last modified"""
 
     class Meta:
-        abstract = True
\ No newline at end of file
+        abstract = True
+
+class FileMetadataModel(models.Model):
+
+    """
+    Extension, category, MIME type and size of the file in
+    ``metadata_file_field``, stored when a file is uploaded so lists and
+    category filters read columns instead of inspecting file names
+    (rebuild_file_metadata backfills older rows).
+    """
+
+    metadata_file_field = None
+
+    extension = models.CharField(max_length=16, blank=True, default="")
+    category = models.CharField(
+        max_length=10, choices=CATEGORY_CHOICES, blank=True, default="", db_index=True
+    )
+    mime_type = models.CharField(max_length=100, blank=True, default="")
+    size = models.PositiveBigIntegerField(null=True, blank=True)
+
+    class Meta:
+        abstract = True
+
+    def set_file_metadata(self, with_size=True):
+        field_file = getattr(self, self.metadata_file_field)
+        for name, value in file_metadata(field_file, with_size).items():
+            setattr(self, name, value)
+
+    def save(self, *args, **kwargs):
+        field_file = getattr(self, self.metadata_file_field)
+        # a new upload, or a row from before the columns existed
+        if field_file and (not field_file._committed or not self.category):
+            self.set_file_metadata()
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], *FILE_METADATA_FIELDS}
+        super().save(*args, **kwargs)
+
+    def file_type(self):
+        """(category, icon class) of the file."""
+        category = self.category or file_category(
+            file_extension(getattr(self, self.metadata_file_field).name)
+        )
+        return (category, CATEGORY_ICONS[category])
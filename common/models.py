@@ -7,24 +7,17 @@ import arrow
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from .manager import UserManager
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from phonenumber_field.modelfields import PhoneNumberField
 
 
-from common.templatetags.common_tags import (
-    is_document_file_audio,
-    is_document_file_code,
-    is_document_file_image,
-    is_document_file_pdf,
-    is_document_file_sheet,
-    is_document_file_text,
-    is_document_file_video,
-    is_document_file_zip,
-)
 from common.utils import COUNTRIES, ROLES
 from common.base import BaseModel
+from common.ids import uuid7
+from common.mixins import FileMetadataModel
 
 
 def img_url(self, filename):
@@ -34,7 +27,7 @@ def img_url(self, filename):
 
 class User(AbstractBaseUser, PermissionsMixin):
     id = models.UUIDField(
-        default=uuid.uuid4, unique=True, editable=False, db_index=True, primary_key=True
+        default=uuid7, unique=True, editable=False, db_index=True, primary_key=True
     )
     email = models.EmailField(_("email address"), blank=True, unique=True)
     profile_pic = models.CharField(
@@ -329,6 +322,10 @@ class CommentFiles(BaseModel):
     comment_file = models.FileField(
         "File", upload_to="CommentFiles", null=True, blank=True
     )
+    # the deduplicated file a chunked upload points to (common.uploads)
+    blob = models.ForeignKey(
+        "FileBlob", null=True, blank=True, on_delete=models.PROTECT, related_name="+"
+    )
 
     class Meta:
         verbose_name = "CommentFile"
@@ -346,7 +343,9 @@ class CommentFiles(BaseModel):
         return None
 
 
-class Attachments(BaseModel):
+class Attachments(FileMetadataModel, BaseModel):
+    metadata_file_field = "attachment"
+
     created_by = models.ForeignKey(
         User,
         related_name="attachment_created_by",
@@ -356,6 +355,10 @@ class Attachments(BaseModel):
     )
     file_name = models.CharField(max_length=60)
     attachment = models.FileField(max_length=1001, upload_to="attachments/%Y/%m/")
+    # the deduplicated file a chunked upload points to (common.uploads)
+    blob = models.ForeignKey(
+        "FileBlob", null=True, blank=True, on_delete=models.PROTECT, related_name="+"
+    )
     lead = models.ForeignKey(
         "leads.Lead",
         null=True,
@@ -414,6 +417,8 @@ class Attachments(BaseModel):
         related_name="events_attachment",
         on_delete=models.CASCADE,
     )
+    # thumbnail name -> storage name, filled by common.thumbnails after upload
+    thumbnails = models.JSONField(default=dict, blank=True)
 
     class Meta:
         verbose_name = "Attachment"
@@ -424,29 +429,6 @@ class Attachments(BaseModel):
     def __str__(self):
         return f"{self.file_name}"
 
-    def file_type(self):
-        name_ext_list = self.attachment.url.split(".")
-        if len(name_ext_list) > 1:
-            ext = name_ext_list[int(len(name_ext_list) - 1)]
-            if is_document_file_audio(ext):
-                return ("audio", "fa fa-file-audio")
-            if is_document_file_video(ext):
-                return ("video", "fa fa-file-video")
-            if is_document_file_image(ext):
-                return ("image", "fa fa-file-image")
-            if is_document_file_pdf(ext):
-                return ("pdf", "fa fa-file-pdf")
-            if is_document_file_code(ext):
-                return ("code", "fa fa-file-code")
-            if is_document_file_text(ext):
-                return ("text", "fa fa-file-alt")
-            if is_document_file_sheet(ext):
-                return ("sheet", "fa fa-file-excel")
-            if is_document_file_zip(ext):
-                return ("zip", "fa fa-file-archive")
-            return ("file", "fa fa-file")
-        return ("file", "fa fa-file")
-
     def get_file_type_display(self):
         if self.attachment:
             return self.file_type()[1]
@@ -462,12 +444,18 @@ def document_path(self, filename):
     return "%s/%s/%s" % ("docs", hash_, filename)
 
 
-class Document(BaseModel):
+class Document(FileMetadataModel, BaseModel):
+    metadata_file_field = "document_file"
+
 
     DOCUMENT_STATUS_CHOICE = (("active", "active"), ("inactive", "inactive"))
 
     title = models.TextField(blank=True, null=True)
     document_file = models.FileField(upload_to=document_path, max_length=5000)
+    # the deduplicated file a chunked upload points to (common.uploads)
+    blob = models.ForeignKey(
+        "FileBlob", null=True, blank=True, on_delete=models.PROTECT, related_name="+"
+    )
     created_by = models.ForeignKey(
         Profile,
         related_name="document_uploaded",
@@ -498,29 +486,6 @@ class Document(BaseModel):
     def __str__(self):
         return f"{self.title}"
  
-    def file_type(self):
-        name_ext_list = self.document_file.url.split(".")
-        if len(name_ext_list) > 1:
-            ext = name_ext_list[int(len(name_ext_list) - 1)]
-            if is_document_file_audio(ext):
-                return ("audio", "fa fa-file-audio")
-            if is_document_file_video(ext):
-                return ("video", "fa fa-file-video")
-            if is_document_file_image(ext):
-                return ("image", "fa fa-file-image")
-            if is_document_file_pdf(ext):
-                return ("pdf", "fa fa-file-pdf")
-            if is_document_file_code(ext):
-                return ("code", "fa fa-file-code")
-            if is_document_file_text(ext):
-                return ("text", "fa fa-file-alt")
-            if is_document_file_sheet(ext):
-                return ("sheet", "fa fa-file-excel")
-            if is_document_file_zip(ext):
-                return ("zip", "fa fa-file-archive")
-            return ("file", "fa fa-file")
-        return ("file", "fa fa-file")
-
     @property
     def get_team_users(self):
         team_user_ids = list(self.teams.values_list("users__id", flat=True))
@@ -587,3 +552,174 @@ class APISettings(BaseModel):
         if not self.apikey or self.apikey is None or self.apikey == "":
             self.apikey = generate_key()
         super().save(*args, **kwargs)
+
+
+class SearchDocument(models.Model):
+    """
+    Denormalized search text of a CRM record, kept up to date by the
+    receivers in common.signals and queried by common.search. On
+    PostgreSQL ``search_vector`` holds the weighted tsvector (GIN indexed);
+    other databases fall back to matching ``title``/``body``.
+    """
+
+    ENTITY_CHOICES = (
+        ("lead", "Lead"),
+        ("contact", "Contact"),
+        ("account", "Account"),
+        ("opportunity", "Opportunity"),
+    )
+
+    org = models.ForeignKey(Org, on_delete=models.CASCADE, related_name="search_documents")
+    entity = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    object_id = models.UUIDField()
+    created_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True, default="")
+    search_vector = SearchVectorField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "search_document"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["entity", "object_id"], name="search_document_object_uniq"
+            )
+        ]
+        indexes = [models.Index(fields=["org", "entity"], name="search_document_org_idx")]
+
+    def __str__(self):
+        return f"{self.entity}: {self.title}"
+
+
+class CommentMention(models.Model):
+    """
+    A profile @mentioned in a comment, kept in step with the comment text
+    by the receivers in common.signals (see common.mentions). Indexed by
+    (profile, created_at) so a profile's mentions are one index range scan.
+    """
+
+    comment = models.ForeignKey(Comment, on_delete=models.CASCADE, related_name="mentions")
+    profile = models.ForeignKey(
+        Profile, on_delete=models.CASCADE, related_name="comment_mentions"
+    )
+    # the comment's created_at, so the profile index is ordered by it
+    created_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "comment_mention"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["comment", "profile"], name="comment_mention_uniq"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["profile", "-created_at"], name="comment_mention_profile_idx")
+        ]
+
+    def __str__(self):
+        return f"{self.profile_id} in {self.comment_id}"
+
+
+class FileBlob(models.Model):
+    """
+    A stored file, addressed by the SHA-256 of its content. Attachments,
+    comment files and documents uploaded through common.uploads point to
+    the blob of their content instead of storing a copy each;
+    ``ref_count`` counts them and the blob is deleted with the last one.
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.PositiveBigIntegerField()
+    file = models.FileField(max_length=255)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "file_blob"
+
+    def __str__(self):
+        return self.sha256
+
+
+class UploadSession(BaseModel):
+    """
+    A resumable chunked upload (common.uploads): the client sends the
+    chunks in any order and retries missing ones, then a celery task
+    assembles them into a FileBlob and creates the attachment, comment
+    file or document ``target`` asks for.
+    """
+
+    TARGET_CHOICES = (
+        ("lead", "Lead"),
+        ("account", "Account"),
+        ("contact", "Contact"),
+        ("opportunity", "Opportunity"),
+        ("case", "Case"),
+        ("task", "Task"),
+        ("invoice", "Invoice"),
+        ("event", "Event"),
+        ("comment", "Comment"),
+        ("document", "Document"),
+    )
+    STATUS_CHOICES = (
+        ("uploading", "Uploading"),
+        ("finalizing", "Finalizing"),
+        ("complete", "Complete"),
+        ("failed", "Failed"),
+    )
+
+    org = models.ForeignKey(Org, on_delete=models.CASCADE, related_name="upload_sessions")
+    profile = models.ForeignKey(
+        Profile, on_delete=models.CASCADE, related_name="upload_sessions"
+    )
+    file_name = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES)
+    target_id = models.UUIDField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="uploading")
+    sha256 = models.CharField(max_length=64, blank=True, default="")
+    blob = models.ForeignKey(
+        FileBlob, null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    # id of the attachment, comment file or document created at the end
+    result_id = models.UUIDField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+
+    class Meta:
+        db_table = "upload_session"
+        ordering = ("-created_at",)
+
+    def __str__(self):
+        return f"{self.file_name} ({self.status})"
+
+    @property
+    def chunk_count(self):
+        return max(-(-self.size // self.chunk_size), 1)
+
+    def expected_chunk_size(self, index):
+        if index == self.chunk_count - 1:
+            return self.size - index * self.chunk_size
+        return self.chunk_size
+
+
+class UploadChunk(models.Model):
+    """A received chunk of an UploadSession, stored until it is finalized."""
+
+    session = models.ForeignKey(UploadSession, on_delete=models.CASCADE, related_name="chunks")
+    index = models.PositiveIntegerField()
+    size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64)
+    name = models.CharField(max_length=255)
+    received_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "upload_chunk"
+        constraints = [
+            models.UniqueConstraint(fields=["session", "index"], name="upload_chunk_uniq")
+        ]
+
+    def __str__(self):
+        return f"{self.session_id}[{self.index}]"
@@ -0,0 +1,86 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import get_template
+
+from common.models import Profile, User
+
+logger = logging.getLogger(__name__)
+
+
+def profile_recipients(profile_ids):
+    """Users of the active profiles, resolved with one query."""
+    profiles = Profile.objects.filter(id__in=list(profile_ids), is_active=True)
+    return [profile.user for profile in profiles.select_related("user")]
+
+
+def user_recipients(user_ids):
+    """Active users, resolved with one query."""
+    return list(User.objects.filter(id__in=list(user_ids), is_active=True))
+
+
+def default_personalize(recipient):
+    return {"user": recipient}
+
+
+def send_notification(
+    subject,
+    template_name,
+    context,
+    recipients,
+    personalize=default_personalize,
+    from_email=None,
+    connection=None,
+):
+    """
+    Send one html email per recipient over a single mail connection.
+
+    ``context`` is shared by every message; ``personalize(recipient)``
+    returns the recipient specific part. The template is loaded once and
+    rendered once per distinct personal context (compared by the string
+    form of its values), and messages go out in batches of
+    ``NOTIFICATION_BATCH_SIZE`` through ``send_messages``.
+
+    Returns the send stats, which are also logged per batch.
+    """
+    template = get_template(template_name)
+    batch_size = settings.NOTIFICATION_BATCH_SIZE
+    stats = {"template": template_name, "recipients": 0, "sent": 0, "batches": []}
+    rendered = {}
+    messages = []
+    seen = set()
+    start = time.perf_counter()
+    for recipient in recipients:
+        email = getattr(recipient, "email", None)
+        if not email or email in seen:
+            continue
+        seen.add(email)
+        personal = personalize(recipient)
+        key = tuple(sorted((name, str(value)) for name, value in personal.items()))
+        if key not in rendered:
+            rendered[key] = template.render({**context, **personal})
+        message = EmailMessage(subject, rendered[key], from_email, to=[email])
+        message.content_subtype = "html"
+        messages.append(message)
+    stats["recipients"] = len(messages)
+    stats["renders"] = len(rendered)
+    stats["render_seconds"] = round(time.perf_counter() - start, 4)
+
+    if messages:
+        connection = connection or get_connection()
+        with connection:
+            for offset in range(0, len(messages), batch_size):
+                batch = messages[offset : offset + batch_size]
+                batch_start = time.perf_counter()
+                sent = connection.send_messages(batch) or 0
+                seconds = round(time.perf_counter() - batch_start, 4)
+                stats["sent"] += sent
+                stats["batches"].append({"size": len(batch), "sent": sent, "seconds": seconds})
+                logger.info(
+                    "%s: sent %s/%s notifications in %.4fs",
+                    template_name, sent, len(batch), seconds,
+                )
+    stats["seconds"] = round(time.perf_counter() - start, 4)
+    return stats
@@ -0,0 +1,107 @@
+import base64
+import json
+import uuid
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.urls import replace_query_param
+
+KEYSET_ORDERING = ("-created_at", "-id")
+
+
+class KeysetPagination(LimitOffsetPagination):
+    """
+    LimitOffsetPagination with an opt-in keyset (cursor) mode.
+
+    Clients switch a list to keyset mode with ``?pagination=cursor`` and
+    follow the returned ``next_cursor``. Pages are ordered on
+    (created_at, id), which the per-org list indexes cover, so page N costs
+    the same as page 1. In keyset mode no COUNT query is made and ``count``
+    is None.
+    """
+
+    mode_query_param = "pagination"
+    cursor_query_param = "cursor"
+
+    keyset = False
+    next_cursor = None
+
+    def is_keyset_request(self, request, cursor_query_param=None):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or (cursor_query_param or self.cursor_query_param) in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None, cursor_query_param=None):
+        """
+        Views paginating two lists from one request (open/closed leads)
+        give each list its own ``cursor_query_param``.
+        """
+        cursor_query_param = cursor_query_param or self.cursor_query_param
+        self.keyset = self.is_keyset_request(request, cursor_query_param)
+        self.page_cursor_query_param = cursor_query_param
+        if not self.keyset:
+            return super().paginate_queryset(
+                queryset.order_by(*KEYSET_ORDERING), request, view
+            )
+
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.offset = 0
+        self.count = None
+        queryset = queryset.order_by(*KEYSET_ORDERING)
+        cursor = request.query_params.get(cursor_query_param)
+        if cursor:
+            created_at, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            )
+        results = list(queryset[: self.limit + 1])
+        self.next_cursor = None
+        if len(results) > self.limit:
+            results = results[: self.limit]
+            self.next_cursor = self.encode_cursor(results[-1])
+        return results
+
+    def get_next_offset(self, results):
+        """
+        The "offset" the list views return: where the next page starts,
+        None on the last page (the next cursor in keyset mode).
+        """
+        if self.keyset:
+            return self.next_cursor
+        if not results:
+            return 0
+        next_offset = self.offset + len(results)
+        return None if next_offset >= self.count else next_offset
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_cursor_query_param, self.next_cursor)
+
+    def get_previous_link(self):
+        # keyset pages only walk forward
+        if not self.keyset:
+            return super().get_previous_link()
+        return None
+
+    def encode_cursor(self, obj):
+        value = json.dumps([obj.created_at.isoformat(), str(obj.id)])
+        return base64.urlsafe_b64encode(value.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            created_at, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            created_at = parse_datetime(created_at)
+            pk = uuid.UUID(pk)
+        except (TypeError, ValueError):
+            raise NotFound("Invalid cursor")
+        if created_at is None:
+            raise NotFound("Invalid cursor")
+        return created_at, pk
@@ -0,0 +1,83 @@
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from common.cache import profile_cache
+
+
+class RequestAuth:
+    """What a request authenticated as: its user, profile, org and token."""
+
+    __slots__ = ("user", "profile", "org", "token")
+
+    def __init__(self, user=None, profile=None, org=None, token=None):
+        self.user = user
+        self.profile = profile
+        self.org = org
+        self.token = token
+
+
+def bearer_token(request):
+    header = request.headers.get("Authorization", "")
+    parts = header.split()
+    return parts[1] if len(parts) == 2 else None
+
+
+def get_request_auth(request):
+    """
+    Authenticate ``request`` (an HttpRequest or a DRF Request) once.
+
+    The JWT is decoded and verified once and the profile and user come
+    from common.cache.profile_cache; the result is kept on the
+    HttpRequest, so GetProfileAndOrg and the DRF authentication class
+    share it. Raises AuthenticationFailed.
+    """
+    request = getattr(request, "_request", request)
+    auth = getattr(request, "_crm_auth", None)
+    if auth is None:
+        auth = resolve(request)
+        request._crm_auth = auth
+    return auth
+
+
+def resolve(request):
+    auth = RequestAuth()
+    user_id = None
+
+    raw_token = bearer_token(request)
+    if raw_token:
+        try:
+            auth.token = AccessToken(raw_token)
+        except TokenError as exc:
+            raise AuthenticationFailed(str(exc))
+        user_id = auth.token.get(jwt_settings.USER_ID_CLAIM)
+
+    api_key = request.headers.get("Token")
+    if api_key:
+        org, profile = profile_cache.get_api_key_profile(api_key)
+        if org is None:
+            raise AuthenticationFailed("Invalid API Key")
+        request.META["org"] = org.id
+        auth.org, auth.profile = org, profile
+        if profile is not None:
+            user_id = profile.user_id
+
+    if user_id is None:
+        return auth
+
+    if auth.profile is None:
+        # without an org header (Swagger or another client) the first
+        # active profile of the user is used
+        org_header = request.headers.get("org")
+        auth.profile = profile_cache.get_profile(user_id, org_header)
+        if org_header and auth.profile is None:
+            raise AuthenticationFailed("No active profile for this user in the requested org")
+        auth.org = auth.profile.org if auth.profile is not None else None
+
+    auth.user = profile_cache.get_user(user_id)
+    if auth.user is None or not auth.user.is_active:
+        raise AuthenticationFailed("User not found or inactive")
+    if auth.profile is not None and auth.profile.user_id == auth.user.pk:
+        auth.profile.user = auth.user
+    return auth
@@ -0,0 +1,168 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Case, Exists, F, FloatField, OuterRef, Q, Value, When
+
+from accounts.models import Account
+from common.models import SearchDocument
+from contacts.models import Contact
+from leads.models import Lead
+from opportunity.models import Opportunity
+
+SEARCH_CONFIG = "simple"
+
+# entity -> (model, title fields, body fields)
+SEARCH_ENTITIES = {
+    "lead": (
+        Lead,
+        ("title",),
+        ("first_name", "last_name", "email", "account_name", "city", "description"),
+    ),
+    "contact": (
+        Contact,
+        ("first_name", "last_name"),
+        ("primary_email", "secondary_email", "description"),
+    ),
+    "account": (
+        Account,
+        ("name",),
+        ("email", "industry", "billing_city", "description"),
+    ),
+    "opportunity": (
+        Opportunity,
+        ("name",),
+        ("stage", "lead_source", "description"),
+    ),
+}
+SEARCH_MODELS = {model: entity for entity, (model, _, _) in SEARCH_ENTITIES.items()}
+
+
+def uses_tsvector():
+    return connection.vendor == "postgresql"
+
+
+def join_fields(instance, fields):
+    return " ".join(str(value) for value in (getattr(instance, f) for f in fields) if value)
+
+
+def build_document(entity, instance):
+    _, title_fields, body_fields = SEARCH_ENTITIES[entity]
+    return SearchDocument(
+        org_id=instance.org_id,
+        entity=entity,
+        object_id=instance.pk,
+        created_by_id=instance.created_by_id,
+        title=join_fields(instance, title_fields)[:255],
+        body=join_fields(instance, body_fields),
+    )
+
+
+def update_search_vectors(documents):
+    if uses_tsvector() and documents:
+        SearchDocument.objects.filter(id__in=[doc.id for doc in documents]).update(
+            search_vector=SearchVector("title", weight="A", config=SEARCH_CONFIG)
+            + SearchVector("body", weight="B", config=SEARCH_CONFIG)
+        )
+
+
+def index_object(instance):
+    """Create or refresh the search document of a saved record."""
+    entity = SEARCH_MODELS[type(instance)]
+    if not instance.org_id:
+        SearchDocument.objects.filter(entity=entity, object_id=instance.pk).delete()
+        return None
+    document = build_document(entity, instance)
+    document, _ = SearchDocument.objects.update_or_create(
+        entity=entity,
+        object_id=instance.pk,
+        defaults={
+            "org_id": document.org_id,
+            "created_by_id": document.created_by_id,
+            "title": document.title,
+            "body": document.body,
+        },
+    )
+    update_search_vectors([document])
+    return document
+
+
+def unindex_object(instance):
+    SearchDocument.objects.filter(
+        entity=SEARCH_MODELS[type(instance)], object_id=instance.pk
+    ).delete()
+
+
+def index_objects(instances, batch_size=1000):
+    """
+    (Re)index many records with bulk inserts, for records written without
+    post_save (bulk_create) and for backfills.
+    """
+    indexed = 0
+    batch = []
+    for instance in instances:
+        if not instance.org_id:
+            continue
+        batch.append(build_document(SEARCH_MODELS[type(instance)], instance))
+        if len(batch) >= batch_size:
+            indexed += _write_batch(batch)
+            batch = []
+    if batch:
+        indexed += _write_batch(batch)
+    return indexed
+
+
+def index_queryset(queryset, batch_size=1000):
+    return index_objects(queryset.iterator(chunk_size=batch_size), batch_size)
+
+
+def _write_batch(documents):
+    SearchDocument.objects.filter(
+        object_id__in=[doc.object_id for doc in documents]
+    ).delete()
+    documents = SearchDocument.objects.bulk_create(documents)
+    update_search_vectors(documents)
+    return len(documents)
+
+
+def visible_documents(profile, user):
+    """Search documents of the profile's org the profile may see."""
+    documents = SearchDocument.objects.filter(org_id=profile.org_id)
+    if profile.role == "ADMIN" or user.is_superuser:
+        return documents
+    visible = Q(created_by=user)
+    for entity, (model, _, _) in SEARCH_ENTITIES.items():
+        field = model._meta.get_field("assigned_to")
+        assigned = field.remote_field.through.objects.filter(
+            **{
+                field.m2m_field_name(): OuterRef("object_id"),
+                field.m2m_reverse_field_name(): profile.id,
+            }
+        )
+        visible |= Q(entity=entity) & Exists(assigned)
+    return documents.filter(visible)
+
+
+def search(profile, user, query, entities=None):
+    """
+    Ranked search documents matching ``query`` (one query). PostgreSQL
+    ranks with ts_rank over the GIN indexed vector; elsewhere every term
+    has to appear in the title or body and title matches rank first.
+    """
+    documents = visible_documents(profile, user)
+    if entities:
+        documents = documents.filter(entity__in=entities)
+    if uses_tsvector():
+        search_query = SearchQuery(query, search_type="websearch", config=SEARCH_CONFIG)
+        return (
+            documents.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F("search_vector"), search_query))
+            .order_by("-rank", "-updated_at")
+        )
+    for term in query.split():
+        documents = documents.filter(Q(title__icontains=term) | Q(body__icontains=term))
+    return documents.annotate(
+        rank=Case(
+            When(title__icontains=query, then=Value(1.0)),
+            default=Value(0.5),
+            output_field=FloatField(),
+        )
+    ).order_by("-rank", "-updated_at")
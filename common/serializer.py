@@ -9,6 +9,7 @@ from common.models import (
     Document,
     Org,
     Profile,
+    UploadSession,
     User,
 )
 from teams.serializer import TeamsSerializer  # needed for TeamsAndProfilesResponseSerializer
@@ -103,12 +104,59 @@ class ProfileSerializer(serializers.ModelSerializer):
 class AttachmentsSerializer(serializers.ModelSerializer):
     file_path = serializers.SerializerMethodField()
 
+    thumbnails = serializers.SerializerMethodField()
+
     def get_file_path(self, obj):
         return obj.attachment.url if obj.attachment else None
 
+    def get_thumbnails(self, obj):
+        """URLs of the rendered thumbnail/preview, {} until they are ready."""
+        storage = obj.attachment.storage
+        return {name: storage.url(path) for name, path in obj.thumbnails.items()}
+
     class Meta:
         model = Attachments
-        fields = ["id", "created_by", "file_name", "created_at", "file_path"]
+        fields = [
+            "id",
+            "created_by",
+            "file_name",
+            "created_at",
+            "file_path",
+            "extension",
+            "category",
+            "mime_type",
+            "size",
+            "thumbnails",
+        ]
+
+
+# ------------------ Chunked uploads ------------------
+class UploadSessionCreateSerializer(serializers.Serializer):
+    file_name = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=0)
+    target = serializers.ChoiceField(choices=UploadSession.TARGET_CHOICES)
+    target_id = serializers.UUIDField(required=False, allow_null=True)
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    chunk_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = UploadSession
+        fields = (
+            "id",
+            "file_name",
+            "size",
+            "chunk_size",
+            "chunk_count",
+            "target",
+            "target_id",
+            "status",
+            "sha256",
+            "result_id",
+            "error",
+            "created_at",
+        )
 
 
 # ------------------ Documents ------------------
@@ -127,6 +175,10 @@ class DocumentSerializer(serializers.ModelSerializer):
             "id",
             "title",
             "document_file",
+            "extension",
+            "category",
+            "mime_type",
+            "size",
             "status",
             "shared_to",
             "teams",
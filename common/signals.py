@@ -1,8 +1,20 @@
 # common/signals.py
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from common.models import Profile, Org
+from accounts.models import Account
+from common.cache import bump_cache_version, profile_cache
+from common.dashboard import dashboard_scope
+from common.mentions import index_mentions
+from common.search import index_object, unindex_object
+from common.models import Attachments, Comment, CommentFiles, Document, Profile, Org
+from common.tasks import generate_attachment_thumbnails
+from common.thumbnails import THUMBNAIL_CATEGORIES
+from common.uploads import release_blob
+from contacts.models import Contact
+from leads.models import Lead
+from opportunity.models import Opportunity
 
 User = get_user_model()
 
@@ -14,3 +26,91 @@ def create_user_profile(sender, instance, created, **kwargs):
         org, _ = Org.objects.get_or_create(name="Default Org")
         # Ensure a profile is created for this user
         Profile.objects.get_or_create(user=instance, defaults={"org": org})
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """Drop the cached user (and profiles) read by common.request_auth"""
+    profile_cache.invalidate(user_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    """Drop cached middleware lookups for the profile's user and org"""
+    profile_cache.invalidate(user_ids=[instance.user_id], org_ids=[instance.org_id])
+
+
+@receiver(post_save, sender=Org)
+@receiver(post_delete, sender=Org)
+def invalidate_org_cache(sender, instance, **kwargs):
+    """Drop cached middleware lookups that resolved to this org"""
+    profile_cache.invalidate(org_ids=[instance.id])
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+@receiver(post_save, sender=Contact)
+@receiver(post_delete, sender=Contact)
+@receiver(post_save, sender=Lead)
+@receiver(post_delete, sender=Lead)
+@receiver(post_save, sender=Opportunity)
+@receiver(post_delete, sender=Opportunity)
+def invalidate_dashboard(sender, instance, **kwargs):
+    """Drop the cached dashboard summaries of the record's org"""
+    if instance.org_id:
+        bump_cache_version(dashboard_scope(instance.org_id))
+
+
+@receiver(m2m_changed, sender=Account.assigned_to.through)
+@receiver(m2m_changed, sender=Contact.assigned_to.through)
+@receiver(m2m_changed, sender=Lead.assigned_to.through)
+@receiver(m2m_changed, sender=Opportunity.assigned_to.through)
+def invalidate_dashboard_assignments(sender, instance, action, **kwargs):
+    """Assignments change what non-admin dashboards include"""
+    # instance is the record, or the Profile for reverse changes
+    if action.startswith("post_") and instance.org_id:
+        bump_cache_version(dashboard_scope(instance.org_id))
+
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_save, sender=Contact)
+@receiver(post_save, sender=Lead)
+@receiver(post_save, sender=Opportunity)
+def update_search_document(sender, instance, **kwargs):
+    """Keep the record's search document in step with the record"""
+    index_object(instance)
+
+
+@receiver(post_delete, sender=Account)
+@receiver(post_delete, sender=Contact)
+@receiver(post_delete, sender=Lead)
+@receiver(post_delete, sender=Opportunity)
+def delete_search_document(sender, instance, **kwargs):
+    unindex_object(instance)
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_mentions(sender, instance, created, **kwargs):
+    """Keep the comment's mention rows in step with its text"""
+    if "@" in (instance.comment or "") or not created:
+        index_mentions(instance)
+
+
+@receiver(post_delete, sender=Attachments)
+@receiver(post_delete, sender=CommentFiles)
+@receiver(post_delete, sender=Document)
+def release_file_blob(sender, instance, **kwargs):
+    """Drop the deleted file's reference to its shared upload blob"""
+    if instance.blob_id:
+        release_blob(instance.blob_id)
+
+
+@receiver(post_save, sender=Attachments)
+def queue_attachment_thumbnails(sender, instance, created, **kwargs):
+    """Render thumbnails of uploaded images and PDFs in celery"""
+    if created and instance.category in THUMBNAIL_CATEGORIES and not instance.thumbnails:
+        attachment_id = str(instance.id)
+        transaction.on_commit(lambda: generate_attachment_thumbnails.delay(attachment_id))
@@ -9,6 +9,37 @@ organization_params = [
     organization_params_in_header,
 ]
 
+dashboard_params = [
+    organization_params_in_header,
+    OpenApiParameter(
+        "mode",
+        OpenApiTypes.STR,
+        OpenApiParameter.QUERY,
+        enum=["full", "dashboard"],
+        description="dashboard: counts, pipeline sums and the most recent records only",
+    ),
+    OpenApiParameter("top", OpenApiTypes.INT, OpenApiParameter.QUERY),
+]
+
+search_params = [
+    organization_params_in_header,
+    OpenApiParameter("q", OpenApiTypes.STR, OpenApiParameter.QUERY, required=True),
+    OpenApiParameter(
+        "entity",
+        OpenApiTypes.STR,
+        OpenApiParameter.QUERY,
+        description="Comma separated: lead, contact, account, opportunity",
+    ),
+    OpenApiParameter("limit", OpenApiTypes.INT, OpenApiParameter.QUERY),
+    OpenApiParameter("offset", OpenApiTypes.INT, OpenApiParameter.QUERY),
+]
+
+mention_params = [
+    organization_params_in_header,
+    OpenApiParameter("limit", OpenApiTypes.INT, OpenApiParameter.QUERY),
+    OpenApiParameter("offset", OpenApiTypes.INT, OpenApiParameter.QUERY),
+]
+
 user_list_params = [
     organization_params_in_header,
     OpenApiParameter("email",  OpenApiTypes.STR,OpenApiParameter.QUERY),
@@ -35,3 +66,18 @@ document_get_params = [
     OpenApiParameter("shared_to", OpenApiTypes.STR,OpenApiParameter.QUERY),
 ]
 
+upload_chunk_params = [
+    OpenApiParameter(
+        "X-Chunk-SHA256",
+        OpenApiTypes.STR,
+        OpenApiParameter.HEADER,
+        description="Optional hex SHA-256 of the chunk, checked on receipt",
+    ),
+]
+
+export_params = [
+    organization_params_in_header,
+    OpenApiParameter(
+        "output", OpenApiTypes.STR, OpenApiParameter.QUERY, enum=["csv", "ndjson"]
+    ),
+]
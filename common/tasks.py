@@ -1,4 +1,5 @@
 import datetime
+import logging
 
 from celery import Celery
 from django.conf import settings
@@ -9,11 +10,16 @@ from django.utils import timezone
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 
-from common.models import Comment, Profile, User
+from common.models import Attachments, Comment, CommentMention, Profile, UploadSession, User
+from common.notifications import send_notification
+from common.thumbnails import THUMBNAIL_CATEGORIES, generate_thumbnails
+from common.uploads import discard_upload, finalize_upload
 from common.token_generator import account_activation_token
 
 app = Celery("redis://")
 
+logger = logging.getLogger(__name__)
+
 
 @app.task
 def send_email_to_new_user(user_id):
@@ -58,72 +64,48 @@ def send_email_to_new_user(user_id):
         msg.send()
 
 
+COMMENT_SUBJECTS = {
+    "accounts": "New comment on Account. ",
+    "contacts": "New comment on Contact. ",
+    "leads": "New comment on Lead. ",
+    "opportunity": "New comment on Opportunity. ",
+    "cases": "New comment on Case. ",
+    "tasks": "New comment on Task. ",
+    "invoices": "New comment on Invoice. ",
+    "events": "New comment on Event. ",
+}
+
+
 @app.task
 def send_email_user_mentions(
     comment_id,
     called_from,
 ):
     """Send Mail To Mentioned Users In The Comment"""
-    comment = Comment.objects.filter(id=comment_id).first()
-    if comment:
-        comment_text = comment.comment
-        comment_text_list = comment_text.split()
-        recipients = []
-        for comment_text in comment_text_list:
-            if comment_text.startswith("@"):
-                if comment_text.strip("@").strip(",") not in recipients:
-                    if User.objects.filter(
-                        username=comment_text.strip("@").strip(","), is_active=True
-                    ).exists():
-                        email = (
-                            User.objects.filter(
-                                username=comment_text.strip("@").strip(",")
-                            )
-                            .first()
-                            .email
-                        )
-                        recipients.append(email)
-
-        context = {}
-        context["commented_by"] = comment.commented_by
-        context["comment_description"] = comment.comment
-        subject = None
-        if called_from == "accounts":
-            subject = "New comment on Account. "
-        elif called_from == "contacts":
-            subject = "New comment on Contact. "
-        elif called_from == "leads":
-            subject = "New comment on Lead. "
-        elif called_from == "opportunity":
-            subject = "New comment on Opportunity. "
-        elif called_from == "cases":
-            subject = "New comment on Case. "
-        elif called_from == "tasks":
-            subject = "New comment on Task. "
-        elif called_from == "invoices":
-            subject = "New comment on Invoice. "
-        elif called_from == "events":
-            subject = "New comment on Event. "
-        if subject:
-            context["url"] = settings.DOMAIN_NAME
-        else:
-            context["url"] = ""
-        # subject = 'Django CRM : comment '
-        if recipients:
-            for recipient in recipients:
-                recipients_list = [
-                    recipient,
-                ]
-                context["mentioned_user"] = recipient
-                html_content = render_to_string("comment_email.html", context=context)
-                msg = EmailMessage(
-                    subject,
-                    html_content,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    to=recipients_list,
-                )
-                msg.content_subtype = "html"
-                msg.send()
+    comment = Comment.objects.filter(id=comment_id).select_related("commented_by").first()
+    if not comment:
+        return None
+    # resolved and stored by common.signals when the comment was saved
+    recipients = [
+        mention.profile.user
+        for mention in CommentMention.objects.filter(
+            comment=comment, profile__is_active=True, profile__user__is_active=True
+        ).select_related("profile__user")
+    ]
+    subject = COMMENT_SUBJECTS.get(called_from)
+    context = {
+        "commented_by": comment.commented_by,
+        "comment_description": comment.comment,
+        "url": settings.DOMAIN_NAME if subject else "",
+    }
+    return send_notification(
+        subject,
+        "comment_email.html",
+        context,
+        recipients,
+        personalize=lambda user: {"mentioned_user": user.email},
+        from_email=settings.DEFAULT_FROM_EMAIL,
+    )
 
 
 @app.task
@@ -269,3 +251,54 @@ def send_email_to_reset_password(user_email):
         )
         msg.content_subtype = "html"
         msg.send()
+
+
+@app.task
+def finalize_upload_session(session_id):
+    """Assemble a completed chunked upload and attach it (common.uploads)"""
+    session = (
+        UploadSession.objects.filter(id=session_id, status="finalizing")
+        .select_related("created_by", "profile")
+        .first()
+    )
+    if session is None:
+        return
+    try:
+        obj = finalize_upload(session)
+    except Exception as error:
+        UploadSession.objects.filter(id=session_id).update(
+            status="failed", error=str(error)[:1000]
+        )
+        raise
+    # attach_blob bulk-creates, no post_save queues the thumbnails
+    if isinstance(obj, Attachments) and obj.category in THUMBNAIL_CATEGORIES:
+        generate_attachment_thumbnails.delay(str(obj.id))
+
+
+@app.task
+def expire_upload_sessions():
+    """Delete upload sessions (and their chunks) nothing happened to for a while"""
+    cutoff = timezone.now() - datetime.timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS)
+    stale = UploadSession.objects.filter(updated_at__lt=cutoff).exclude(
+        chunks__received_at__gte=cutoff
+    )
+    for session in stale.exclude(status="finalizing").iterator():
+        discard_upload(session)
+
+
+@app.task
+def generate_attachment_thumbnails(attachment_id):
+    """Render the thumbnail and preview of an image or PDF attachment"""
+    attachment = (
+        Attachments.objects.filter(id=attachment_id).only("id", "attachment", "category").first()
+    )
+    if attachment is None:
+        return
+    try:
+        names = generate_thumbnails(attachment.attachment, attachment.category)
+    except Exception:
+        # unreadable images, PDFs without pypdfium2: the list shows the icon
+        logger.exception("attachment %s: thumbnails failed", attachment_id)
+        return
+    if names:
+        Attachments.objects.filter(id=attachment_id).update(thumbnails=names)
@@ -0,0 +1,115 @@
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+# file categories (common.file_types) thumbnails are rendered for
+THUMBNAIL_CATEGORIES = ("image", "pdf")
+
+THUMBNAIL_FORMAT = "webp"
+
+_pool = None
+
+
+def thumbnail_sizes():
+    """Thumbnail name -> longest side in pixels, largest first."""
+    sizes = {
+        "preview": settings.ATTACHMENT_PREVIEW_SIZE,
+        "thumbnail": settings.ATTACHMENT_THUMBNAIL_SIZE,
+    }
+    return dict(sorted(sizes.items(), key=lambda item: -item[1]))
+
+
+def thumbnail_name(file_name, name):
+    """Storage name of a thumbnail, next to the file it is rendered from."""
+    return "%s.%s.%s" % (os.path.splitext(file_name)[0], name, THUMBNAIL_FORMAT)
+
+
+def thumbnail_names(file_name):
+    return {name: thumbnail_name(file_name, name) for name in thumbnail_sizes()}
+
+
+def open_pdf_page(data, size):
+    """The first page of a PDF as an image about ``size`` pixels high."""
+    # optional: without pypdfium2 PDFs get no preview
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(data)
+    try:
+        page = pdf[0]
+        scale = size / max(page.get_height(), 1)
+        return page.render(scale=min(scale, 4)).to_pil()
+    finally:
+        pdf.close()
+
+
+def render_thumbnails(data, category, sizes):
+    """
+    Encoded thumbnails of an image or PDF for each of ``sizes`` (name ->
+    longest side). CPU bound and self-contained so it can run in the
+    process pool; each size is scaled down from the previous larger one.
+    """
+    largest = max(sizes.values())
+    if category == "pdf":
+        image = open_pdf_page(data, largest)
+    else:
+        image = Image.open(io.BytesIO(data))
+        # JPEGs decode straight at a fraction of their size
+        image.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if alpha else "RGB")
+    rendered = {}
+    for name, size in sorted(sizes.items(), key=lambda item: -item[1]):
+        image.thumbnail((size, size), Image.LANCZOS)
+        output = io.BytesIO()
+        image.save(output, THUMBNAIL_FORMAT.upper(), quality=80, method=4)
+        rendered[name] = output.getvalue()
+    return rendered
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.THUMBNAIL_WORKERS)
+    return _pool
+
+
+def render(data, category, sizes):
+    # celery's prefork workers are daemonic and may not start a pool
+    if settings.THUMBNAIL_WORKERS <= 0 or multiprocessing.current_process().daemon:
+        return render_thumbnails(data, category, sizes)
+    return get_pool().submit(render_thumbnails, data, category, sizes).result()
+
+
+def generate_thumbnails(field_file, category):
+    """
+    Render and store the thumbnails of ``field_file``, returning their
+    storage names. Thumbnails already stored (e.g. for a deduplicated
+    upload blob shared with other attachments) are reused, not rendered
+    again. Returns {} for files too large or not renderable.
+    """
+    if category not in THUMBNAIL_CATEGORIES or not field_file:
+        return {}
+    names = thumbnail_names(field_file.name)
+    missing = {name: size for name, size in thumbnail_sizes().items()
+               if not default_storage.exists(names[name])}
+    if missing:
+        if field_file.size > settings.THUMBNAIL_MAX_SOURCE_SIZE:
+            return {}
+        with field_file.open("rb") as source:
+            data = source.read()
+        for name, content in render(data, category, missing).items():
+            default_storage.save(names[name], ContentFile(content))
+    return names
+
+
+def delete_thumbnails(file_name):
+    for name in thumbnail_names(file_name).values():
+        default_storage.delete(name)
@@ -0,0 +1,238 @@
+import hashlib
+import tempfile
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from common.file_types import file_extension, name_metadata
+from common.mixins import FileMetadataModel
+from common.thumbnails import delete_thumbnails
+from common.models import (
+    Attachments,
+    Comment,
+    CommentFiles,
+    Document,
+    FileBlob,
+    UploadChunk,
+    UploadSession,
+)
+
+# bytes read from the request or storage at a time
+COPY_BUFFER = 64 * 1024
+
+
+def blob_name(sha256, file_name):
+    """Storage name of a blob, sharded by the first hash byte."""
+    extension = file_extension(file_name)
+    return "blobs/%s/%s%s" % (sha256[:2], sha256, "." + extension if extension else "")
+
+
+def chunk_name(session, index):
+    return "uploads/%s/%06d" % (session.id, index)
+
+
+def target_exists(target, target_id, org):
+    if target == "document":
+        return True
+    if target == "comment":
+        return Comment.objects.filter(id=target_id, commented_by__org=org).exists()
+    model = Attachments._meta.get_field(target).related_model
+    return model.objects.filter(id=target_id, org=org).exists()
+
+
+def start_upload(profile, file_name, size, target, target_id=None):
+    """Open an upload session for a file of ``size`` bytes."""
+    if target not in dict(UploadSession.TARGET_CHOICES):
+        raise ValidationError("Unknown upload target %r" % target)
+    if target != "document" and not target_id:
+        raise ValidationError("target_id is required for %s uploads" % target)
+    if not 0 <= size <= settings.UPLOAD_MAX_SIZE:
+        raise ValidationError("Files can be at most %s bytes" % settings.UPLOAD_MAX_SIZE)
+    try:
+        exists = target_exists(target, target_id, profile.org)
+    except ValidationError:
+        exists = False
+    if not exists:
+        raise ValidationError("No %s %s in this organization" % (target, target_id))
+    return UploadSession.objects.create(
+        org=profile.org,
+        profile=profile,
+        file_name=file_name[:255],
+        size=size,
+        chunk_size=settings.UPLOAD_CHUNK_SIZE,
+        target=target,
+        target_id=target_id if target != "document" else None,
+    )
+
+
+def store_chunk(session, index, stream, sha256=None):
+    """
+    Stream chunk ``index`` from ``stream`` to storage, hashing it on the
+    way. Chunks can come in any order and a chunk sent again replaces the
+    previous copy, so clients resume by resending what is missing.
+    """
+    if session.status != "uploading":
+        raise ValidationError("The upload is %s" % session.status)
+    if not 0 <= index < session.chunk_count:
+        raise ValidationError("Chunk index must be below %s" % session.chunk_count)
+    expected = session.expected_chunk_size(index)
+    digest = hashlib.sha256()
+    received = 0
+    with tempfile.SpooledTemporaryFile(max_size=COPY_BUFFER * 16) as buffer:
+        # one byte past the expected size is enough to reject a long chunk
+        while received <= expected:
+            piece = stream.read(min(COPY_BUFFER, expected + 1 - received))
+            if not piece:
+                break
+            digest.update(piece)
+            buffer.write(piece)
+            received += len(piece)
+        if received != expected:
+            raise ValidationError("Chunk %s must be %s bytes" % (index, expected))
+        if sha256 and sha256.lower() != digest.hexdigest():
+            raise ValidationError("Chunk %s does not match its checksum" % index)
+        buffer.seek(0)
+        name = chunk_name(session, index)
+        if default_storage.exists(name):
+            default_storage.delete(name)
+        name = default_storage.save(name, File(buffer))
+    chunk, _ = UploadChunk.objects.update_or_create(
+        session=session,
+        index=index,
+        defaults={"size": received, "sha256": digest.hexdigest(), "name": name},
+    )
+    return chunk
+
+
+def missing_chunks(session):
+    received = set(session.chunks.values_list("index", flat=True))
+    return [index for index in range(session.chunk_count) if index not in received]
+
+
+def complete_upload(session):
+    """
+    Check every chunk arrived and hand the session to the finalize task.
+    Returns False when it is already finalizing or done; a failed upload
+    keeps its chunks and can be completed again.
+    """
+    missing = missing_chunks(session)
+    if missing:
+        raise ValidationError("Missing chunks: %s" % ", ".join(map(str, missing[:20])))
+    # only one request moves it on, retries of the call are no-ops
+    return bool(
+        UploadSession.objects.filter(
+            id=session.id, status__in=("uploading", "failed")
+        ).update(status="finalizing", error="")
+    )
+
+
+def acquire_blob(sha256, size, content, file_name):
+    """
+    The blob holding ``sha256`` with one more reference. ``content`` is
+    only written to storage when no upload of the same bytes exists yet.
+    """
+    if FileBlob.objects.filter(sha256=sha256).update(ref_count=F("ref_count") + 1):
+        return FileBlob.objects.get(sha256=sha256)
+    name = default_storage.save(blob_name(sha256, file_name), content)
+    try:
+        with transaction.atomic():
+            return FileBlob.objects.create(sha256=sha256, size=size, file=name, ref_count=1)
+    except IntegrityError:
+        # a concurrent upload of the same bytes created it first
+        default_storage.delete(name)
+        return acquire_blob(sha256, size, content, file_name)
+
+
+def release_blob(blob_id):
+    """Drop a reference, deleting the blob and its file with the last one."""
+    with transaction.atomic():
+        blob = FileBlob.objects.select_for_update().filter(id=blob_id).first()
+        if blob is None:
+            return
+        if blob.ref_count > 1:
+            blob.ref_count -= 1
+            blob.save(update_fields=["ref_count"])
+            return
+        name = blob.file.name
+        blob.delete()
+        transaction.on_commit(lambda: delete_blob_files(name))
+
+
+def delete_blob_files(name):
+    default_storage.delete(name)
+    delete_thumbnails(name)
+
+
+def attach_blob(session, blob):
+    """Create the attachment, comment file or document of a finished upload."""
+    if session.target == "document":
+        obj = Document(title=session.file_name, org_id=session.org_id)
+    elif session.target == "comment":
+        obj = CommentFiles(comment_id=session.target_id)
+    else:
+        obj = Attachments(
+            file_name=session.file_name[:60], **{session.target + "_id": session.target_id}
+        )
+    obj.blob = blob
+    if isinstance(obj, FileMetadataModel):
+        setattr(obj, obj.metadata_file_field, blob.file.name)
+        # from the uploaded name, the blob keeps the first upload's extension
+        for name, value in name_metadata(session.file_name).items():
+            setattr(obj, name, value)
+        obj.size = blob.size
+    else:
+        obj.comment_file = blob.file.name
+    type(obj).objects.create_batch([obj], user=session.created_by, profile=session.profile)
+    return obj
+
+
+def assemble(session):
+    """Concatenate the chunks into a temporary file, hashing as it is read."""
+    digest = hashlib.sha256()
+    assembled = tempfile.TemporaryFile()
+    for chunk in session.chunks.order_by("index"):
+        with default_storage.open(chunk.name, "rb") as part:
+            for piece in iter(lambda: part.read(COPY_BUFFER), b""):
+                digest.update(piece)
+                assembled.write(piece)
+    assembled.seek(0)
+    return assembled, digest.hexdigest()
+
+
+def discard_chunks(session):
+    for name in session.chunks.values_list("name", flat=True):
+        default_storage.delete(name)
+    session.chunks.all().delete()
+
+
+def finalize_upload(session):
+    """
+    Assemble a completed upload into its blob (reusing the blob of an
+    identical file), attach it to the target and drop the chunks.
+    """
+    assembled, sha256 = assemble(session)
+    with assembled:
+        blob = acquire_blob(sha256, session.size, File(assembled), session.file_name)
+    try:
+        with transaction.atomic():
+            obj = attach_blob(session, blob)
+            session.status = "complete"
+            session.sha256 = sha256
+            session.blob = blob
+            session.result_id = obj.id
+            session.save(update_fields=["status", "sha256", "blob", "result_id", "updated_at"])
+    except Exception:
+        release_blob(blob.id)
+        raise
+    discard_chunks(session)
+    return obj
+
+
+def discard_upload(session):
+    """Delete a session and the chunks it stored."""
+    discard_chunks(session)
+    session.delete()
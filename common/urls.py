@@ -14,6 +14,15 @@ from .views import (
     UserViewSet,
     MePasswordView,
     AdminPasswordResetView,
+    ProfileCacheStatsView,
+    RequestMetricsView,
+    SearchView,
+    MentionsView,
+    ExportView,
+    UploadSessionListView,
+    UploadSessionDetailView,
+    UploadChunkView,
+    UploadCompleteView,
 )
 
 app_name = "common"
@@ -22,12 +31,21 @@ urlpatterns = [
     path("admin-users/", AdminUserCreationViewSet.as_view({"get": "list", "post": "create"}), name="admin-user-list"),
     path("teams-users/", GetTeamsAndUsersView.as_view(), name="teams-users"),
     path("dashboard/", ApiHomeView.as_view(), name="dashboard"),
+    path("search/", SearchView.as_view(), name="search"),
+    path("mentions/", MentionsView.as_view(), name="mentions"),
+    path("export/<str:entity>/", ExportView.as_view(), name="export"),
+    path("uploads/", UploadSessionListView.as_view(), name="upload-list"),
+    path("uploads/<uuid:pk>/", UploadSessionDetailView.as_view(), name="upload-detail"),
+    path("uploads/<uuid:pk>/chunks/<int:index>/", UploadChunkView.as_view(), name="upload-chunk"),
+    path("uploads/<uuid:pk>/complete/", UploadCompleteView.as_view(), name="upload-complete"),
     path("org-profile/", OrgProfileCreateView.as_view(), name="org-profile"),
     path("profile/", ProfileView.as_view(), name="profile"),
     path("google-login/", GoogleLoginView.as_view(), name="google-login"),
     path("users/", UserViewSet.as_view({"get": "list", "post": "create"}), name="user-list"),
     path("me/password/", MePasswordView.as_view(), name="me-password"),
     path("users/<int:user_id>/password/", AdminPasswordResetView.as_view(), name="admin-password-reset"),
+    path("monitoring/profile-cache/", ProfileCacheStatsView.as_view(), name="profile-cache-stats"),
+    path("monitoring/metrics/", RequestMetricsView.as_view(), name="request-metrics"),
 
     # 🔑 JWT login & refresh
     path("login/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
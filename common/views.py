@@ -1,3 +1,5 @@
+import hmac
+import io
 import secrets
 import requests
 from rest_framework import serializers
@@ -6,16 +8,19 @@ from django.conf import settings
 from django.contrib.auth import get_user_model, authenticate
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.db.models import Q
+from django.http import HttpResponse, StreamingHttpResponse
 from django.http.response import JsonResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django.utils.translation import gettext as _
 from drf_spectacular.utils import extend_schema
 from rest_framework import status, viewsets
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.pagination import LimitOffsetPagination
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import BasePermission, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -27,7 +32,20 @@ from accounts.serializer import AccountSerializer
 from cases.models import Case
 from cases.serializer import CaseSerializer
 from common import swagger_params1
-from common.models import APISettings, Document, Org, Profile, User
+from common.cache import profile_cache
+from common.dashboard import DASHBOARD_MAX_TOP_N, DASHBOARD_TOP_N, get_dashboard
+from common.export import EXPORT_FORMATS, EXPORTS, stream_export
+from common.metrics import render_prometheus, request_metrics
+from common.mentions import comment_entity, mentions_of
+from common.search import SEARCH_ENTITIES, search
+from common.models import APISettings, Document, Org, Profile, UploadSession, User
+from common.uploads import (
+    complete_upload,
+    discard_upload,
+    missing_chunks,
+    start_upload,
+    store_chunk,
+)
 from common.serializer import (
     SocialLoginSerializer,
     OrgProfileCreateSerializer,
@@ -45,8 +63,11 @@ from common.serializer import (
     UserAdminWriteSerializer,
     PasswordChangeSerializer,
     AdminPasswordResetSerializer,
+    UploadSessionCreateSerializer,
+    UploadSessionSerializer,
 )
 from common.tasks import (
+    finalize_upload_session,
     resend_activation_link_to_user,
     send_email_to_new_user,
     send_email_to_reset_password,
@@ -150,8 +171,19 @@ class GetTeamsAndUsersView(APIView):
 class ApiHomeView(APIView):
     permission_classes = (IsAuthenticated,)
 
-    @extend_schema(parameters=swagger_params1.organization_params)
+    @extend_schema(parameters=swagger_params1.dashboard_params)
     def get(self, request, format=None):
+        if request.query_params.get("mode") == "dashboard":
+            try:
+                top_n = int(request.query_params.get("top", DASHBOARD_TOP_N))
+            except ValueError:
+                top_n = DASHBOARD_TOP_N
+            top_n = max(1, min(top_n, DASHBOARD_MAX_TOP_N))
+            return Response(
+                get_dashboard(request.profile, request.user, top_n),
+                status=status.HTTP_200_OK,
+            )
+
         accounts = Account.objects.filter(status="open", org=request.profile.org)
         contacts = Contact.objects.filter(org=request.profile.org)
         leads = Lead.objects.filter(org=request.profile.org).exclude(
@@ -191,6 +223,251 @@ class ApiHomeView(APIView):
         )
 
 
+# ------------------ Mentions ------------------
+class MentionsView(APIView):
+    """Comments @mentioning the requesting profile, newest first."""
+
+    permission_classes = (IsAuthenticated,)
+    default_limit = 20
+    max_limit = 100
+
+    def serialize(self, mention):
+        comment = mention.comment
+        entity, entity_id = comment_entity(comment)
+        return {
+            "id": comment.id,
+            "comment": comment.comment,
+            "commented_on": comment.commented_on,
+            "commented_by": comment.commented_by.user.email if comment.commented_by_id else None,
+            "entity": entity,
+            "entity_id": entity_id,
+        }
+
+    @extend_schema(tags=["comments"], parameters=swagger_params1.mention_params)
+    def get(self, request, format=None):
+        try:
+            limit = min(int(request.query_params.get("limit", self.default_limit)), self.max_limit)
+            offset = max(int(request.query_params.get("offset", 0)), 0)
+        except ValueError:
+            limit, offset = self.default_limit, 0
+        limit = max(limit, 1)
+
+        # one query off the (profile, created_at) index
+        mentions = list(mentions_of(request.profile)[offset : offset + limit + 1])
+        return Response(
+            {
+                "error": False,
+                "results": [self.serialize(mention) for mention in mentions[:limit]],
+                "offset": offset + limit if len(mentions) > limit else None,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+# ------------------ Search ------------------
+class SearchView(APIView):
+    """Ranked search over the org's leads, contacts, accounts and opportunities."""
+
+    permission_classes = (IsAuthenticated,)
+    default_limit = 20
+    max_limit = 100
+
+    @extend_schema(tags=["search"], parameters=swagger_params1.search_params)
+    def get(self, request, format=None):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"error": True, "errors": "Enter a search term"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        entities = [
+            entity for entity in request.query_params.get("entity", "").split(",")
+            if entity in SEARCH_ENTITIES
+        ]
+        try:
+            limit = min(int(request.query_params.get("limit", self.default_limit)), self.max_limit)
+            offset = max(int(request.query_params.get("offset", 0)), 0)
+        except ValueError:
+            limit, offset = self.default_limit, 0
+        limit = max(limit, 1)
+
+        # one query: a row past the page tells whether there is a next page
+        documents = search(request.profile, request.user, query, entities)
+        results = list(
+            documents.values("entity", "object_id", "title", "rank")[offset : offset + limit + 1]
+        )
+        return Response(
+            {
+                "error": False,
+                "results": [
+                    {
+                        "entity": row["entity"],
+                        "id": row["object_id"],
+                        "title": row["title"],
+                        "rank": row["rank"],
+                    }
+                    for row in results[:limit]
+                ],
+                "offset": offset + limit if len(results) > limit else None,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+# ------------------ Export ------------------
+class ExportView(APIView):
+    """
+    Every lead, contact, account or opportunity the profile can list, as a
+    streamed CSV or NDJSON download (common.export).
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(tags=["export"], parameters=swagger_params1.export_params, responses={200: str})
+    def get(self, request, entity, format=None):
+        if entity not in EXPORTS:
+            return Response({"error": True, "errors": "Unknown export %r" % entity}, status=404)
+        output = request.query_params.get("output", "csv").lower()
+        if output not in EXPORT_FORMATS:
+            return Response(
+                {"error": True, "errors": "output must be one of %s" % ", ".join(EXPORT_FORMATS)},
+                status=400,
+            )
+        response = StreamingHttpResponse(
+            stream_export(entity, request, output), content_type=EXPORT_FORMATS[output]
+        )
+        response["Content-Disposition"] = 'attachment; filename="%s-%s.%s"' % (
+            entity, timezone.localdate().isoformat(), output,
+        )
+        return response
+
+
+# ------------------ Chunked uploads ------------------
+def upload_error(error):
+    return Response({"error": True, "errors": " ".join(error.messages)}, status=400)
+
+
+class UploadSessionListView(APIView):
+    """Start a resumable chunked upload (common.uploads)."""
+
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(
+        tags=["uploads"],
+        request=UploadSessionCreateSerializer,
+        responses={201: UploadSessionSerializer},
+    )
+    def post(self, request, format=None):
+        serializer = UploadSessionCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({"error": True, "errors": serializer.errors}, status=400)
+        try:
+            session = start_upload(request.profile, **serializer.validated_data)
+        except ValidationError as error:
+            return upload_error(error)
+        return Response(UploadSessionSerializer(session).data, status=status.HTTP_201_CREATED)
+
+
+class UploadSessionMixin:
+    """The requesting profile's upload session ``pk``, shared by the upload views."""
+
+    permission_classes = (IsAuthenticated,)
+
+    def get_object(self, request, pk):
+        return get_object_or_404(UploadSession, id=pk, profile=request.profile)
+
+
+class UploadSessionDetailView(UploadSessionMixin, APIView):
+    """Progress of an upload, with the chunks still to send when resuming."""
+
+    @extend_schema(tags=["uploads"], responses={200: UploadSessionSerializer})
+    def get(self, request, pk, format=None):
+        session = self.get_object(request, pk)
+        data = UploadSessionSerializer(session).data
+        data["missing_chunks"] = missing_chunks(session) if session.status == "uploading" else []
+        return Response(data)
+
+    @extend_schema(tags=["uploads"])
+    def delete(self, request, pk, format=None):
+        session = self.get_object(request, pk)
+        if session.status == "finalizing":
+            return Response({"error": True, "errors": "The upload is finalizing"}, status=409)
+        discard_upload(session)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UploadChunkView(UploadSessionMixin, APIView):
+    """Receive one chunk as the raw request body; resending a chunk replaces it."""
+
+    @extend_schema(
+        tags=["uploads"],
+        request={"application/octet-stream": bytes},
+        parameters=swagger_params1.upload_chunk_params,
+    )
+    def put(self, request, pk, index, format=None):
+        session = self.get_object(request, pk)
+        try:
+            chunk = store_chunk(
+                session, index, request.stream or io.BytesIO(), request.headers.get("X-Chunk-SHA256")
+            )
+        except ValidationError as error:
+            return upload_error(error)
+        return Response({"index": chunk.index, "size": chunk.size, "sha256": chunk.sha256})
+
+
+class UploadCompleteView(UploadSessionMixin, APIView):
+    """All chunks are sent: assemble, deduplicate and attach them in celery."""
+
+    @extend_schema(tags=["uploads"], request=None, responses={202: UploadSessionSerializer})
+    def post(self, request, pk, format=None):
+        session = self.get_object(request, pk)
+        try:
+            queued = complete_upload(session)
+        except ValidationError as error:
+            return upload_error(error)
+        if queued:
+            finalize_upload_session.delay(str(session.id))
+            session.refresh_from_db()
+        return Response(UploadSessionSerializer(session).data, status=status.HTTP_202_ACCEPTED)
+
+
+# ------------------ Monitoring ------------------
+class ProfileCacheStatsView(APIView):
+    """
+    Hit/miss counters of the profile cache used by GetProfileAndOrg.
+    Counters are per worker process.
+    """
+    permission_classes = (IsAuthenticated, IsAdminUser)
+
+    @extend_schema(tags=["monitoring"], responses={200: dict})
+    def get(self, request, format=None):
+        return Response(profile_cache.stats(), status=status.HTTP_200_OK)
+
+
+class HasMetricsToken(BasePermission):
+    """Staff users, or scrapers sending REQUEST_METRICS_TOKEN as X-Metrics-Token."""
+
+    def has_permission(self, request, view):
+        token = getattr(settings, "REQUEST_METRICS_TOKEN", "")
+        sent = request.headers.get("X-Metrics-Token", "")
+        if token and sent and hmac.compare_digest(token, sent):
+            return True
+        return bool(request.user and request.user.is_staff)
+
+
+class RequestMetricsView(APIView):
+    """Per-view request, latency and SQL metrics in the Prometheus text format."""
+
+    permission_classes = (HasMetricsToken,)
+
+    @extend_schema(tags=["monitoring"], responses={200: str})
+    def get(self, request, format=None):
+        return HttpResponse(
+            render_prometheus(request_metrics.collect()),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+
 # ------------------ Org Creation ------------------
 class OrgProfileCreateView(APIView):
     permission_classes = (IsAuthenticated,)
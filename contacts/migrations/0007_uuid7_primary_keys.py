@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-18 15:46
+
+import common.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0006_contact_contact_org_created_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contact',
+            name='id',
+            field=models.UUIDField(db_index=True, default=common.ids.uuid7, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+    ]
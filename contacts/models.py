@@ -50,6 +50,12 @@ class Contact(BaseModel):
         verbose_name_plural = "Contacts"
         db_table = "contacts"
         ordering = ("-created_at",)
+        # keyset pagination of the list views (common.pagination)
+        indexes = [
+            models.Index(
+                fields=["org", "-created_at", "-id"], name="contact_org_created_idx"
+            )
+        ]
 
     def __str__(self):
         return self.first_name
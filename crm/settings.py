@@ -112,6 +112,8 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "crum.CurrentRequestUserMiddleware",
+    # opt-in, see REQUEST_METRICS_ENABLED
+    "common.middleware.metrics.RequestMetricsMiddleware",
     # "common.external_auth.CustomDualAuthentication"
     "common.middleware.get_company.GetProfileAndOrg",
     "wagtail.contrib.redirects.middleware.RedirectMiddleware",
@@ -164,6 +166,99 @@ else:
             "NAME": BASE_DIR / "db.sqlite3",
         }
     }
+
+# Shared cache: Redis when configured, per-process memory otherwise
+if os.environ.get("CACHE_REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["CACHE_REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "bottlecrm",
+        }
+    }
+
+# Profile/Org lookups done by common.middleware.get_company.GetProfileAndOrg;
+# invalidations only reach other workers through a shared cache, so they are
+# cached only with CACHE_REDIS_URL set (PROFILE_CACHE_ENABLED=true forces it
+# on for a single-process deployment)
+PROFILE_CACHE = {
+    "maxsize": int(os.environ.get("PROFILE_CACHE_SIZE") or 1024),
+    "timeout": int(os.environ.get("PROFILE_CACHE_TIMEOUT") or 300),
+    "enabled": {"true": True, "false": False}.get(
+        os.environ.get("PROFILE_CACHE_ENABLED", "").lower()
+    ),
+}
+
+# per-view request/query metrics (common.middleware.metrics), exposed at
+# /api/monitoring/metrics/ to staff users or with the X-Metrics-Token header
+REQUEST_METRICS_ENABLED = os.environ.get("REQUEST_METRICS_ENABLED", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+REQUEST_METRICS_FLUSH_INTERVAL = int(os.environ.get("REQUEST_METRICS_FLUSH_INTERVAL") or 10)
+REQUEST_METRICS_TOKEN = os.environ.get("REQUEST_METRICS_TOKEN", "")
+
+# messages sent per send_messages() call by common.notifications
+NOTIFICATION_BATCH_SIZE = int(os.environ.get("NOTIFICATION_BATCH_SIZE") or 100)
+
+# rows validated and inserted per batch by leads.importer.LeadImporter
+LEAD_IMPORT_CHUNK_SIZE = int(os.environ.get("LEAD_IMPORT_CHUNK_SIZE") or 1000)
+# seconds a processing import may go without saving progress before
+# leads.tasks.fail_stalled_lead_imports marks it failed
+LEAD_IMPORT_STALL_TIMEOUT = int(os.environ.get("LEAD_IMPORT_STALL_TIMEOUT") or 1800)
+
+# scheduled account emails claimed per batch by accounts.scheduler, emails
+# overdue by more than SCHEDULED_EMAIL_MAX_DELAY seconds expire unsent
+SCHEDULED_EMAIL_BATCH_SIZE = int(os.environ.get("SCHEDULED_EMAIL_BATCH_SIZE") or 100)
+SCHEDULED_EMAIL_MAX_DELAY = int(os.environ.get("SCHEDULED_EMAIL_MAX_DELAY") or 86400)
+
+# messages per send_messages() call by accounts.campaign.CampaignSender, and
+# recipients per celery subtask of accounts.tasks.send_email (0 = one task)
+EMAIL_CAMPAIGN_BATCH_SIZE = int(os.environ.get("EMAIL_CAMPAIGN_BATCH_SIZE") or 200)
+EMAIL_CAMPAIGN_CHUNK_SIZE = int(os.environ.get("EMAIL_CAMPAIGN_CHUNK_SIZE") or 5000)
+
+# rows fetched from the database per chunk and written per yield by the
+# streamed exports of common.export
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE") or 2000)
+
+# chunked uploads (common.uploads): bytes per chunk, largest accepted file,
+# and hours after which unfinished upload sessions are deleted
+UPLOAD_CHUNK_SIZE = int(os.environ.get("UPLOAD_CHUNK_SIZE") or 8 * 1024 * 1024)
+UPLOAD_MAX_SIZE = int(os.environ.get("UPLOAD_MAX_SIZE") or 5 * 1024 ** 3)
+UPLOAD_SESSION_TTL_HOURS = int(os.environ.get("UPLOAD_SESSION_TTL_HOURS") or 24)
+
+# attachment thumbnails (common.thumbnails): longest side in pixels of the
+# thumbnail and preview, processes rendering them per celery worker (0 =
+# render in the worker itself; only the threads and solo pools can start
+# them, prefork workers always render in-process) and the largest file
+# rendered, in bytes
+ATTACHMENT_THUMBNAIL_SIZE = int(os.environ.get("ATTACHMENT_THUMBNAIL_SIZE") or 256)
+ATTACHMENT_PREVIEW_SIZE = int(os.environ.get("ATTACHMENT_PREVIEW_SIZE") or 1024)
+THUMBNAIL_WORKERS = int(os.environ.get("THUMBNAIL_WORKERS") or 0)
+THUMBNAIL_MAX_SOURCE_SIZE = int(os.environ.get("THUMBNAIL_MAX_SOURCE_SIZE") or 50 * 1024 * 1024)
+
+CELERY_BEAT_SCHEDULE = {
+    "send-scheduled-account-emails": {
+        "task": "accounts.tasks.send_scheduled_emails",
+        "schedule": 60.0,
+    },
+    "fail-stalled-lead-imports": {
+        "task": "leads.tasks.fail_stalled_lead_imports",
+        "schedule": 300.0,
+    },
+    "expire-upload-sessions": {
+        "task": "common.tasks.expire_upload_sessions",
+        "schedule": 3600.0,
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/1.10/ref/settings/#auth-password-validators
 
@@ -294,8 +389,8 @@ SETTINGS_EXPORT = ["APPLICATION_NAME"]
 REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": "rest_framework.views.exception_handler",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-        "common.external_auth.CustomDualAuthentication"
+        # JWT and API keys, sharing the middleware's decoded token
+        "common.external_auth.CustomDualAuthentication",
         # "rest_framework.authentication.SessionAuthentication",
         # "rest_framework.authentication.BasicAuthentication",
     ),
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.db import transaction
+
+from common.models import Profile
+from contacts.models import Contact
+from events.models import Event
+from teams.models import Teams
+
+WEEKDAY_NAMES = (
+    "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"
+)
+
+
+def recurring_dates(start_date, end_date, weekdays):
+    """Dates between start_date and end_date (inclusive) falling on ``weekdays``."""
+    dates = []
+    for weekday in {WEEKDAY_NAMES.index(day) for day in weekdays if day in WEEKDAY_NAMES}:
+        day = start_date + timedelta(days=(weekday - start_date.weekday()) % 7)
+        while day <= end_date:
+            dates.append(day)
+            day += timedelta(days=7)
+    return sorted(dates)
+
+
+def as_list(value):
+    if not value:
+        return []
+    return value if isinstance(value, (list, tuple)) else [value]
+
+
+@transaction.atomic
+def create_recurring_events(data, dates, profile, contacts=None, teams=None, assigned_to=None):
+    """
+    Create one event per date with its contacts, teams and assigned
+    profiles. Related ids are checked against the org once and events and
+    M2M rows are inserted with ``bulk_create`` (three through tables, so
+    five INSERTs regardless of the number of occurrences).
+    """
+    org = profile.org
+    contact_ids = list(
+        Contact.objects.filter(id__in=as_list(contacts), org=org).values_list("id", flat=True)
+    )
+    team_ids = list(
+        Teams.objects.filter(id__in=as_list(teams), org=org).values_list("id", flat=True)
+    )
+    profile_ids = list(
+        Profile.objects.filter(id__in=as_list(assigned_to), org=org).values_list(
+            "id", flat=True
+        )
+    )
+
+    events = Event.objects.create_batch(
+        [
+            Event(
+                name=data["name"],
+                event_type=data["event_type"],
+                description=data.get("description"),
+                start_date=data["start_date"],
+                end_date=data["end_date"],
+                start_time=data["start_time"],
+                end_time=data.get("end_time"),
+                date_of_meeting=date,
+                org=org,
+            )
+            for date in dates
+        ],
+        user=profile.user,
+        profile=profile,
+    )
+    for field, ids in (
+        ("contacts", contact_ids),
+        ("teams", team_ids),
+        ("assigned_to", profile_ids),
+    ):
+        Event.objects.set_m2m(field, {event: ids for event in events}, clear=False)
+    return events, profile_ids
@@ -19,6 +19,10 @@ event_list_get_params = [
         OpenApiParameter.QUERY,
         OpenApiTypes.DATE
     ),
+    OpenApiParameter(
+        "pagination", OpenApiTypes.STR, OpenApiParameter.QUERY, enum=["offset", "cursor"]
+    ),
+    OpenApiParameter("cursor", OpenApiTypes.STR, OpenApiParameter.QUERY),
 ]
 
 event_detail_post_params = [
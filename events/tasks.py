@@ -1,9 +1,7 @@
 from celery import Celery
 from django.conf import settings
-from django.core.mail import EmailMessage
-from django.template.loader import render_to_string
 
-from common.models import Profile
+from common.notifications import profile_recipients, send_notification
 from events.models import Event
 
 app = Celery("redis://")
@@ -12,37 +10,27 @@ app = Celery("redis://")
 @app.task
 def send_email(event_id, recipients):
     event = Event.objects.filter(id=event_id).first()
-    subject = " Invitation for an event."
     context = {}
     context["event"] = event.name
     context["event_id"] = event_id
     context["event_created_by"] = event.created_by
     context["event_date_of_meeting"] = event.date_of_meeting
     context["url"] = settings.DOMAIN_NAME
-    # recipients = event.assigned_to.filter(is_active=True)
-    for profile_id in recipients:
-        recipients_list = []
-        profile = Profile.objects.filter(id=profile_id, is_active=True).first()
-        if profile:
-            recipients_list.append(profile.user.email)
-            event_members = event.assigned_to.filter(is_active=True)
+    member_emails = list(
+        event.assigned_to.filter(is_active=True).values_list("user__email", flat=True)
+    )
 
-            context["other_members"] = list(
-                event_members.exclude(id=profile.id).values_list(
-                    "user__email", flat=True
-                )
-            )
-            if len(context["other_members"]) > 0:
-                context["other_members"] = ", ".join(context["other_members"])
-            else:
-                context["other_members"] = ""
-            context["user"] = profile.user.email
-            html_content = render_to_string(
-                "assigned_to_email_template_event.html", context=context
-            )
-            msg = EmailMessage(subject=subject, body=html_content, to=recipients_list)
-            msg.content_subtype = "html"
-            msg.send()
+    def personalize(user):
+        other_members = [email for email in member_emails if email != user.email]
+        return {"user": user.email, "other_members": ", ".join(other_members)}
+
+    return send_notification(
+        " Invitation for an event.",
+        "assigned_to_email_template_event.html",
+        context,
+        profile_recipients(recipients),
+        personalize=personalize,
+    )
 
     # if recipients.count() > 0:
     #     for recipient in recipients:
@@ -87,3 +75,39 @@ def send_email(event_id, recipients):
     #             subject=subject, body=html_content, to=[recipient.email, ])
     #         msg.content_subtype = "html"
     #         msg.send
+
+
+@app.task
+def send_recurring_event_email(event_ids, recipients):
+    """One invitation per attendee listing every occurrence of a recurring event."""
+    events = list(
+        Event.objects.filter(id__in=event_ids)
+        .select_related("created_by")
+        .order_by("date_of_meeting")
+    )
+    if not events:
+        return False
+    event = events[0]
+    context = {}
+    context["event_name"] = event.name
+    context["event_created_by"] = event.created_by
+    context["event_start_time"] = event.start_time
+    context["event_end_time"] = event.end_time
+    context["event_dates"] = [each.date_of_meeting for each in events]
+    context["url"] = settings.DOMAIN_NAME
+    # occurrences share their attendees
+    member_emails = list(
+        event.assigned_to.filter(is_active=True).values_list("user__email", flat=True)
+    )
+
+    def personalize(user):
+        other_members = [email for email in member_emails if email != user.email]
+        return {"user": user.email, "other_members": ", ".join(other_members)}
+
+    return send_notification(
+        " Invitation for a recurring event.",
+        "recurring_event_invitation.html",
+        context,
+        profile_recipients(recipients),
+        personalize=personalize,
+    )
@@ -1,15 +1,14 @@
 import json
-from datetime import datetime, timedelta
 
 from django.db.models import Q
 from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
 
 from rest_framework import status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from common.pagination import KeysetPagination
 from common.models import Attachments, Comment, Profile, User
 
 #from common.external_auth import CustomDualAuthentication
@@ -23,7 +22,8 @@ from contacts.serializer import ContactSerializer
 from events import swagger_params1
 from events.models import Event
 from events.serializer import EventCreateSerializer, EventSerializer, EventCreateSwaggerSerializer, EventDetailEditSwaggerSerializer, EventCommentEditSwaggerSerializer
-from events.tasks import send_email
+from events.recurrence import create_recurring_events, recurring_dates
+from events.tasks import send_email, send_recurring_event_email
 from teams.models import Teams
 from teams.serializer import TeamsSerializer
 
@@ -38,14 +38,14 @@ WEEKDAYS = (
 )
 
 
-class EventListView(APIView, LimitOffsetPagination):
+class EventListView(APIView, KeysetPagination):
     model = Event
     #authentication_classes = (CustomDualAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def get_context_data(self, **kwargs):
         params = self.request.query_params
-        queryset = self.model.objects.filter(org=self.request.profile.org).order_by("-id")
+        queryset = self.model.objects.filter(org=self.request.profile.org)
         contacts = Contact.objects.filter(org=self.request.profile.org)
         if self.request.profile.role != "ADMIN" and not self.request.profile.is_admin:
             queryset = queryset.filter(
@@ -72,12 +72,7 @@ class EventListView(APIView, LimitOffsetPagination):
         context = {}
         results_events = self.paginate_queryset(queryset, self.request, view=self)
         events = EventSerializer(results_events, many=True).data
-        if results_events:
-            offset = queryset.filter(id__gte=results_events[-1].id).count()
-            if offset == queryset.count():
-                offset = None
-        else:
-            offset = 0
+        offset = self.get_next_offset(results_events)
         context.update({"events_count": self.count, "offset": offset})
         context["events"] = events
         context["recurring_days"] = WEEKDAYS
@@ -143,58 +138,22 @@ class EventListView(APIView, LimitOffsetPagination):
                         {"error": True, "errors": "Choose atleast one recurring day"},
                         status=status.HTTP_400_BAD_REQUEST,
                     )
-                end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
-                start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
-
-                delta = end_date - start_date
-                required_dates = []
-
-                for day in range(delta.days + 1):
-                    each_date = start_date + timedelta(days=day)
-                    if each_date.strftime("%A") in recurring_days:
-                        required_dates.append(each_date)
-
-                for each in required_dates:
-                    each = datetime.strptime(str(each), "%Y-%m-%d").date()
-                    data = serializer.validated_data
-
-                    event = Event.objects.create(
-                        created_by=request.profile.user,
-                        start_date=start_date,
-                        end_date=end_date,
-                        name=data["name"],
-                        event_type=data["event_type"],
-                        description=data["description"],
-                        start_time=data["start_time"],
-                        end_time=data["end_time"],
-                        date_of_meeting=each,
-                        org=request.profile.org,
-                    )
-
-                    if params.get("contacts"):
-                        obj_contact = Contact.objects.filter(
-                            id=params.get("contacts"), org=request.profile.org
-                        )
-                        event.contacts.add(obj_contact)
-
-                    if params.get("teams"):
-                        teams_list = params.get("teams")
-                        teams = Teams.objects.filter(id__in=teams_list, org=request.profile.org)
-                        event.teams.add(*teams)
-
-                    if params.get("assigned_to"):
-                        assinged_to_list = params.get("assigned_to")
-                        profiles = Profile.objects.filter(
-                            id__in=assinged_to_list, org=request.profile.org
-                        )
-                        event.assigned_to.add(*profiles)
-
-                    assigned_to_list = list(
-                        event.assigned_to.all().values_list("id", flat=True)
-                    )
-                    send_email.delay(
-                        event.id,
-                        assigned_to_list,
+                data = serializer.validated_data
+                dates = recurring_dates(
+                    data["start_date"], data["end_date"], recurring_days
+                )
+                events, assigned_to_list = create_recurring_events(
+                    data,
+                    dates,
+                    request.profile,
+                    contacts=params.get("contacts"),
+                    teams=params.get("teams"),
+                    assigned_to=params.get("assigned_to"),
+                )
+                if events and assigned_to_list:
+                    send_recurring_event_email.delay(
+                        [str(event.id) for event in events],
+                        [str(pk) for pk in assigned_to_list],
                     )
             return Response(
                 {"error": False, "message": "Event Created Successfully"},
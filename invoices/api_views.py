@@ -6,13 +6,13 @@ from django.contrib.sites.shortcuts import get_current_site
 from django.db.models import Q
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accounts.models import Account
 from accounts.serializer import AccountSerializer
+from common.pagination import KeysetPagination
 from common.models import Attachments, Comment, User
 
 #from common.external_auth import CustomDualAuthentication
@@ -24,7 +24,7 @@ from common.serializer import (
 )
 from common.utils import COUNTRIES, CURRENCY_CODES
 from invoices import swagger_params1
-from invoices.models import Invoice
+from invoices.models import Invoice, InvoiceHistory
 from invoices.serializer import (
     InvoiceCreateSerializer,
     InvoiceHistorySerializer,
@@ -48,7 +48,7 @@ INVOICE_STATUS = (
 )
 
 
-class InvoiceListView(APIView, LimitOffsetPagination):
+class InvoiceListView(APIView, KeysetPagination):
 
     #authentication_classes = (CustomDualAuthentication,)
     permission_classes = (IsAuthenticated,)
@@ -243,10 +243,23 @@ class InvoiceDetailView(APIView):
     #authentication_classes = (CustomDualAuthentication,)
     permission_classes = (IsAuthenticated,)
     model = Invoice
+    history_limit = 20
+    max_history_limit = 100
 
     def get_object(self, pk):
         return self.model.objects.filter(id=pk).first()
 
+    def get_history_page(self):
+        """``?history_limit`` versions older than ``?history_before``."""
+        params = self.request.query_params
+        try:
+            limit = int(params.get("history_limit", self.history_limit))
+            before = int(params["history_before"]) if params.get("history_before") else None
+        except ValueError:
+            limit, before = self.history_limit, None
+        limit = min(max(limit, 1), self.max_history_limit)
+        return InvoiceHistory.objects.page(self.invoice, limit, before)
+
     @swagger_auto_schema(
         tags=["Invoices"], manual_parameters=swagger_params1.invoice_create_post_params
     )
@@ -365,6 +378,7 @@ class InvoiceDetailView(APIView):
                 invoice_obj.assigned_to.all().values_list("id", flat=True)
             )
             recipients = list(set(assigned_to_list) - set(previous_assigned_to_users))
+            create_invoice_history(invoice_obj.id, request.user.id, [])
             send_email.delay(
                 recipients,
                 invoice_obj.id,
@@ -408,7 +422,7 @@ class InvoiceDetailView(APIView):
         )
 
     @swagger_auto_schema(
-        tags=["Invoices"], manual_parameters=swagger_params1.invoice_delete_params
+        tags=["Invoices"], manual_parameters=swagger_params1.invoice_detail_get_params
     )
     def get(self, request, pk, format=None):
         self.invoice = self.get_object(pk=pk)
@@ -458,13 +472,13 @@ class InvoiceDetailView(APIView):
 
         attachments = Attachments.objects.filter(invoice=self.invoice).order_by("-id")
         comments = Comment.objects.filter(invoice=self.invoice).order_by("-id")
+        history, history_next = self.get_history_page()
         context.update(
             {
                 "attachments": AttachmentsSerializer(attachments, many=True).data,
                 "comments": CommentSerializer(comments, many=True).data,
-                "invoice_history": InvoiceHistorySerializer(
-                    self.invoice.invoice_history.all(), many=True
-                ).data,
+                "invoice_history": InvoiceHistorySerializer(history, many=True).data,
+                "history_next": history_next,
                 "accounts": AccountSerializer(
                     self.invoice.accounts.all(), many=True
                 ).data,
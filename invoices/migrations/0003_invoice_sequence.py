@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-18 14:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0011_searchdocument'),
+        ('invoices', '0002_invoice_invoice_org_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvoiceSequence',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('last_value', models.PositiveIntegerField(default=0)),
+                ('org', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='invoice_sequences', to='common.org')),
+            ],
+            options={
+                'db_table': 'invoice_sequence',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='invoicesequence',
+            constraint=models.UniqueConstraint(fields=('org', 'day'), name='invoice_sequence_org_day'),
+        ),
+        migrations.AddConstraint(
+            model_name='invoicesequence',
+            constraint=models.UniqueConstraint(condition=models.Q(('org', None)), fields=('day',), name='invoice_sequence_day_no_org'),
+        ),
+    ]
@@ -0,0 +1,93 @@
+import json
+
+import django.core.serializers.json
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import migrations, models
+
+# the columns each history row used to copy from the invoice
+COPIED_FIELDS = (
+    "invoice_title",
+    "invoice_number",
+    "from_address",
+    "to_address",
+    "name",
+    "email",
+    "quantity",
+    "rate",
+    "total_amount",
+    "currency",
+    "phone",
+    "amount_due",
+    "amount_paid",
+    "is_email_sent",
+    "status",
+    "due_date",
+)
+
+
+def copies_to_snapshots(apps, schema_editor):
+    """Number the existing rows per invoice and keep each one as a snapshot."""
+    InvoiceHistory = apps.get_model("invoices", "InvoiceHistory")
+    versions = {}
+    rows = InvoiceHistory.objects.order_by("invoice_id", "created_at", "id")
+    for row in rows.prefetch_related("assigned_to").iterator(chunk_size=500):
+        state = {}
+        for field in COPIED_FIELDS:
+            value = getattr(row, InvoiceHistory._meta.get_field(field).attname)
+            state[field] = str(value) if field == "phone" and value else value
+        state["assigned_to"] = sorted(str(user.id) for user in row.assigned_to.all())
+        versions[row.invoice_id] = versions.get(row.invoice_id, 0) + 1
+        row.version = versions[row.invoice_id]
+        row.is_snapshot = True
+        row.data = json.loads(json.dumps(state, cls=DjangoJSONEncoder))
+        row.save(update_fields=["version", "is_snapshot", "data"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("invoices", "0003_invoice_sequence"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="invoicehistory",
+            name="version",
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name="invoicehistory",
+            name="is_snapshot",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="invoicehistory",
+            name="data",
+            field=models.JSONField(
+                default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder
+            ),
+        ),
+        migrations.RunPython(copies_to_snapshots, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="invoicehistory",
+            name="version",
+            field=models.PositiveIntegerField(),
+        ),
+        migrations.AlterModelOptions(
+            name="invoicehistory",
+            options={
+                "ordering": ("-version",),
+                "verbose_name": "InvoiceHistory",
+                "verbose_name_plural": "InvoiceHistories",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="invoicehistory",
+            constraint=models.UniqueConstraint(
+                fields=("invoice", "version"), name="invoice_history_version"
+            ),
+        ),
+    ] + [
+        migrations.RemoveField(model_name="invoicehistory", name=field)
+        for field in COPIED_FIELDS + ("assigned_to",)
+    ]
@@ -0,0 +1,38 @@
+import datetime
+
+from django.db import migrations
+
+
+def seed_todays_sequences(apps, schema_editor):
+    """
+    Continue today's numbering of each org after the numbers the old
+    generator already issued today, so the counters do not restart at 0001.
+    """
+    Invoice = apps.get_model("invoices", "Invoice")
+    InvoiceSequence = apps.get_model("invoices", "InvoiceSequence")
+    day = datetime.date.today()
+    prefix = f"{day:%d%m%Y}"
+    last_values = {}
+    numbers = Invoice.objects.filter(invoice_number__startswith=prefix).values_list(
+        "org_id", "invoice_number"
+    )
+    for org_id, number in numbers.iterator():
+        suffix = number[len(prefix):]
+        if suffix.isdigit():
+            last_values[org_id] = max(last_values.get(org_id, 0), int(suffix))
+    for org_id, last_value in last_values.items():
+        sequence, _ = InvoiceSequence.objects.get_or_create(org_id=org_id, day=day)
+        if sequence.last_value < last_value:
+            sequence.last_value = last_value
+            sequence.save(update_fields=["last_value"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("invoices", "0005_uuid7_primary_keys"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_todays_sequences, migrations.RunPython.noop),
+    ]
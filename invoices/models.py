@@ -1,7 +1,10 @@
 import datetime
+import json
 
 import arrow
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models import Max, Q
 from django.utils.translation import gettext_lazy as _
 from phonenumber_field.modelfields import PhoneNumberField
 
@@ -75,6 +78,12 @@ class Invoice(BaseModel):
         verbose_name_plural = "Invoices"
         db_table = "invoice"
         ordering = ("-created_at",)
+        # keyset pagination of the list views (common.pagination)
+        indexes = [
+            models.Index(
+                fields=["org", "-created_at", "-id"], name="invoice_org_created_idx"
+            )
+        ]
 
     def __str__(self):
         """Unicode representation of Invoice."""
@@ -82,20 +91,9 @@ class Invoice(BaseModel):
 
     def save(self, *args, **kwargs):
         if not self.invoice_number:
-            self.invoice_number = self.invoice_id_generator()
-            while Invoice.objects.filter(invoice_number=self.invoice_number).exists():
-                self.invoice_number = self.invoice_id_generator(
-                    prev_invoice_number=self.invoice_number
-                )
+            self.invoice_number = InvoiceSequence.allocate(self.org_id)[0]
         super(Invoice, self).save(*args, **kwargs)
 
-    def invoice_id_generator(self, prev_invoice_number=None):
-        if prev_invoice_number:
-            prev_invoice_number += 1
-            return prev_invoice_number
-        date = datetime.datetime.now().strftime("%d%m%Y")
-        return int(date + "0001")
-
     def formatted_total_amount(self):
         return self.currency + " " + str(self.total_amount)
 
@@ -153,91 +151,236 @@ class Invoice(BaseModel):
         return User.objects.filter(id__in=list(user_ids))
 
 
-class InvoiceHistory(BaseModel):
-    """Model definition for InvoiceHistory.
-    This model is used to track/keep a record of the updates made to original invoice object."""
+class InvoiceSequence(models.Model):
+    """
+    Last invoice number handed out per org and day. Numbers are the day
+    (DDMMYYYY) followed by a counter starting at 0001.
+    """
 
-    INVOICE_STATUS = (
-        ("Draft", "Draft"),
-        ("Sent", "Sent"),
-        ("Paid", "Paid"),
-        ("Pending", "Pending"),
-        ("Cancelled", "Cancel"),
+    org = models.ForeignKey(
+        Org, on_delete=models.CASCADE, null=True, blank=True, related_name="invoice_sequences"
     )
+    day = models.DateField()
+    last_value = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "invoice_sequence"
+        constraints = [
+            models.UniqueConstraint(fields=["org", "day"], name="invoice_sequence_org_day"),
+            models.UniqueConstraint(
+                fields=["day"], condition=Q(org=None), name="invoice_sequence_day_no_org"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day:%d%m%Y} {self.last_value}"
+
+    @classmethod
+    def allocate(cls, org_id, count=1, day=None):
+        """
+        Reserve ``count`` consecutive invoice numbers of ``org_id``. The
+        sequence row is locked for the rest of the transaction, so
+        concurrent callers queue up instead of handing out duplicates.
+        """
+        day = day or datetime.date.today()
+        with transaction.atomic():
+            sequence = cls.objects.select_for_update().filter(org_id=org_id, day=day).first()
+            if sequence is None:
+                # first number of the day, a concurrent creator wins the race
+                cls.objects.get_or_create(org_id=org_id, day=day)
+                sequence = cls.objects.select_for_update().get(org_id=org_id, day=day)
+            first = sequence.last_value + 1
+            sequence.last_value += count
+            sequence.save(update_fields=["last_value"])
+        return [f"{day:%d%m%Y}{value:04d}" for value in range(first, first + count)]
+
+
+def assign_invoice_numbers(invoices):
+    """
+    Number every unnumbered invoice, one block allocation per org, e.g.
+    before ``Invoice.objects.bulk_create`` which skips ``Invoice.save``.
+    """
+    by_org = {}
+    for invoice in invoices:
+        if not invoice.invoice_number:
+            by_org.setdefault(invoice.org_id, []).append(invoice)
+    for org_id, pending in by_org.items():
+        numbers = InvoiceSequence.allocate(org_id, len(pending))
+        for invoice, number in zip(pending, numbers):
+            invoice.invoice_number = number
+    return invoices
+
+
+# Invoice fields tracked by InvoiceHistory, assigned_to as a sorted id list
+HISTORY_FIELDS = (
+    "invoice_title",
+    "invoice_number",
+    "from_address",
+    "to_address",
+    "name",
+    "email",
+    "assigned_to",
+    "quantity",
+    "rate",
+    "total_amount",
+    "currency",
+    "phone",
+    "amount_due",
+    "amount_paid",
+    "is_email_sent",
+    "status",
+    "due_date",
+)
+
+
+def invoice_state(invoice):
+    """The HISTORY_FIELDS of ``invoice`` as JSON-compatible values."""
+    state = {}
+    for field in HISTORY_FIELDS:
+        if field == "assigned_to":
+            value = sorted(str(pk) for pk in invoice.assigned_to.values_list("id", flat=True))
+        elif field == "phone":
+            value = str(invoice.phone) if invoice.phone else None
+        else:
+            value = getattr(invoice, Invoice._meta.get_field(field).attname)
+        state[field] = value
+    return json.loads(json.dumps(state, cls=DjangoJSONEncoder))
+
+
+class InvoiceHistoryManager(models.Manager):
+    def rebuild(self, invoice_id, versions):
+        """
+        {version: invoice state} of the given versions, replayed from the
+        nearest snapshot at or below the oldest one in two queries.
+        """
+        versions = set(versions)
+        if not versions:
+            return {}
+        start = self.filter(
+            invoice_id=invoice_id, is_snapshot=True, version__lte=min(versions)
+        ).aggregate(start=Max("version"))["start"]
+        rows = self.filter(
+            invoice_id=invoice_id, version__gte=start or 1, version__lte=max(versions)
+        ).order_by("version")
+        state = {}
+        states = {}
+        for version, is_snapshot, data in rows.values_list("version", "is_snapshot", "data"):
+            state = dict(data) if is_snapshot else dict(state, **data)
+            if version in versions:
+                states[version] = state
+        return states
+
+    def with_states(self, histories):
+        """Attach ``state`` to each of ``histories`` (rows of one invoice)."""
+        histories = list(histories)
+        if histories:
+            states = self.rebuild(histories[0].invoice_id, [row.version for row in histories])
+            for row in histories:
+                row.state = states[row.version]
+        return histories
+
+    def page(self, invoice, limit, before=None):
+        """
+        The newest ``limit`` versions of ``invoice`` older than version
+        ``before`` with their states, and the version the next page starts
+        before (None on the last page).
+        """
+        queryset = self.filter(invoice=invoice).select_related("updated_by")
+        if before is not None:
+            queryset = queryset.filter(version__lt=before)
+        rows = self.with_states(queryset.order_by("-version")[:limit])
+        next_before = rows[-1].version if rows and rows[-1].version > 1 else None
+        return rows, next_before
+
+    def record(self, invoice, updated_by=None, details=None):
+        """
+        Add the next version of ``invoice``: its full state every
+        SNAPSHOT_INTERVAL versions, otherwise only the fields that changed.
+        ``details`` defaults to a sentence naming the changed fields.
+        The first version is always "Invoice Created."
+        """
+        state = invoice_state(invoice)
+        with transaction.atomic():
+            # serializes concurrent edits of one invoice
+            Invoice.objects.select_for_update().filter(id=invoice.id).first()
+            last = self.filter(invoice=invoice).order_by("-version").first()
+            if last is None:
+                version, changes = 1, state
+                details = "Invoice Created."
+            else:
+                version = last.version + 1
+                previous = self.rebuild(invoice.id, [last.version])[last.version]
+                changes = {
+                    field: value
+                    for field, value in state.items()
+                    if previous.get(field) != value
+                }
+                details = details or describe_changes(list(changes))
+            is_snapshot = (version - 1) % self.model.SNAPSHOT_INTERVAL == 0
+            history = self.model(
+                invoice=invoice,
+                version=version,
+                is_snapshot=is_snapshot,
+                data=state if is_snapshot else changes,
+                created_by=updated_by,
+                updated_by=updated_by,
+                details=details,
+            )
+            # BaseModel.save would clear updated_by outside of a request (tasks)
+            self.bulk_create([history])
+            return history
+
+
+def describe_changes(fields):
+    """Sentence naming the changed ``fields``, None if there are none."""
+    names = [" ".join(field.split("_")).title() for field in fields]
+    if len(names) > 1:
+        return ", ".join(names[:-1]) + " and " + names[-1] + " have changed."
+    if names:
+        return names[0] + " has changed."
+    return None
+
+
+class InvoiceHistory(BaseModel):
+    """
+    One version of an invoice. Every SNAPSHOT_INTERVAL-th version stores
+    the full HISTORY_FIELDS state in ``data``, the versions in between only
+    the fields that changed; ``InvoiceHistory.objects.rebuild`` replays
+    them into the invoice as it was.
+    """
+
+    SNAPSHOT_INTERVAL = 20
+
     invoice = models.ForeignKey(
         Invoice, on_delete=models.CASCADE, related_name="invoice_history"
     )
-    invoice_title = models.CharField(_("Invoice Title"), max_length=50)
-    invoice_number = models.CharField(_("Invoice Number"), max_length=50)
-    from_address = models.ForeignKey(
-        Address,
-        related_name="invoice_history_from_address",
-        on_delete=models.SET_NULL,
-        null=True,
-    )
-    to_address = models.ForeignKey(
-        Address,
-        related_name="invoice_history_to_address",
-        on_delete=models.SET_NULL,
-        null=True,
-    )
-    name = models.CharField(_("Name"), max_length=100)
-    email = models.EmailField(_("Email"))
-    assigned_to = models.ManyToManyField(
-        User, related_name="invoice_history_assigned_to"
-    )
-    # quantity is the number of hours worked
-    quantity = models.PositiveIntegerField(default=0)
-    # rate is the rate charged
-    rate = models.DecimalField(default=0, max_digits=12, decimal_places=2)
-    # total amount is product of rate and quantity
-    total_amount = models.DecimalField(
-        blank=True, null=True, max_digits=12, decimal_places=2
-    )
-    currency = models.CharField(
-        max_length=3, choices=CURRENCY_CODES, blank=True, null=True
-    )
-    phone = PhoneNumberField(null=True, blank=True)
-    # created_by = models.ForeignKey(
-    #     User, related_name='invoice_history_created_by',
-    #     on_delete=models.SET_NULL, null=True)
+    version = models.PositiveIntegerField()
+    is_snapshot = models.BooleanField(default=False)
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
     updated_by = models.ForeignKey(
         User,
         related_name="invoice_history_created_by",
         on_delete=models.SET_NULL,
         null=True,
     )
-
-    amount_due = models.DecimalField(
-        blank=True, null=True, max_digits=12, decimal_places=2
-    )
-    amount_paid = models.DecimalField(
-        blank=True, null=True, max_digits=12, decimal_places=2
-    )
-    is_email_sent = models.BooleanField(default=False)
-    status = models.CharField(choices=INVOICE_STATUS, max_length=15, default="Draft")
     # details or description here stores the fields changed in the original invoice object
     details = models.TextField(_("Details"), null=True, blank=True)
-    due_date = models.DateField(blank=True, null=True)
+
+    objects = InvoiceHistoryManager()
 
     class Meta:
         verbose_name = "InvoiceHistory"
         verbose_name_plural = "InvoiceHistories"
         db_table = "invoice_history"
-        ordering = ("-created_at",)
+        ordering = ("-version",)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["invoice", "version"], name="invoice_history_version"
+            )
+        ]
 
     def __str__(self):
-        """Unicode representation of Invoice."""
-        return self.invoice_number
-
-    def formatted_total_amount(self):
-        return self.currency + " " + str(self.total_amount)
-
-    def formatted_rate(self):
-        return str(self.rate) + " " + self.currency
-
-    def formatted_total_quantity(self):
-        return str(self.quantity) + " " + "Hours"
+        return f"{self.invoice_id} v{self.version}"
 
     @property
     def created_on_arrow(self):
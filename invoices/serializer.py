@@ -5,7 +5,7 @@ from common.serializer import (
     OrganizationSerializer,
     UserSerializer,
 )
-from invoices.models import Invoice, InvoiceHistory
+from invoices.models import HISTORY_FIELDS, Invoice, InvoiceHistory
 from teams.serializer import TeamsSerializer
 
 
@@ -48,31 +48,28 @@ class InvoiceSerailizer(serializers.ModelSerializer):
 
 
 class InvoiceHistorySerializer(serializers.ModelSerializer):
+    """
+    A history version with the invoice fields as they were then; rows need
+    the ``state`` attached by ``InvoiceHistory.objects.with_states``.
+    """
+
     updated_by = UserSerializer()
 
     class Meta:
         model = InvoiceHistory
         fields = (
             "id",
-            "invoice_title",
-            "invoice_number",
-            "status",
-            "due_date",
-            "name",
-            "email",
-            "phone",
+            "version",
             "created_at",
-            "currency",
-            "quantity",
-            "rate",
-            "total_amount",
-            "amount_due",
-            "amount_paid",
-            "is_email_sent",
             "details",
             "updated_by",
         )
 
+    def to_representation(self, instance):
+        data = {field: instance.state.get(field) for field in HISTORY_FIELDS}
+        data.update(super().to_representation(instance))
+        return data
+
 
 class InvoiceCreateSerializer(serializers.ModelSerializer):
     def __init__(self, *args, **kwargs):
@@ -34,6 +34,22 @@ invoice_delete_params = [
     organization_params,
 ]
 
+invoice_detail_get_params = [
+    organization_params,
+    OpenApiParameter(
+        "history_limit",
+        OpenApiTypes.INT,
+        OpenApiParameter.QUERY,
+        description="Number of history versions to return (default 20, max 100)",
+    ),
+    OpenApiParameter(
+        "history_before",
+        OpenApiTypes.INT,
+        OpenApiParameter.QUERY,
+        description="Only return versions older than this one (history_next of the previous page)",
+    ),
+]
+
 invoice_create_post_params = [
     organization_params,
     OpenApiParameter(
@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from leads.models import Lead
+from leads.models import Lead, LeadImport
 
 admin.site.register(Lead)
+admin.site.register(LeadImport)
@@ -3,6 +3,8 @@ import re
 
 from django import forms
 
+from leads.importer import missing_headers, read_csv_headers
+
 email_regex = "^[_a-zA-Z0-9-]+(\.[_a-zA-Z0-9-]+)*@[a-zA-Z0-9-]+(\.[a-zA-Z0-9-]+)*(\.[a-zA-Z]{2,4})$"
 
 
@@ -89,16 +91,17 @@ class LeadListForm(forms.Form):
             )
 
     def clean_leads_file(self):
+        # only the header row is checked here, rows are validated in chunks
+        # by leads.importer.LeadImporter once the import is queued
         document = self.cleaned_data.get("leads_file")
         if document:
-            data = import_document_validator(document)
-            if data.get("error"):
-                raise forms.ValidationError(data.get("message"))
-            else:
-                self.validated_rows = data.get("validated_rows", [])
-                self.invalid_rows = data.get("invalid_rows", [])
-                if len(self.validated_rows) == 0:
-                    raise forms.ValidationError(
-                        "All the leads in the file are invalid."
-                    )
+            try:
+                headers = read_csv_headers(document)
+            except Exception:
+                raise forms.ValidationError("Not a valid CSV file")
+            if not headers:
+                raise forms.ValidationError("The file is empty.")
+            missing = missing_headers(headers)
+            if missing:
+                raise forms.ValidationError("Missing headers: %s" % ", ".join(missing))
         return document
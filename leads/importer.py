@@ -0,0 +1,258 @@
+import csv
+import datetime
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from phonenumber_field.phonenumber import to_python
+
+from common.cache import bump_cache_version
+from common.dashboard import dashboard_scope
+from common.search import index_objects
+from common.utils import COUNTRIES, LEAD_SOURCE, LEAD_STATUS
+from leads.models import Lead, LeadImport, LeadImportError
+
+REQUIRED_HEADERS = ("title",)
+
+# csv header -> (Lead field, max length)
+COLUMNS = {
+    "title": ("title", 64),
+    "first name": ("first_name", 255),
+    "last name": ("last_name", 255),
+    "email": ("email", 254),
+    "phone": ("phone", None),
+    "website": ("website", 255),
+    "address": ("address_line", 255),
+    "city": ("city", 255),
+    "state": ("state", 255),
+    "postcode": ("postcode", 64),
+    "country": ("country", None),
+    "status": ("status", None),
+    "source": ("source", None),
+    "description": ("description", None),
+    "account_name": ("account_name", 255),
+}
+
+COUNTRY_CODES = {code for code, _ in COUNTRIES}
+COUNTRY_BY_NAME = {name.lower(): code for code, name in COUNTRIES}
+STATUS_VALUES = {value for value, _ in LEAD_STATUS}
+SOURCE_VALUES = {value for value, _ in LEAD_SOURCE}
+
+
+def iter_csv_rows(document):
+    """
+    Yield the rows of an uploaded or stored CSV file one at a time; the
+    file is read line by line instead of being loaded into memory.
+    """
+    document.seek(0)
+    return csv.reader(line.decode("iso-8859-1") for line in document)
+
+
+def read_csv_headers(document):
+    """Lower-cased header row of a CSV file, None if the file is empty."""
+    try:
+        row = next(iter_csv_rows(document))
+    except StopIteration:
+        return None
+    finally:
+        document.seek(0)
+    return [header.strip().lower() for header in row]
+
+
+def missing_headers(headers):
+    return [header for header in REQUIRED_HEADERS if header not in (headers or [])]
+
+
+def clean_row(values):
+    """Map a CSV row onto Lead field values; returns ``(fields, errors)``."""
+    fields = {}
+    errors = {}
+    for header, (field, max_length) in COLUMNS.items():
+        value = (values.get(header) or "").strip()
+        if max_length:
+            value = value[:max_length]
+        fields[field] = value or None
+
+    if not fields["title"]:
+        errors["title"] = "This field is required."
+    if fields["email"]:
+        try:
+            validate_email(fields["email"])
+        except ValidationError:
+            errors["email"] = "Enter a valid email address."
+    if fields["phone"]:
+        phone = to_python(fields["phone"])
+        if phone is None or not phone.is_valid():
+            errors["phone"] = "Enter a valid phone number."
+        else:
+            fields["phone"] = phone
+    if fields["country"]:
+        country = fields["country"]
+        country = country.upper() if country.upper() in COUNTRY_CODES else (
+            COUNTRY_BY_NAME.get(country.lower())
+        )
+        if country is None:
+            errors["country"] = "Unknown country."
+        fields["country"] = country
+    if fields["status"]:
+        fields["status"] = fields["status"].lower()
+        if fields["status"] not in STATUS_VALUES:
+            errors["status"] = "Invalid status."
+    if fields["source"]:
+        fields["source"] = fields["source"].lower()
+        if fields["source"] not in SOURCE_VALUES:
+            errors["source"] = "Invalid source."
+    return fields, errors
+
+
+class LeadImporter:
+    """
+    Imports the CSV file of a ``LeadImport``.
+
+    Rows are streamed from storage and handled ``chunk_size`` at a time:
+    each chunk is validated, checked for duplicate titles/emails with a
+    single query against the org's leads (and against the rows already
+    imported from the same file), inserted with ``bulk_create`` and the
+    import's counters are saved, so progress can be polled while it runs.
+    """
+
+    def __init__(self, lead_import, chunk_size=None):
+        self.lead_import = lead_import
+        # the uploader; celery workers have no current user to stamp leads with
+        self.user = lead_import.created_by
+        self.chunk_size = chunk_size or settings.LEAD_IMPORT_CHUNK_SIZE
+        self.seen_titles = set()
+        self.seen_emails = set()
+
+    def run(self):
+        lead_import = self.lead_import
+        self.save_progress(status="processing", started_at=timezone.now())
+        try:
+            with lead_import.file.open("rb") as document:
+                rows = iter_csv_rows(document)
+                headers = [header.strip().lower() for header in next(rows, [])]
+                missing = missing_headers(headers)
+                if missing:
+                    return self.finish("failed", "Missing headers: %s" % ", ".join(missing))
+                # data rows start on line 2
+                numbered = enumerate(rows, start=2)
+                while True:
+                    chunk = list(islice(numbered, self.chunk_size))
+                    if not chunk:
+                        break
+                    self.import_chunk(headers, chunk)
+        except Exception as e:
+            return self.finish("failed", str(e))
+        return self.finish("completed")
+
+    def finish(self, status, message=""):
+        self.save_progress(status=status, message=message, finished_at=timezone.now())
+        return self.lead_import
+
+    def save_progress(self, **fields):
+        """
+        Set and write ``fields`` of the import with an UPDATE. Outside a
+        request BaseModel.save clears created_by on the instance, which
+        would leave the imported leads without a creator. updated_at is
+        the heartbeat fail_stalled_imports checks.
+        """
+        fields["updated_at"] = timezone.now()
+        for name, value in fields.items():
+            setattr(self.lead_import, name, value)
+        LeadImport.objects.filter(pk=self.lead_import.pk).update(**fields)
+
+    def import_chunk(self, headers, chunk):
+        lead_import = self.lead_import
+        valid = []
+        row_errors = []
+        for row_number, row in chunk:
+            if not "".join(row).strip():
+                continue
+            values = dict(zip(headers, row))
+            fields, errors = clean_row(values)
+            if errors:
+                row_errors.append(
+                    LeadImportError(
+                        lead_import=lead_import,
+                        row_number=row_number,
+                        values=values,
+                        errors=errors,
+                    )
+                )
+            else:
+                valid.append(fields)
+
+        leads = []
+        duplicates = 0
+        existing_titles, existing_emails = self.existing(valid)
+        for fields in valid:
+            title, email = fields["title"], fields["email"]
+            if (
+                title in existing_titles or title in self.seen_titles
+                or (email and (email in existing_emails or email in self.seen_emails))
+            ):
+                duplicates += 1
+                continue
+            self.seen_titles.add(title)
+            if email:
+                self.seen_emails.add(email)
+            leads.append(
+                Lead(
+                    **fields,
+                    org_id=lead_import.org_id,
+                    created_from_site=False,
+                )
+            )
+
+        with transaction.atomic():
+            Lead.objects.create_batch(leads, user=self.user, batch_size=self.chunk_size)
+            LeadImportError.objects.bulk_create(row_errors, batch_size=self.chunk_size)
+            self.save_progress(
+                total_rows=lead_import.total_rows + len(valid) + len(row_errors),
+                created_count=lead_import.created_count + len(leads),
+                duplicate_count=lead_import.duplicate_count + duplicates,
+                error_count=lead_import.error_count + len(row_errors),
+            )
+        if leads:
+            # bulk_create sends no post_save for the dashboard and search
+            # receivers
+            bump_cache_version(dashboard_scope(lead_import.org_id))
+            index_objects(leads, batch_size=self.chunk_size)
+
+    def existing(self, rows):
+        """Titles and emails of the chunk that the org already has, in one query."""
+        titles = {fields["title"] for fields in rows}
+        emails = {fields["email"] for fields in rows if fields["email"]}
+        if not titles and not emails:
+            return set(), set()
+        matches = Lead.objects.filter(org_id=self.lead_import.org_id).filter(
+            Q(title__in=titles) | Q(email__in=emails)
+        ).values_list("title", "email")
+        existing_titles, existing_emails = set(), set()
+        for title, email in matches:
+            existing_titles.add(title)
+            existing_emails.add(email)
+        return existing_titles, existing_emails
+
+
+def fail_stalled_imports(timeout=None):
+    """
+    Mark imports still "processing" without progress for ``timeout``
+    seconds (LEAD_IMPORT_STALL_TIMEOUT) as failed: their worker died
+    mid-run. Uploading the file again is safe, the rows imported already
+    are skipped as duplicates.
+    """
+    timeout = settings.LEAD_IMPORT_STALL_TIMEOUT if timeout is None else timeout
+    now = timezone.now()
+    return LeadImport.objects.filter(
+        status="processing", updated_at__lt=now - datetime.timedelta(seconds=timeout)
+    ).update(
+        status="failed",
+        message="The import stopped responding, upload the file again to resume it.",
+        finished_at=now,
+        updated_at=now,
+    )
@@ -0,0 +1,57 @@
+import hashlib
+
+from accounts.models import Tags
+from common.cache import cache_versions, get_shared_cache
+from common.models import Profile
+from common.utils import COUNTRIES, INDCHOICES, LEAD_SOURCE, LEAD_STATUS
+from contacts.models import Contact
+from leads.models import Company
+from leads.serializer import CompanySerializer, TagsSerializer
+
+# Lookup data only changes with the org's contacts, companies, users and tag
+# usage (or the global Tags table), see leads.signals.
+METADATA_TIMEOUT = 60 * 60
+
+
+def org_scope(org_id):
+    return "lead-metadata:org:%s" % org_id
+
+
+TAGS_SCOPE = "lead-metadata:tags"
+
+
+def lead_metadata_etag(org):
+    versions = cache_versions(org_scope(org.id), TAGS_SCOPE)
+    token = "%s:%s:%s" % (org.id, versions[org_scope(org.id)], versions[TAGS_SCOPE])
+    return '"%s"' % hashlib.sha1(token.encode()).hexdigest()
+
+
+def build_lead_metadata(org):
+    return {
+        "contacts": list(Contact.objects.filter(org=org).values("id", "first_name")),
+        "companies": CompanySerializer(
+            Company.objects.filter(org=org), many=True
+        ).data,
+        "tags": TagsSerializer(
+            Tags.objects.filter(lead__org=org).distinct(), many=True
+        ).data,
+        "users": list(
+            Profile.objects.filter(is_active=True, org=org).values("id", "user__email")
+        ),
+        "status": LEAD_STATUS,
+        "source": LEAD_SOURCE,
+        "countries": COUNTRIES,
+        "industries": INDCHOICES,
+    }
+
+
+def get_lead_metadata(org, etag=None):
+    """Return ``(etag, metadata)``, building the metadata once per version."""
+    etag = etag or lead_metadata_etag(org)
+    cache = get_shared_cache()
+    key = "crm:lead-metadata:%s" % etag.strip('"')
+    metadata = cache.get(key)
+    if metadata is None:
+        metadata = build_lead_metadata(org)
+        cache.set(key, metadata, METADATA_TIMEOUT)
+    return etag, metadata
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:26
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0010_alter_attachments_created_by'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('leads', '0003_lead_lead_org_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadImport',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Modified At')),
+                ('id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('file', models.FileField(max_length=1001, upload_to='lead_imports/%Y/%m/')),
+                ('file_name', models.CharField(blank=True, max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('message', models.TextField(blank=True, default='')),
+                ('total_rows', models.PositiveIntegerField(default=0)),
+                ('created_count', models.PositiveIntegerField(default=0)),
+                ('duplicate_count', models.PositiveIntegerField(default=0)),
+                ('error_count', models.PositiveIntegerField(default=0)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created_by', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('org', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='lead_imports', to='common.org')),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated_by', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+            ],
+            options={
+                'verbose_name': 'Lead Import',
+                'verbose_name_plural': 'Lead Imports',
+                'db_table': 'lead_import',
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.CreateModel(
+            name='LeadImportError',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row_number', models.PositiveIntegerField()),
+                ('values', models.JSONField(default=dict)),
+                ('errors', models.JSONField(default=dict)),
+                ('lead_import', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='row_errors', to='leads.leadimport')),
+            ],
+            options={
+                'db_table': 'lead_import_error',
+                'ordering': ('row_number',),
+                'indexes': [models.Index(fields=['lead_import', 'row_number'], name='lead_import_error_row_idx')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='leadimport',
+            index=models.Index(fields=['org', '-created_at', '-id'], name='lead_import_org_created_idx'),
+        ),
+    ]
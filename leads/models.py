@@ -1,5 +1,6 @@
 import arrow
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import pgettext_lazy
 from phonenumber_field.modelfields import PhoneNumberField
@@ -89,6 +90,12 @@ class Lead(BaseModel):
         verbose_name_plural = "Leads"
         db_table = "lead"
         ordering = ("-created_at",)
+        # keyset pagination of the list views (common.pagination)
+        indexes = [
+            models.Index(
+                fields=["org", "-created_at", "-id"], name="lead_org_created_idx"
+            )
+        ]
 
     def __str__(self):
         return f"{self.title}"
@@ -133,3 +140,83 @@ class Lead(BaseModel):
     #     close_leads = queryset.filter(status='closed')
     #     cache.set('admin_leads_open_queryset', open_leads, 60*60)
     #     cache.set('admin_leads_close_queryset', close_leads, 60*60)
+
+
+class LeadImport(BaseModel):
+    """A CSV lead import processed in chunks by ``leads.importer.LeadImporter``."""
+
+    STATUS_CHOICES = (
+        ("pending", "Pending"),
+        ("processing", "Processing"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    )
+
+    org = models.ForeignKey(
+        Org, on_delete=models.CASCADE, null=True, blank=True, related_name="lead_imports"
+    )
+    file = models.FileField(max_length=1001, upload_to="lead_imports/%Y/%m/")
+    file_name = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    message = models.TextField(blank=True, default="")
+    total_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    duplicate_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Lead Import"
+        verbose_name_plural = "Lead Imports"
+        db_table = "lead_import"
+        ordering = ("-created_at",)
+        # keyset pagination of the list views (common.pagination)
+        indexes = [
+            models.Index(
+                fields=["org", "-created_at", "-id"], name="lead_import_org_created_idx"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.file_name}"
+
+    @property
+    def processed_rows(self):
+        return self.created_count + self.duplicate_count + self.error_count
+
+    @property
+    def duration(self):
+        """Seconds spent processing so far (or in total once finished)."""
+        if not self.started_at:
+            return None
+        end = self.finished_at or timezone.now()
+        return (end - self.started_at).total_seconds()
+
+    @property
+    def rows_per_second(self):
+        duration = self.duration
+        if not duration:
+            return None
+        return round(self.processed_rows / duration, 2)
+
+
+class LeadImportError(models.Model):
+    """A CSV row rejected by a lead import, with the reasons."""
+
+    lead_import = models.ForeignKey(
+        LeadImport, on_delete=models.CASCADE, related_name="row_errors"
+    )
+    row_number = models.PositiveIntegerField()
+    values = models.JSONField(default=dict)
+    errors = models.JSONField(default=dict)
+
+    class Meta:
+        db_table = "lead_import_error"
+        ordering = ("row_number",)
+        indexes = [
+            models.Index(fields=["lead_import", "row_number"], name="lead_import_error_row_idx")
+        ]
+
+    def __str__(self):
+        return f"{self.lead_import_id}:{self.row_number}"
@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 from accounts.models import Account, Tags
 from common.serializer import (
@@ -8,9 +9,14 @@ from common.serializer import (
     UserSerializer,
 )
 from contacts.serializer import ContactSerializer
-from leads.models import Company, Lead
+from leads.models import Company, Lead, LeadImport, LeadImportError
+from teams.models import Teams
 from teams.serializer import TeamsSerializer
 from common.models import Profile
+from common.utils import COUNTRIES
+from contacts.models import Contact
+
+COUNTRY_NAMES = dict(COUNTRIES)
 
 
 # -------------------- Lead Detail --------------------
@@ -54,7 +60,7 @@ class LeadSerializer(serializers.ModelSerializer):
     lead_comments = LeadCommentSerializer(read_only=True, many=True)
 
     def get_country(self, obj):
-        return obj.get_country_display()
+        return COUNTRY_NAMES.get(obj.country, obj.country)
 
     class Meta:
         model = Lead
@@ -97,6 +103,94 @@ class LeadSerializer(serializers.ModelSerializer):
         )
 
 
+# -------------------- Lead List (flat) --------------------
+class LeadContactLookupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Contact
+        fields = ("id", "first_name", "last_name", "primary_email")
+
+
+class LeadTeamLookupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Teams
+        fields = ("id", "name")
+
+
+class LeadListSerializer(serializers.ModelSerializer):
+    """
+    Flat lead rows for list pages. Related objects are emitted as ids and
+    side-loaded once per page by ``lead_list_lookups``; querysets must go
+    through ``setup_queryset`` so the number of queries does not depend on
+    the page size.
+    """
+
+    contacts = serializers.PrimaryKeyRelatedField(read_only=True, many=True)
+    assigned_to = serializers.PrimaryKeyRelatedField(read_only=True, many=True)
+    tags = serializers.PrimaryKeyRelatedField(read_only=True, many=True)
+    teams = serializers.PrimaryKeyRelatedField(read_only=True, many=True)
+    lead_attachment = serializers.PrimaryKeyRelatedField(read_only=True, many=True)
+    lead_comments = serializers.PrimaryKeyRelatedField(
+        source="leads_comments", read_only=True, many=True
+    )
+    country = serializers.SerializerMethodField()
+
+    def get_country(self, obj):
+        return COUNTRY_NAMES.get(obj.country, obj.country)
+
+    @staticmethod
+    def setup_queryset(queryset):
+        queryset = queryset.prefetch_related(None)
+        return queryset.select_related("created_by").prefetch_related(
+            Prefetch("contacts", queryset=Contact.objects.only(
+                "id", "first_name", "last_name", "primary_email"
+            )),
+            Prefetch("assigned_to", queryset=Profile.objects.select_related("user")),
+            Prefetch("teams", queryset=Teams.objects.only("id", "name")),
+            "tags",
+            "lead_attachment",
+            "leads_comments",
+        )
+
+    class Meta:
+        model = Lead
+        fields = LeadSerializer.Meta.fields
+
+
+def lead_list_lookups(*pages):
+    """De-duplicated related objects of the leads in ``pages``, keyed by id."""
+    related = {
+        "contacts": {}, "profiles": {}, "users": {}, "tags": {},
+        "teams": {}, "attachments": {}, "comments": {},
+    }
+    for page in pages:
+        for lead in page:
+            if lead.created_by_id:
+                related["users"][lead.created_by_id] = lead.created_by
+            for name, attr in (
+                ("contacts", "contacts"), ("profiles", "assigned_to"),
+                ("tags", "tags"), ("teams", "teams"),
+                ("attachments", "lead_attachment"), ("comments", "leads_comments"),
+            ):
+                for obj in getattr(lead, attr).all():
+                    related[name][obj.pk] = obj
+
+    serializers_map = {
+        "contacts": LeadContactLookupSerializer,
+        "profiles": ProfileSerializer,
+        "users": UserSerializer,
+        "tags": TagsSerializer,
+        "teams": LeadTeamLookupSerializer,
+        "attachments": AttachmentsSerializer,
+        "comments": LeadCommentSerializer,
+    }
+    return {
+        name: {
+            str(pk): serializers_map[name](obj).data for pk, obj in objects.items()
+        }
+        for name, objects in related.items()
+    }
+
+
 # -------------------- Lead Creation --------------------
 class LeadCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating new Leads (with org auto-attach)."""
@@ -214,3 +308,36 @@ class LeadCommentEditSwaggerSerializer(serializers.Serializer):
 
 class LeadUploadSwaggerSerializer(serializers.Serializer):
     leads_file = serializers.FileField()
+
+
+# -------------------- Lead Import --------------------
+class LeadImportSerializer(serializers.ModelSerializer):
+    processed_rows = serializers.IntegerField(read_only=True)
+    duration = serializers.FloatField(read_only=True)
+    rows_per_second = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = LeadImport
+        fields = (
+            "id",
+            "file_name",
+            "status",
+            "message",
+            "total_rows",
+            "processed_rows",
+            "created_count",
+            "duplicate_count",
+            "error_count",
+            "started_at",
+            "finished_at",
+            "duration",
+            "rows_per_second",
+            "created_at",
+            "created_by",
+        )
+
+
+class LeadImportErrorSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LeadImportError
+        fields = ("row_number", "values", "errors")
@@ -0,0 +1,37 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import Tags
+from common.cache import bump_cache_version
+from common.models import Profile
+from contacts.models import Contact
+from leads.metadata import TAGS_SCOPE, org_scope
+from leads.models import Company, Lead
+
+
+@receiver(post_save, sender=Contact)
+@receiver(post_delete, sender=Contact)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_org_lead_metadata(sender, instance, **kwargs):
+    """Org scoped lookup lists of the lead pages changed"""
+    if instance.org_id:
+        bump_cache_version(org_scope(instance.org_id))
+
+
+@receiver(post_save, sender=Tags)
+@receiver(post_delete, sender=Tags)
+def invalidate_tags_lead_metadata(sender, instance, **kwargs):
+    bump_cache_version(TAGS_SCOPE)
+
+
+@receiver(m2m_changed, sender=Lead.tags.through)
+def invalidate_lead_tags_metadata(sender, instance, action, reverse, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        bump_cache_version(TAGS_SCOPE)
+    elif instance.org_id:
+        bump_cache_version(org_scope(instance.org_id))
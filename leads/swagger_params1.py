@@ -21,4 +21,40 @@ lead_list_get_params = [
         enum=["assigned", "in process", "converted", "recycled", "closed"],
     ),
     OpenApiParameter("tags", OpenApiTypes.STR, OpenApiParameter.QUERY),
+    OpenApiParameter(
+        "include_metadata",
+        OpenApiTypes.BOOL,
+        OpenApiParameter.QUERY,
+        description="Set to false to get only the paginated leads",
+    ),
+    OpenApiParameter(
+        "flat",
+        OpenApiTypes.BOOL,
+        OpenApiParameter.QUERY,
+        description="Return related objects as ids with a side-loaded lookups map",
+    ),
+    OpenApiParameter(
+        "pagination", OpenApiTypes.STR, OpenApiParameter.QUERY, enum=["offset", "cursor"]
+    ),
+    OpenApiParameter("open_cursor", OpenApiTypes.STR, OpenApiParameter.QUERY),
+    OpenApiParameter("close_cursor", OpenApiTypes.STR, OpenApiParameter.QUERY),
+]
+
+lead_import_list_get_params = [
+    organization_params_in_header,
+    OpenApiParameter(
+        "pagination", OpenApiTypes.STR, OpenApiParameter.QUERY, enum=["offset", "cursor"]
+    ),
+    OpenApiParameter("cursor", OpenApiTypes.STR, OpenApiParameter.QUERY),
+]
+
+lead_import_errors_get_params = [
+    organization_params_in_header,
+    OpenApiParameter("limit", OpenApiTypes.INT, OpenApiParameter.QUERY),
+    OpenApiParameter("offset", OpenApiTypes.INT, OpenApiParameter.QUERY),
+]
+
+lead_metadata_get_params = [
+    organization_params_in_header,
+    OpenApiParameter("If-None-Match", OpenApiTypes.STR, OpenApiParameter.HEADER),
 ]
@@ -1,14 +1,14 @@
-import re
-
 from celery import Celery
 from django.conf import settings
 from django.core.cache import cache
-from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives
 from django.db.models import Q
 from django.template.loader import render_to_string
 
-from common.models import Org, Profile
-from leads.models import Lead
+from common.models import Profile
+from common.notifications import profile_recipients, send_notification
+from leads.importer import LeadImporter, fail_stalled_imports
+from leads.models import Lead, LeadImport
 
 app = Celery("redis://")
 
@@ -78,60 +78,34 @@ def send_lead_assigned_emails(lead_id, new_assigned_to_list, site_address):
 def send_email_to_assigned_user(recipients, lead_id, source=""):
     """Send Mail To Users When they are assigned to a lead"""
     lead = Lead.objects.get(id=lead_id)
-    created_by = lead.created_by
-    for user in recipients:
-        recipients_list = []
-        profile = Profile.objects.filter(id=user, is_active=True).first()
-        if profile:
-            recipients_list.append(profile.user.email)
-            context = {}
-            context["url"] = settings.DOMAIN_NAME
-            context["user"] = profile.user
-            context["lead"] = lead
-            context["created_by"] = created_by
-            context["source"] = source
-            subject = "Assigned a lead for you. "
-            html_content = render_to_string(
-                "assigned_to/leads_assigned.html", context=context
-            )
-            msg = EmailMessage(subject, html_content, to=recipients_list)
-            msg.content_subtype = "html"
-            msg.send()
+    context = {
+        "url": settings.DOMAIN_NAME,
+        "lead": lead,
+        "created_by": lead.created_by,
+        "source": source,
+    }
+    return send_notification(
+        "Assigned a lead for you. ",
+        "assigned_to/leads_assigned.html",
+        context,
+        profile_recipients(recipients),
+    )
+
+
+@app.task
+def import_leads(lead_import_id):
+    """Run a queued CSV import, see leads.importer.LeadImporter."""
+    lead_import = LeadImport.objects.filter(id=lead_import_id, status="pending").first()
+    if lead_import is None:
+        return False
+    LeadImporter(lead_import).run()
+    return True
 
 
 @app.task
-def create_lead_from_file(validated_rows, invalid_rows, user_id, source, company_id):
-    """Parameters : validated_rows, invalid_rows, user_id.
-    This function is used to create leads from a given file.
-    """
-    email_regex = "^[_a-zA-Z0-9-]+(\.[_a-zA-Z0-9-]+)*@[a-zA-Z0-9-]+(\.[a-zA-Z0-9-]+)*(\.[a-zA-Z]{2,4})$"
-    profile = Profile.objects.get(id=user_id)
-    org = Org.objects.filter(id=company_id).first()
-    for row in validated_rows:
-        if not Lead.objects.filter(title=row.get("title")).exists():
-            if re.match(email_regex, row.get("email")) is not None:
-                try:
-                    lead = Lead()
-                    lead.title = row.get("title", "")[:64]
-                    lead.first_name = row.get("first name", "")[:255]
-                    lead.last_name = row.get("last name", "")[:255]
-                    lead.website = row.get("website", "")[:255]
-                    lead.email = row.get("email", "")
-                    lead.phone = row.get("phone", "")
-                    lead.address_line = row.get("address", "")[:255]
-                    lead.city = row.get("city", "")[:255]
-                    lead.state = row.get("state", "")[:255]
-                    lead.postcode = row.get("postcode", "")[:64]
-                    lead.country = row.get("country", "")[:3]
-                    lead.description = row.get("description", "")
-                    lead.status = row.get("status", "")
-                    lead.account_name = row.get("account_name", "")[:255]
-                    lead.created_from_site = False
-                    lead.created_by = profile
-                    lead.org = org
-                    lead.save()
-                except Exception as e:
-                    print(e)
+def fail_stalled_lead_imports():
+    """Fail imports whose worker died, see leads.importer.fail_stalled_imports."""
+    return fail_stalled_imports()
 
 
 @app.task
@@ -1,8 +1,12 @@
 from django.urls import path
 from .views import (
     LeadListView,
+    LeadMetadataView,
     LeadDetailView,
     LeadUploadView,
+    LeadImportListView,
+    LeadImportDetailView,
+    LeadImportErrorListView,
     LeadCommentView,
     LeadAttachmentView,
     CreateLeadFromSite,
@@ -15,8 +19,12 @@ app_name = "api_leads"
 urlpatterns = [
     # Leads
     path("", LeadListView.as_view(), name="lead-list"),                      # GET list, POST create
+    path("metadata/", LeadMetadataView.as_view(), name="lead-metadata"),      # GET lookup lists
     path("<uuid:pk>/", LeadDetailView.as_view(), name="lead-detail"),        # GET, PUT, DELETE
-    path("upload/", LeadUploadView.as_view(), name="lead-upload"),
+    path("upload/", LeadUploadView.as_view(), name="lead-upload"),              # POST queue a CSV import
+    path("imports/", LeadImportListView.as_view(), name="lead-import-list"),
+    path("imports/<uuid:pk>/", LeadImportDetailView.as_view(), name="lead-import-detail"),
+    path("imports/<uuid:pk>/errors/", LeadImportErrorListView.as_view(), name="lead-import-errors"),
 
     # Comments & Attachments
     path("comments/<int:pk>/", LeadCommentView.as_view(), name="lead-comment"),
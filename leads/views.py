@@ -9,6 +9,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accounts.models import Account, Tags
+from common.pagination import KeysetPagination
 from common.models import APISettings, Attachments, Comment, Profile, User
 from common.serializer import (
     AttachmentsSerializer,
@@ -19,31 +20,34 @@ from common.serializer import (
 from contacts.models import Contact
 from leads import swagger_params1
 from leads.forms import LeadListForm
-from leads.models import Company, Lead
+from leads.metadata import get_lead_metadata, lead_metadata_etag
+from leads.models import Company, Lead, LeadImport
 from leads.serializer import (
     CompanySerializer,
     CompanySwaggerSerializer,
     LeadSerializer,
-    TagsSerializer,
+    LeadListSerializer,
     LeadCreateSerializer,
     LeadCreateSwaggerSerializer,
     LeadDetailEditSwaggerSerializer,
     LeadCommentEditSwaggerSerializer,
     CreateLeadFromSiteSwaggerSerializer,
     LeadUploadSwaggerSerializer,
+    LeadImportSerializer,
+    LeadImportErrorSerializer,
+    lead_list_lookups,
 )
 from leads.tasks import (
-    create_lead_from_file,
+    import_leads,
     send_email_to_assigned_user,
     send_lead_assigned_emails,
 )
 from teams.models import Teams
 from teams.serializer import TeamsSerializer
-from common.utils import COUNTRIES, INDCHOICES, LEAD_SOURCE, LEAD_STATUS
 
 
 # -------------------- Lead List + Create --------------------
-class LeadListView(APIView, LimitOffsetPagination):
+class LeadListView(APIView, KeysetPagination):
     model = Lead
     permission_classes = (IsAuthenticated,)
 
@@ -53,7 +57,6 @@ class LeadListView(APIView, LimitOffsetPagination):
             .exclude(status="converted")
             .select_related("created_by")
             .prefetch_related("tags", "assigned_to")
-            .order_by("-id")
         )
         if self.request.profile.role != "ADMIN" and not self.request.user.is_superuser:
             qs = qs.filter(
@@ -64,35 +67,57 @@ class LeadListView(APIView, LimitOffsetPagination):
     @extend_schema(tags=["Leads"], parameters=swagger_params1.lead_list_get_params)
     def get(self, request, *args, **kwargs):
         queryset = self.get_queryset()
+        # ?flat=true returns related objects as ids, side-loaded once per
+        # page under "lookups" instead of nested in every lead
+        flat = request.query_params.get("flat", "false").lower() in ("true", "1")
+        serializer_class = LeadSerializer
+        if flat:
+            queryset = LeadListSerializer.setup_queryset(queryset)
+            serializer_class = LeadListSerializer
 
         # open leads
         queryset_open = queryset.exclude(status="closed")
-        results_open = self.paginate_queryset(queryset_open.distinct(), request, view=self)
-        open_leads = LeadSerializer(results_open, many=True).data
+        results_open = self.paginate_queryset(
+            queryset_open.distinct(), request, view=self, cursor_query_param="open_cursor"
+        )
+        open_offset = self.get_next_offset(results_open)
+        # the paginator's COUNT of the distinct rows, None in keyset mode
+        open_count = self.count
+        open_leads = serializer_class(results_open, many=True).data
 
         # closed leads
         queryset_close = queryset.filter(status="closed")
-        results_close = self.paginate_queryset(queryset_close.distinct(), request, view=self)
-        close_leads = LeadSerializer(results_close, many=True).data
+        results_close = self.paginate_queryset(
+            queryset_close.distinct(), request, view=self, cursor_query_param="close_cursor"
+        )
+        close_offset = self.get_next_offset(results_close)
+        close_count = self.count
+        close_leads = serializer_class(results_close, many=True).data
 
         context = {
             "per_page": 10,
             "page_number": (int(self.offset / 10) + 1,),
-            "open_leads": {"leads_count": queryset_open.count(), "open_leads": open_leads},
-            "close_leads": {"leads_count": queryset_close.count(), "close_leads": close_leads},
-            "contacts": Contact.objects.filter(org=request.profile.org).values("id", "first_name"),
-            "status": LEAD_STATUS,
-            "source": LEAD_SOURCE,
-            "companies": CompanySerializer(
-                Company.objects.filter(org=request.profile.org), many=True
-            ).data,
-            "tags": TagsSerializer(Tags.objects.all(), many=True).data,
-            "users": Profile.objects.filter(is_active=True, org=request.profile.org).values(
-                "id", "user__email"
-            ),
-            "countries": COUNTRIES,
-            "industries": INDCHOICES,
+            "open_leads": {
+                "leads_count": open_count,
+                "offset": open_offset,
+                "open_leads": open_leads,
+            },
+            "close_leads": {
+                "leads_count": close_count,
+                "offset": close_offset,
+                "close_leads": close_leads,
+            },
         }
+        if flat:
+            context["lookups"] = lead_list_lookups(results_open, results_close)
+        # ?include_metadata=false skips the lookup lists, clients fetch them
+        # from LeadMetadataView and refresh when metadata_etag changes
+        if request.query_params.get("include_metadata", "true").lower() in ("false", "0"):
+            context["metadata_etag"] = lead_metadata_etag(request.profile.org)
+        else:
+            etag, metadata = get_lead_metadata(request.profile.org)
+            context.update(metadata)
+            context["metadata_etag"] = etag
         return Response(context)
 
     @extend_schema(
@@ -145,6 +170,25 @@ class LeadListView(APIView, LimitOffsetPagination):
         return Response({"error": True, "errors": serializer.errors}, status=400)
 
 
+# -------------------- Lead Lookup Metadata --------------------
+class LeadMetadataView(APIView):
+    """Contacts, companies, tags, users and choice lists used by the lead pages."""
+
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(tags=["Leads"], parameters=swagger_params1.lead_metadata_get_params)
+    def get(self, request, *args, **kwargs):
+        etag = lead_metadata_etag(request.profile.org)
+        if etag in request.headers.get("If-None-Match", ""):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            etag, metadata = get_lead_metadata(request.profile.org, etag)
+            response = Response(metadata)
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+
 # -------------------- Lead Detail --------------------
 class LeadDetailView(APIView):
     model = Lead
@@ -168,17 +212,72 @@ class LeadUploadView(APIView):
     def post(self, request, *args, **kwargs):
         lead_form = LeadListForm(request.POST, request.FILES)
         if lead_form.is_valid():
-            create_lead_from_file.delay(
-                lead_form.validated_rows,
-                lead_form.invalid_rows,
-                request.profile.id,
-                request.get_host(),
-                request.profile.org.id,
+            leads_file = lead_form.cleaned_data["leads_file"]
+            lead_import = LeadImport.objects.create(
+                org=request.profile.org,
+                file=leads_file,
+                file_name=leads_file.name[:255],
+            )
+            import_leads.delay(str(lead_import.id))
+            return Response(
+                {
+                    "error": False,
+                    "message": "Leads import started",
+                    "import": LeadImportSerializer(lead_import).data,
+                },
+                status=status.HTTP_202_ACCEPTED,
             )
-            return Response({"error": False, "message": "Leads created Successfully"}, status=200)
         return Response({"error": True, "errors": lead_form.errors}, status=400)
 
 
+# -------------------- Lead Import Progress --------------------
+def get_lead_imports(request):
+    """Imports of the org; users other than admins only see their own."""
+    qs = LeadImport.objects.filter(org=request.profile.org)
+    if request.profile.role != "ADMIN" and not request.user.is_superuser:
+        qs = qs.filter(created_by=request.user)
+    return qs
+
+
+class LeadImportListView(APIView, KeysetPagination):
+    model = LeadImport
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(tags=["Leads"], parameters=swagger_params1.lead_import_list_get_params)
+    def get(self, request, *args, **kwargs):
+        results = self.paginate_queryset(get_lead_imports(request), request, view=self)
+        return Response(
+            {
+                "imports_count": self.count,
+                "offset": self.get_next_offset(results),
+                "imports": LeadImportSerializer(results, many=True).data,
+            }
+        )
+
+
+class LeadImportDetailView(APIView):
+    model = LeadImport
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(tags=["Leads"], parameters=swagger_params1.organization_params)
+    def get(self, request, pk, *args, **kwargs):
+        lead_import = get_object_or_404(get_lead_imports(request), id=pk)
+        return Response(LeadImportSerializer(lead_import).data)
+
+
+class LeadImportErrorListView(APIView, LimitOffsetPagination):
+    model = LeadImport
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(tags=["Leads"], parameters=swagger_params1.lead_import_errors_get_params)
+    def get(self, request, pk, *args, **kwargs):
+        lead_import = get_object_or_404(get_lead_imports(request), id=pk)
+        results = self.paginate_queryset(lead_import.row_errors.all(), request, view=self)
+        return self.get_paginated_response(
+            LeadImportErrorSerializer(results, many=True).data
+        )
+
+
 # -------------------- Lead Comment --------------------
 class LeadCommentView(APIView):
     model = Comment
@@ -17,6 +17,10 @@ opportunity_list_get_params = [
     OpenApiParameter("stage", OpenApiTypes.STR,OpenApiParameter.QUERY),
     OpenApiParameter("lead_source", OpenApiTypes.STR,OpenApiParameter.QUERY),
     OpenApiParameter("tags", OpenApiTypes.STR,OpenApiParameter.QUERY),
+    OpenApiParameter(
+        "pagination", OpenApiTypes.STR, OpenApiParameter.QUERY, enum=["offset", "cursor"]
+    ),
+    OpenApiParameter("cursor", OpenApiTypes.STR, OpenApiParameter.QUERY),
 ]
 
 opportunity_detail_get_params = [
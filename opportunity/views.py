@@ -3,13 +3,13 @@ import json
 from django.db.models import Q
 from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
 from rest_framework import status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accounts.models import Account, Tags
 from accounts.serializer import AccountSerializer, TagsSerailizer
+from common.pagination import KeysetPagination
 from common.models import Attachments, Comment, Profile
 
 #from common.external_auth import CustomDualAuthentication
@@ -28,7 +28,7 @@ from opportunity.tasks import send_email_to_assigned_user
 from teams.models import Teams
 
 
-class OpportunityListView(APIView, LimitOffsetPagination):
+class OpportunityListView(APIView, KeysetPagination):
 
     #authentication_classes = (CustomDualAuthentication,)
     permission_classes = (IsAuthenticated,)
@@ -36,7 +36,7 @@ class OpportunityListView(APIView, LimitOffsetPagination):
 
     def get_context_data(self, **kwargs):
         params = self.request.query_params
-        queryset = self.model.objects.filter(org=self.request.profile.org).order_by("-id")
+        queryset = self.model.objects.filter(org=self.request.profile.org)
         accounts = Account.objects.filter(org=self.request.profile.org)
         contacts = Contact.objects.filter(org=self.request.profile.org)
         if self.request.profile.role != "ADMIN" and not self.request.user.is_superuser:
@@ -71,12 +71,7 @@ class OpportunityListView(APIView, LimitOffsetPagination):
             queryset.distinct(), self.request, view=self
         )
         opportunities = OpportunitySerializer(results_opportunities, many=True).data
-        if results_opportunities:
-            offset = queryset.filter(id__gte=results_opportunities[-1].id).count()
-            if offset == queryset.count():
-                offset = None
-        else:
-            offset = 0
+        offset = self.get_next_offset(results_opportunities)
         context["per_page"] = 10
         page_number = (int(self.offset / 10) + 1,)
         context["page_number"] = page_number
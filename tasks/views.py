@@ -3,13 +3,13 @@ import json
 from django.db.models import Q
 from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
 from rest_framework import status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accounts.models import Account
 from accounts.serializer import AccountSerializer
+from common.pagination import KeysetPagination
 from common.models import Attachments, Comment, Profile
 
 #from common.external_auth import CustomDualAuthentication
@@ -28,14 +28,14 @@ from teams.models import Teams
 from teams.serializer import TeamsSerializer
 
 
-class TaskListView(APIView, LimitOffsetPagination):
+class TaskListView(APIView, KeysetPagination):
     model = Task
     #authentication_classes = (CustomDualAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def get_context_data(self, **kwargs):
         params = self.request.query_params
-        queryset = self.model.objects.filter(org=self.request.profile.org).order_by("-id")
+        queryset = self.model.objects.filter(org=self.request.profile.org)
         accounts = Account.objects.filter(org=self.request.profile.org)
         contacts = Contact.objects.filter(org=self.request.profile.org)
         if self.request.profile.role != "ADMIN" and not self.request.profile.is_admin:
@@ -62,12 +62,7 @@ class TaskListView(APIView, LimitOffsetPagination):
             queryset.distinct(), self.request, view=self
         )
         tasks = TaskSerializer(results_tasks, many=True).data
-        if results_tasks:
-            offset = queryset.filter(id__gte=results_tasks[-1].id).count()
-            if offset == queryset.count():
-                offset = None
-        else:
-            offset = 0
+        offset = self.get_next_offset(results_tasks)
         context.update(
             {
                 "tasks_count": self.count,
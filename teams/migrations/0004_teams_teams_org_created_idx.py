@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0003_alter_teams_created_by'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='teams',
+            index=models.Index(fields=['org', '-created_at', '-id'], name='teams_org_created_idx'),
+        ),
+    ]
@@ -19,6 +19,12 @@ class Teams(BaseModel):
         verbose_name_plural = "Teams"
         db_table = "teams"
         ordering = ("-created_at",)
+        # keyset pagination of the list views (common.pagination)
+        indexes = [
+            models.Index(
+                fields=["org", "-created_at", "-id"], name="teams_org_created_idx"
+            )
+        ]
 
     def __str__(self):
         return f"{self.name}"
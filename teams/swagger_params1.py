@@ -14,4 +14,8 @@ teams_list_get_params = [
     OpenApiParameter("team_name", OpenApiTypes.STR,OpenApiParameter.QUERY),
     OpenApiParameter("created_by", OpenApiTypes.STR,OpenApiParameter.QUERY),
     OpenApiParameter("assigned_users", OpenApiTypes.STR,OpenApiParameter.QUERY),
+    OpenApiParameter(
+        "pagination", OpenApiTypes.STR, OpenApiParameter.QUERY, enum=["offset", "cursor"]
+    ),
+    OpenApiParameter("cursor", OpenApiTypes.STR, OpenApiParameter.QUERY),
 ]
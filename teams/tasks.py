@@ -1,70 +1,73 @@
+import logging
+import time
+
 from celery import Celery
+from django.db import transaction
 
+from common.cache import bump_cache_version
+from common.dashboard import dashboard_scope
 from common.models import Profile
 from teams.models import Teams
 
 app = Celery("redis://")
 
+logger = logging.getLogger(__name__)
+
+# (name, reverse accessor of the record's ``teams`` field, profiles m2m field)
+TEAM_MEMBER_RELATIONS = (
+    ("accounts", "account_teams", "assigned_to"),
+    ("contacts", "contact_teams", "assigned_to"),
+    ("leads", "lead_teams", "assigned_to"),
+    ("opportunities", "oppurtunity_teams", "assigned_to"),
+    ("cases", "cases_teams", "assigned_to"),
+    ("documents", "document_teams", "shared_to"),
+    ("tasks", "tasks_teams", "assigned_to"),
+    ("invoices", "invoices_teams", "assigned_to"),
+    ("events", "event_teams", "assigned_to"),
+)
+
 
 @app.task
 def remove_users(removed_users_list, team_id):
-    removed_users_list = [i for i in removed_users_list if i.isdigit()]
-    users_list = Profile.objects.filter(id__in=removed_users_list)
-    if users_list.exists():
-        team = Teams.objects.filter(id=team_id).first()
-        if team:
-            accounts = team.account_teams.all()
-            for account in accounts:
-                for user in users_list:
-                    account.assigned_to.remove(user)
-
-            # for contacts
-            contacts = team.contact_teams.all()
-            for contact in contacts:
-                for user in users_list:
-                    contact.assigned_to.remove(user)
-
-            # for leads
-            leads = team.lead_teams.all()
-            for lead in leads:
-                for user in users_list:
-                    lead.assigned_to.remove(user)
-
-            # for opportunities
-            opportunities = team.oppurtunity_teams.all()
-            for opportunity in opportunities:
-                for user in users_list:
-                    opportunity.assigned_to.remove(user)
-
-            # for cases
-            cases = team.cases_teams.all()
-            for case in cases:
-                for user in users_list:
-                    case.assigned_to.remove(user)
-
-            # for documents
-            docs = team.document_teams.all()
-            for doc in docs:
-                for user in users_list:
-                    doc.shared_to.remove(user)
-
-            # for tasks
-            tasks = team.tasks_teams.all()
-            for task in tasks:
-                for user in users_list:
-                    task.assigned_to.remove(user)
-
-            # for invoices
-            invoices = team.invoices_teams.all()
-            for invoice in invoices:
-                for user in users_list:
-                    invoice.assigned_to.remove(user)
-
-            # for events
-            events = team.event_teams.all()
-            for event in events:
-                for user in users_list:
-                    event.assigned_to.remove(user)
+    """
+    Unassign the removed team members from every record of the team with
+    one DELETE per through table, all in one transaction. Returns the rows
+    removed and the time taken per relation.
+    """
+    team = Teams.objects.filter(id=team_id).first()
+    if team is None or not removed_users_list:
+        return {}
+    profile_ids = list(
+        Profile.objects.filter(id__in=removed_users_list).values_list("id", flat=True)
+    )
+    if not profile_ids:
+        return {}
+
+    stats = {}
+    with transaction.atomic():
+        for name, accessor, field_name in TEAM_MEMBER_RELATIONS:
+            start = time.perf_counter()
+            records = getattr(team, accessor).all()
+            field = records.model._meta.get_field(field_name)
+            through = field.remote_field.through
+            removed, _ = through.objects.filter(
+                **{
+                    "%s__in" % field.m2m_field_name(): records.values("id"),
+                    "%s__in" % field.m2m_reverse_field_name(): profile_ids,
+                }
+            ).delete()
+            stats[name] = {
+                "removed": removed,
+                "seconds": round(time.perf_counter() - start, 4),
+            }
+            logger.info(
+                "team %s: removed %s %s assignments in %.4fs",
+                team_id, removed, name, stats[name]["seconds"],
+            )
+    # through rows deleted directly send no m2m_changed
+    if team.org_id:
+        bump_cache_version(dashboard_scope(team.org_id))
+    return stats
 
 
 @app.task
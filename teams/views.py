@@ -3,11 +3,11 @@ from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schem
 
 #from common.external_auth import CustomDualAuthentication
 from rest_framework import status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from common.pagination import KeysetPagination
 from common.models import Profile
 from teams import swagger_params1
 from teams.models import Teams
@@ -15,14 +15,14 @@ from teams.serializer import TeamCreateSerializer, TeamsSerializer,TeamswaggerCr
 from teams.tasks import remove_users, update_team_users
 
 
-class TeamsListView(APIView, LimitOffsetPagination):
+class TeamsListView(APIView, KeysetPagination):
     model = Teams
     #authentication_classes = (CustomDualAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def get_context_data(self, **kwargs):
         params = self.request.query_params
-        queryset = self.model.objects.filter(org=self.request.profile.org).order_by("-id")
+        queryset = self.model.objects.filter(org=self.request.profile.org)
         if params:
             if params.get("team_name"):
                 queryset = queryset.filter(name__icontains=params.get("team_name"))
@@ -38,12 +38,7 @@ class TeamsListView(APIView, LimitOffsetPagination):
             queryset.distinct(), self.request, view=self
         )
         teams = TeamsSerializer(results_teams, many=True).data
-        if results_teams:
-            offset = queryset.filter(id__gte=results_teams[-1].id).count()
-            if offset == queryset.count():
-                offset = None
-        else:
-            offset = 0
+        offset = self.get_next_offset(results_teams)
         context["per_page"] = 10
         page_number = (int(self.offset / 10) + 1,)
         context["page_number"] = page_number
@@ -140,8 +135,7 @@ class TeamsDetailView(APIView):
             )
         params = request.data
         self.team = self.get_object(pk)
-        actual_users = self.team.get_users()
-        removed_users = []
+        actual_users = set(self.team.users.values_list("id", flat=True))
         serializer = TeamCreateSerializer(
             data=params, instance=self.team, request_obj=request
         )
@@ -157,11 +151,10 @@ class TeamsDetailView(APIView):
                 if profiles:
                     team_obj.users.add(*profiles)
             update_team_users.delay(pk)
-            latest_users = team_obj.get_users()
-            for user in actual_users:
-                if user not in latest_users:
-                    removed_users.append(user)
-            remove_users.delay(removed_users, pk)
+            latest_users = set(team_obj.users.values_list("id", flat=True))
+            removed_users = [str(user) for user in actual_users - latest_users]
+            if removed_users:
+                remove_users.delay(removed_users, pk)
             return Response(
                 {"error": False, "message": "Team Updated Successfully"},
                 status=status.HTTP_200_OK,
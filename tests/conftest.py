@@ -0,0 +1,43 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from common.cache import profile_cache
+from common.models import Org, Profile, User
+
+
+@pytest.fixture(autouse=True)
+def clean_cache(monkeypatch):
+    """Caches are process wide, start every test from an empty one."""
+    cache.clear()
+    profile_cache.reset()
+    # the test run is a single process, LocMemCache is shared enough
+    monkeypatch.setattr(profile_cache, "enabled", True)
+    yield
+    cache.clear()
+    profile_cache.reset()
+
+
+@pytest.fixture
+def org(db):
+    return Org.objects.create(name="Test Org")
+
+
+@pytest.fixture
+def admin_profile(org):
+    user = User.objects.create_user(email="admin@test.com", password="testpass123")
+    return Profile.objects.create(
+        user=user, org=org, role="ADMIN", is_organization_admin=True, phone="+14155550100"
+    )
+
+
+@pytest.fixture
+def api_client(admin_profile):
+    """Client sending the same JWT + org headers as the frontend."""
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION="Bearer %s" % AccessToken.for_user(admin_profile.user),
+        HTTP_ORG=str(admin_profile.org_id),
+    )
+    return client
@@ -0,0 +1,102 @@
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts import tasks
+from accounts.campaign import CampaignSender
+from accounts.models import AccountEmail, AccountEmailLog
+from contacts.models import Contact
+
+
+@pytest.fixture
+def campaign(db, org):
+    email = AccountEmail.objects.create(
+        message_subject="Spring offer",
+        message_body="<p>Hi {{ name }} ({{ email }})</p>",
+        from_email="sales@example.com",
+    )
+    contacts = [
+        Contact.objects.create(
+            first_name="Contact",
+            last_name=str(i),
+            primary_email=f"contact{i}@example.com",
+            org=org,
+        )
+        for i in range(5)
+    ]
+    email.recipients.set(contacts)
+    return email, contacts
+
+
+def test_sends_in_batches_and_logs_every_recipient(campaign):
+    email, contacts = campaign
+
+    with CaptureQueriesContext(connection) as ctx:
+        stats = CampaignSender(email, batch_size=2).run()
+
+    assert stats["sent"] == 5 and stats["failed"] == 0 and stats["batches"] == 3
+    # recipients + sent logs, one insert per batch, one stats update
+    assert len(ctx.captured_queries) == 6
+    assert sorted(m.to[0] for m in mail.outbox) == sorted(c.primary_email for c in contacts)
+    assert "<p>Hi Contact 0 (contact0@example.com)</p>" in [m.body for m in mail.outbox]
+    assert AccountEmailLog.objects.filter(email=email, is_sent=True).count() == 5
+    email.refresh_from_db()
+    assert email.sent_count == 5 and email.send_seconds > 0
+    assert email.rendered_message_body.startswith("<p>Hi Contact")
+
+
+def test_skips_contacts_already_sent_to(campaign):
+    email, contacts = campaign
+    AccountEmailLog.objects.create(email=email, contact=contacts[0], is_sent=True)
+
+    stats = CampaignSender(email).run()
+    again = CampaignSender(email).run()
+
+    assert stats["sent"] == 4 and stats["skipped"] == 1
+    assert again["sent"] == 0 and again["skipped"] == 5
+    assert len(mail.outbox) == 4
+    email.refresh_from_db()
+    assert email.sent_count == 4
+
+
+def test_a_failing_message_is_not_resent_to_the_others(campaign):
+    email, contacts = campaign
+    backend = mock.MagicMock()
+    failing = contacts[1].primary_email
+    delivered = []
+
+    def send_messages(messages):
+        # like the SMTP backend: delivers in order, raises at the first failure
+        for message in messages:
+            if message.to == [failing]:
+                raise OSError("smtp down")
+            delivered.append(message.to[0])
+        return len(messages)
+
+    backend.send_messages.side_effect = send_messages
+    stats = CampaignSender(email, batch_size=5, connection=backend).run()
+
+    assert stats["sent"] == 4 and stats["failed"] == 1
+    assert sorted(delivered) == sorted(c.primary_email for c in contacts if c.primary_email != failing)
+    logged = set(AccountEmailLog.objects.values_list("contact_id", flat=True))
+    assert contacts[1].id not in logged and len(logged) == 4
+    email.refresh_from_db()
+    assert email.failed_count == 1
+
+
+def test_large_campaigns_fan_out_into_chunk_tasks(campaign, settings):
+    email, contacts = campaign
+    settings.EMAIL_CAMPAIGN_CHUNK_SIZE = 2
+
+    with mock.patch.object(tasks.send_email, "delay") as delay:
+        assert tasks.send_email(email.id) == {"chunks": 3}
+
+    chunks = [call.args[1] for call in delay.call_args_list]
+    assert sorted(sum(chunks, [])) == sorted(str(c.id) for c in contacts)
+    assert not mail.outbox
+
+    stats = tasks.send_email(email.id, chunks[0])
+    assert stats["sent"] == 2 and len(mail.outbox) == 2
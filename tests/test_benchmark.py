@@ -0,0 +1,69 @@
+from accounts.models import Account
+from common.benchmark import compare, run_benchmark
+from common.fake_data import OrgSeeder
+from common.models import Attachments, Comment, Profile
+from contacts.models import Contact
+from leads.models import Lead
+
+VOLUMES = {
+    "users": 3,
+    "teams": 2,
+    "tags": 4,
+    "accounts": 5,
+    "contacts": 8,
+    "leads": 12,
+    "opportunities": 0,
+    "cases": 0,
+    "tasks": 0,
+    "events": 0,
+    "invoices": 0,
+    "comments": 6,
+    "attachments": 3,
+}
+
+
+def test_seeder_builds_a_consistent_org(db):
+    org = OrgSeeder("bench", VOLUMES, batch_size=5).run()
+
+    assert Profile.objects.filter(org=org).count() == 3
+    assert Account.objects.filter(org=org).count() == 5
+    assert Contact.objects.filter(org=org).count() == 8
+    assert Lead.objects.filter(org=org).count() == 12
+    assert Comment.objects.count() == 6
+    for attachment in Attachments.objects.all():
+        extension = attachment.file_name.rsplit(".", 1)[1]
+        assert attachment.extension == extension and attachment.category and attachment.mime_type
+    lead = Lead.objects.filter(org=org).first()
+    assert lead.created_by_id == lead.assigned_to.get().user_id
+    assert not Lead.objects.exclude(org=org).exists()
+
+
+def test_run_benchmark_reports_latency_queries_and_memory(db):
+    OrgSeeder("bench", VOLUMES).run()
+    profile = Profile.objects.get(org__name="bench", role="ADMIN")
+
+    results = run_benchmark(profile, {"leads": "/api/leads/?flat=true"}, repeat=3, warmup=0)
+
+    result = results["leads"]
+    assert result["status"] == 200
+    assert result["runs"] == 3
+    assert result["queries"] > 0
+    assert 0 < result["p50_ms"] <= result["p95_ms"]
+    assert result["peak_kb"] > 0
+
+
+def test_compare_flags_extra_queries_and_slowdowns():
+    baseline = {
+        "leads": {"status": 200, "queries": 10, "p95_ms": 100.0, "peak_kb": 500.0},
+        "home": {"status": 200, "queries": 5, "p95_ms": 50.0, "peak_kb": 100.0},
+    }
+    results = {
+        "leads": {"status": 200, "queries": 11, "p95_ms": 120.0, "peak_kb": 500.0},
+        "home": {"status": 200, "queries": 5, "p95_ms": 80.0, "peak_kb": 90.0},
+        "new": {"status": 200, "queries": 1, "p95_ms": 1.0, "peak_kb": 1.0},
+    }
+
+    assert compare(results, baseline, tolerance=0.25) == [
+        "leads: 11 queries (baseline 10)",
+        "home: p95_ms 80.0 (baseline 50.0)",
+    ]
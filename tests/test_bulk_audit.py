@@ -0,0 +1,83 @@
+import datetime
+
+from crum import impersonate
+
+from common.models import Profile, User
+from events.models import Event
+from leads.models import Lead
+
+
+def test_create_batch_stamps_the_current_user(org, admin_profile, django_assert_num_queries):
+    user = admin_profile.user
+    leads = [Lead(title="Lead %s" % i, org=org) for i in range(5)]
+
+    with impersonate(user), django_assert_num_queries(1):
+        Lead.objects.create_batch(leads)
+
+    stored = Lead.objects.filter(org=org)
+    assert stored.count() == 5
+    assert set(stored.values_list("created_by", "updated_by")) == {(user.id, user.id)}
+    assert all(lead.created_at for lead in stored)
+
+
+def test_create_batch_keeps_explicit_creators_and_clears_anonymous(org, admin_profile):
+    importer = User.objects.create_user(email="importer@example.com", password="x")
+    Lead.objects.create_batch(
+        [Lead(title="Imported", org=org, created_by=importer), Lead(title="Anonymous", org=org)]
+    )
+
+    assert Lead.objects.get(title="Imported").created_by == importer
+    anonymous = Lead.objects.get(title="Anonymous")
+    assert anonymous.created_by is None and anonymous.updated_by is None
+
+
+def test_update_batch_stamps_updated_by_and_updated_at(org, admin_profile, django_assert_num_queries):
+    Lead.objects.create_batch([Lead(title="Lead %s" % i, org=org) for i in range(3)])
+    leads = list(Lead.objects.filter(org=org))
+    before = {lead.id: lead.updated_at for lead in leads}
+    for lead in leads:
+        lead.status = "assigned"
+
+    with django_assert_num_queries(1):
+        Lead.objects.update_batch(leads, ["status"], user=admin_profile.user)
+
+    for lead in Lead.objects.filter(org=org):
+        assert lead.status == "assigned"
+        assert lead.updated_by == admin_profile.user
+        assert lead.updated_at > before[lead.id]
+        assert lead.created_by is None
+
+
+def test_set_m2m_replaces_links_in_two_statements(org, admin_profile, django_assert_num_queries):
+    other = Profile.objects.create(
+        user=User.objects.create_user(email="other@example.com", password="x"), org=org
+    )
+    leads = Lead.objects.create_batch([Lead(title="Lead %s" % i, org=org) for i in range(4)])
+    leads[0].assigned_to.add(other)
+
+    with django_assert_num_queries(2):
+        Lead.objects.set_m2m("assigned_to", {lead: [admin_profile, admin_profile.id] for lead in leads})
+
+    for lead in leads:
+        assert list(lead.assigned_to.all()) == [admin_profile]
+
+
+def test_profile_audit_fields_get_the_profile(org, admin_profile):
+    events = Event.objects.create_batch(
+        [
+            Event(
+                name="Standup",
+                event_type="Non-Recurring",
+                start_date=datetime.date(2026, 5, 4),
+                end_date=datetime.date(2026, 5, 4),
+                start_time=datetime.time(9),
+                org=org,
+            )
+        ],
+        user=admin_profile.user,
+        profile=admin_profile,
+    )
+
+    event = Event.objects.get(id=events[0].id)
+    assert event.created_by == admin_profile
+    assert event.updated_by == admin_profile.user
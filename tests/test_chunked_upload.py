@@ -0,0 +1,148 @@
+import hashlib
+
+import pytest
+from django.urls import reverse
+
+from common import tasks, views
+from common.models import Attachments, Comment, CommentFiles, Document, FileBlob, Org
+from common.tasks import finalize_upload_session
+from leads.models import Lead
+
+CONTENT = b"0123456789abcdefghij-tail"  # 25 bytes, 3 chunks of 10
+
+
+@pytest.fixture
+def uploads(settings, tmp_path, monkeypatch):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.UPLOAD_CHUNK_SIZE = 10
+    monkeypatch.setattr(views.finalize_upload_session, "delay", finalize_upload_session)
+    return tmp_path
+
+
+@pytest.fixture
+def queued_thumbnails(monkeypatch):
+    queued = []
+    monkeypatch.setattr(tasks.generate_attachment_thumbnails, "delay", queued.append)
+    return queued
+
+
+@pytest.fixture
+def leads(org):
+    return [Lead.objects.create(title="Lead %s" % n, org=org) for n in range(2)]
+
+
+def start(api_client, target, target_id=None, size=len(CONTENT), name="Report.PDF"):
+    return api_client.post(
+        reverse("common_urls:common:upload-list"),
+        {"file_name": name, "size": size, "target": target, "target_id": target_id},
+        format="json",
+    )
+
+
+def put_chunk(api_client, upload_id, index, data, **headers):
+    return api_client.put(
+        reverse("common_urls:common:upload-chunk", args=[upload_id, index]),
+        data,
+        content_type="application/octet-stream",
+        **headers,
+    )
+
+
+def upload(api_client, target, target_id=None, content=CONTENT):
+    upload_id = start(api_client, target, target_id, size=len(content)).json()["id"]
+    for index in range(0, len(content), 10):
+        response = put_chunk(api_client, upload_id, index // 10, content[index : index + 10])
+        assert response.status_code == 200
+    response = api_client.post(reverse("common_urls:common:upload-complete", args=[upload_id]))
+    assert response.status_code == 202
+    return api_client.get(reverse("common_urls:common:upload-detail", args=[upload_id])).json()
+
+
+def test_chunks_resume_in_any_order_and_finalize(api_client, uploads, leads, queued_thumbnails):
+    response = start(api_client, "lead", str(leads[0].id))
+    assert response.status_code == 201
+    session = response.json()
+    assert (session["chunk_size"], session["chunk_count"]) == (10, 3)
+    detail_url = reverse("common_urls:common:upload-detail", args=[session["id"]])
+
+    assert put_chunk(api_client, session["id"], 2, CONTENT[20:]).status_code == 200
+    assert put_chunk(api_client, session["id"], 0, b"x" * 10).status_code == 200
+    assert api_client.get(detail_url).json()["missing_chunks"] == [1]
+    complete = api_client.post(reverse("common_urls:common:upload-complete", args=[session["id"]]))
+    assert complete.status_code == 400
+
+    # a resent chunk replaces the previous copy
+    assert put_chunk(api_client, session["id"], 0, CONTENT[:10]).status_code == 200
+    assert put_chunk(api_client, session["id"], 1, CONTENT[10:20]).status_code == 200
+    api_client.post(reverse("common_urls:common:upload-complete", args=[session["id"]]))
+
+    detail = api_client.get(detail_url).json()
+    assert detail["status"] == "complete"
+    assert detail["sha256"] == hashlib.sha256(CONTENT).hexdigest()
+    attachment = Attachments.objects.get(id=detail["result_id"])
+    assert attachment.lead_id == leads[0].id
+    assert attachment.created_by.email == "admin@test.com"
+    assert (attachment.file_name, attachment.category, attachment.size) == ("Report.PDF", "pdf", 25)
+    assert attachment.attachment.read() == CONTENT
+    assert queued_thumbnails == [str(attachment.id)]  # a PDF, queued for its preview
+    assert not [path for path in (uploads / "uploads").rglob("*") if path.is_file()]
+
+
+def test_identical_files_share_one_blob(
+    api_client, uploads, leads, admin_profile, queued_thumbnails, django_capture_on_commit_callbacks
+):
+    comment = Comment.objects.create(comment="see file", lead=leads[0], commented_by=admin_profile)
+    results = [
+        upload(api_client, "lead", str(leads[0].id)),
+        upload(api_client, "lead", str(leads[1].id)),
+        upload(api_client, "comment", str(comment.id)),
+        upload(api_client, "document"),
+    ]
+
+    blob = FileBlob.objects.get()
+    assert blob.ref_count == 4
+    assert len(list((uploads / "blobs").rglob("*.*"))) == 1
+    document = Document.objects.get(id=results[3]["result_id"])
+    assert (document.org_id, document.created_by_id) == (admin_profile.org_id, admin_profile.id)
+    assert CommentFiles.objects.get(comment=comment).comment_file.name == blob.file.name
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Lead.objects.filter(id=leads[0].id).delete()
+    blob.refresh_from_db()
+    assert blob.ref_count == 2  # the lead's attachment and comment went with it
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Attachments.objects.all().delete()
+        document.delete()
+    assert not FileBlob.objects.exists()
+    assert not list((uploads / "blobs").rglob("*.*"))
+
+
+def test_bad_chunks_and_targets_are_rejected(api_client, uploads, leads):
+    other_lead = Lead.objects.create(title="Elsewhere", org=Org.objects.create(name="Other"))
+    assert start(api_client, "lead", str(other_lead.id)).status_code == 400
+    assert start(api_client, "lead").status_code == 400
+
+    upload_id = start(api_client, "lead", str(leads[0].id)).json()["id"]
+    assert put_chunk(api_client, upload_id, 0, b"short").status_code == 400
+    assert put_chunk(api_client, upload_id, 0, b"x" * 11).status_code == 400
+    assert put_chunk(api_client, upload_id, 3, b"x" * 10).status_code == 400
+    response = put_chunk(
+        api_client, upload_id, 0, CONTENT[:10], HTTP_X_CHUNK_SHA256=hashlib.sha256(b"no").hexdigest()
+    )
+    assert response.status_code == 400
+    assert not FileBlob.objects.exists()
+
+
+def test_chunk_and_complete_routes_only_accept_their_method(api_client, uploads, leads):
+    upload_id = start(api_client, "lead", str(leads[0].id)).json()["id"]
+    chunk_url = reverse("common_urls:common:upload-chunk", args=[upload_id, 0])
+    complete_url = reverse("common_urls:common:upload-complete", args=[upload_id])
+
+    for method in ("get", "post", "delete"):
+        assert getattr(api_client, method)(chunk_url).status_code == 405
+    for method in ("get", "put", "delete"):
+        assert getattr(api_client, method)(complete_url).status_code == 405
+    # the session survived the DELETE on /complete/
+    detail = api_client.get(reverse("common_urls:common:upload-detail", args=[upload_id]))
+    assert detail.json()["missing_chunks"] == [0, 1, 2]
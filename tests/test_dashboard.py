@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import Account
+from common.models import Profile, User
+from leads.models import Lead
+from opportunity.models import Opportunity
+
+DASHBOARD_URL = reverse("common_urls:common:dashboard")
+
+
+def get_dashboard(client, **params):
+    response = client.get(DASHBOARD_URL, {"mode": "dashboard", **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_dashboard_aggregates_and_limits_recent_records(api_client, org):
+    Account.objects.create(name="ACME", status="open", org=org)
+    Account.objects.create(name="Old", status="close", org=org)
+    for i in range(4):
+        Lead.objects.create(
+            title="Lead %s" % i, status="assigned", org=org, opportunity_amount=10
+        )
+    Lead.objects.create(title="Closed", status="closed", org=org)
+    Opportunity.objects.create(name="Deal 1", stage="QUALIFICATION", amount=100, org=org)
+    Opportunity.objects.create(name="Deal 2", stage="QUALIFICATION", amount=50, org=org)
+    Opportunity.objects.create(name="Deal 3", stage="CLOSED WON", amount=25, org=org)
+
+    data = get_dashboard(api_client, top=2)
+    assert data["accounts_count"] == 1
+    assert data["leads_count"] == 4
+    assert data["opportunities_count"] == 3
+    assert Decimal(str(data["pipeline_amount"])) == 175
+    [group] = data["leads_by_status"]
+    assert (group["status"], group["count"], Decimal(str(group["amount"]))) == (
+        "assigned", 4, 40
+    )
+    stages = {group["stage"]: group["count"] for group in data["opportunities_by_stage"]}
+    assert stages == {"QUALIFICATION": 2, "CLOSED WON": 1}
+    assert [lead["title"] for lead in data["leads"]] == ["Lead 3", "Lead 2"]
+    assert len(data["opportunities"]) == 2
+
+
+def test_dashboard_is_cached_until_org_records_change(
+    api_client, org, django_assert_max_num_queries
+):
+    Lead.objects.create(title="First", status="assigned", org=org)
+    assert get_dashboard(api_client)["leads_count"] == 1
+
+    # only the JWT user lookup, the profile and the summary come from cache
+    with django_assert_max_num_queries(1):
+        assert get_dashboard(api_client)["leads_count"] == 1
+
+    Lead.objects.create(title="Second", status="assigned", org=org)
+    assert get_dashboard(api_client)["leads_count"] == 2
+
+
+def test_dashboard_of_users_only_counts_their_records(api_client, org, admin_profile):
+    user = User.objects.create(email="user@test.com")
+    member = Profile.objects.create(user=user, org=org, role="USER")
+    mine = Lead.objects.create(title="Mine", status="assigned", org=org)
+    mine.assigned_to.add(member)
+    Lead.objects.create(title="Other", status="assigned", org=org)
+
+    assert get_dashboard(api_client)["leads_count"] == 2
+
+    api_client.credentials(
+        HTTP_AUTHORIZATION="Bearer %s" % AccessToken.for_user(user), HTTP_ORG=str(org.id)
+    )
+    data = get_dashboard(api_client)
+    assert data["leads_count"] == 1
+    assert [lead["title"] for lead in data["leads"]] == ["Mine"]
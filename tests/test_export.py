@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from common.models import Profile, User
+from contacts.models import Contact
+from leads.models import Lead
+
+
+def export(client, entity, **params):
+    response = client.get(reverse("common_urls:common:export", args=[entity]), params)
+    assert response.status_code == 200
+    assert response.streaming
+    chunks = [chunk.decode() for chunk in response.streaming_content]
+    return response, chunks
+
+
+@pytest.fixture
+def leads(org):
+    leads = [Lead.objects.create(title="Lead %s" % n, org=org, status="assigned") for n in range(5)]
+    Lead.objects.create(title="Converted", org=org, status="converted")
+    return leads
+
+
+@pytest.fixture
+def member_client(org):
+    user = User.objects.create_user(email="member@test.com", password="testpass123")
+    profile = Profile.objects.create(user=user, org=org, role="USER")
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION="Bearer %s" % AccessToken.for_user(user), HTTP_ORG=str(org.id)
+    )
+    client.profile = profile
+    return client
+
+
+def test_leads_stream_as_csv_in_chunks(api_client, leads, settings):
+    settings.EXPORT_CHUNK_SIZE = 2
+
+    response, chunks = export(api_client, "leads")
+
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    assert response["Content-Disposition"].startswith('attachment; filename="leads-')
+    assert len(chunks) == 3
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    # newest first, converted leads are left out like in the list view
+    assert [row["title"] for row in rows] == ["Lead 4", "Lead 3", "Lead 2", "Lead 1", "Lead 0"]
+    assert rows[0]["id"] == str(leads[4].id)
+    assert rows[0]["phone"] == ""
+
+
+def test_members_export_what_they_can_list(member_client, org, admin_profile, leads):
+    leads[1].assigned_to.add(member_client.profile, admin_profile)
+    leads[3].assigned_to.add(member_client.profile)
+
+    _, chunks = export(member_client, "leads", output="ndjson")
+
+    rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert [row["title"] for row in rows] == ["Lead 3", "Lead 1"]
+
+
+def test_contacts_export_as_ndjson(api_client, org):
+    Contact.objects.create(
+        first_name="Ada", last_name="Lovelace", primary_email="ada@example.com",
+        mobile_number="+14155550101", org=org,
+    )
+
+    response, chunks = export(api_client, "contacts", output="ndjson")
+
+    assert response["Content-Type"] == "application/x-ndjson"
+    (row,) = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert row["primary_email"] == "ada@example.com"
+    assert row["mobile_number"] == "+14155550101"
+    assert row["do_not_call"] is False
+    assert "T" in row["created_at"]  # ISO 8601
+
+
+def test_unknown_entities_and_formats_are_rejected(api_client):
+    assert api_client.get(reverse("common_urls:common:export", args=["users"])).status_code == 404
+    response = api_client.get(
+        reverse("common_urls:common:export", args=["leads"]), {"output": "xlsx"}
+    )
+    assert response.status_code == 400
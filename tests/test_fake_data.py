@@ -0,0 +1,78 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from cases.models import Case
+from common.fake_data import OrgSeeder, seed_shard, split_volumes
+from common.models import Attachments, Comment, Org, Profile
+from events.models import Event
+from invoices.models import Invoice
+from leads.models import Lead
+from opportunity.models import Opportunity
+from tasks.models import Task
+
+VOLUMES = {
+    "users": 3,
+    "teams": 2,
+    "tags": 4,
+    "accounts": 4,
+    "contacts": 6,
+    "leads": 9,
+    "opportunities": 5,
+    "cases": 3,
+    "tasks": 4,
+    "events": 3,
+    "invoices": 2,
+    "comments": 16,
+    "attachments": 8,
+}
+
+
+def test_split_volumes_covers_every_record_once():
+    plans = split_volumes({"users": 3, "leads": 10, "cases": 1}, 3)
+
+    assert [part for part, _ in plans] == [
+        {"leads": 4, "cases": 1},
+        {"leads": 3, "cases": 0},
+        {"leads": 3, "cases": 0},
+    ]
+    assert [offsets for _, offsets in plans] == [
+        {},
+        {"leads": 4, "cases": 1},
+        {"leads": 7, "cases": 1},
+    ]
+
+
+def test_shards_extend_the_base_org(db):
+    seeder = OrgSeeder("sharded", VOLUMES)
+    org = seeder.seed_base()
+    for part, offsets in split_volumes(VOLUMES, 2):
+        seed_shard(org.id, part, offsets, batch_size=4)
+
+    leads = Lead.objects.filter(org=org)
+    assert leads.count() == 9
+    assert leads.values("email").distinct().count() == 9
+    assert Opportunity.objects.filter(org=org).count() == 5
+    assert Case.objects.filter(org=org).count() == 3
+    assert Task.objects.filter(org=org).count() == 4
+    assert Comment.objects.count() == 16
+    assert Attachments.objects.count() == 8
+    profiles = set(Profile.objects.filter(org=org).values_list("id", flat=True))
+    event = Event.objects.filter(org=org).first()
+    assert event.created_by_id in profiles
+    assert set(event.assigned_to.values_list("id", flat=True)) <= profiles
+    invoice = Invoice.objects.filter(org=org).first()
+    assert invoice.assigned_to.get() == invoice.created_by
+    assert invoice.from_address_id is not None
+
+
+def test_generate_fake_data_command(db):
+    out = StringIO()
+
+    call_command(
+        "generate_fake_data", orgs=2, workers=1, shards=2, stdout=out, stderr=StringIO(), **VOLUMES
+    )
+
+    assert Org.objects.filter(name__startswith="loadtest-").count() == 2
+    assert Lead.objects.count() == 18
+    assert "lead " in out.getvalue()
@@ -0,0 +1,70 @@
+from io import StringIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+
+from common.file_types import FILE_CATEGORIES, file_category, file_extension
+from common.models import Attachments, Document
+from common.serializer import AttachmentsSerializer
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def test_category_map_keeps_the_old_precedence():
+    assert FILE_CATEGORIES["png"] == "image"
+    assert FILE_CATEGORIES["mp3"] == "audio"
+    assert file_category("XLSX") == "sheet"
+    # the old list held "7Z" and never matched the lowercased extension
+    assert file_category("7z") == "zip"
+    assert file_category("unknown") == "file"
+    assert file_extension("attachments/2026/05/Report.Final.PDF") == "pdf"
+    assert file_extension("README") == ""
+
+
+def test_upload_stores_the_metadata(media, db):
+    attachment = Attachments.objects.create(
+        file_name="photo",
+        attachment=SimpleUploadedFile("photo.JPG", b"x" * 2048, content_type="image/jpeg"),
+    )
+
+    attachment.refresh_from_db()
+    assert (attachment.extension, attachment.category) == ("jpg", "image")
+    assert attachment.mime_type == "image/jpeg"
+    assert attachment.size == 2048
+    assert attachment.file_type() == ("image", "fa fa-file-image")
+    assert attachment.get_file_type_display() == "fa fa-file-image"
+    assert AttachmentsSerializer(attachment).data["category"] == "image"
+    assert list(Attachments.objects.filter(category="image")) == [attachment]
+
+
+def test_backfill_fills_rows_from_before_the_columns(media, db):
+    attachment = Attachments.objects.create(
+        file_name="notes", attachment=SimpleUploadedFile("notes.txt", b"hello")
+    )
+    document = Document.objects.create(
+        title="Deck", document_file=SimpleUploadedFile("deck.pdf", b"%PDF")
+    )
+    Attachments.objects.update(extension="", category="", mime_type="", size=None)
+    Document.objects.update(extension="", category="", mime_type="", size=None)
+    attachment.refresh_from_db()
+    # not backfilled yet: still typed from the file name
+    assert attachment.file_type() == ("text", "fa fa-file-alt")
+
+    out = StringIO()
+    call_command("rebuild_file_metadata", stdout=out)
+
+    assert "attachments: updated 1 rows" in out.getvalue()
+    attachment.refresh_from_db()
+    document.refresh_from_db()
+    assert (attachment.category, attachment.mime_type, attachment.size) == (
+        "text", "text/plain", 5
+    )
+    assert (document.category, document.size) == ("pdf", 4)
+
+    call_command("rebuild_file_metadata", stdout=out)
+    assert "attachments: updated 0 rows" in out.getvalue()
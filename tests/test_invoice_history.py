@@ -0,0 +1,89 @@
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from invoices.models import Invoice, InvoiceHistory
+from invoices.serializer import InvoiceHistorySerializer
+from invoices.tasks import create_invoice_history
+
+
+@pytest.fixture
+def invoice(org, admin_profile):
+    invoice = Invoice.objects.create(
+        invoice_title="Consulting",
+        name="Acme",
+        email="billing@acme.test",
+        rate=Decimal("10.00"),
+        org=org,
+    )
+    invoice.assigned_to.add(admin_profile.user)
+    return invoice
+
+
+def edit(invoice, count, user=None):
+    for _ in range(count):
+        invoice.quantity += 1
+        invoice.save()
+        InvoiceHistory.objects.record(invoice, updated_by=user)
+
+
+def test_versions_store_only_changed_fields_between_snapshots(invoice, admin_profile):
+    first = InvoiceHistory.objects.record(invoice, updated_by=admin_profile.user)
+    invoice.status = "Sent"
+    invoice.rate = Decimal("12.50")
+    invoice.save()
+    second = InvoiceHistory.objects.record(invoice)
+
+    assert first.version == 1 and first.is_snapshot
+    assert first.details == "Invoice Created."
+    assert first.data["assigned_to"] == [str(admin_profile.user_id)]
+    assert not second.is_snapshot
+    assert second.data == {"rate": "12.50", "status": "Sent"}
+    assert second.details == "Rate and Status have changed."
+
+
+def test_any_version_is_rebuilt_from_the_nearest_snapshot(invoice, monkeypatch):
+    monkeypatch.setattr(InvoiceHistory, "SNAPSHOT_INTERVAL", 5)
+    InvoiceHistory.objects.record(invoice)
+    edit(invoice, 11)
+
+    snapshots = InvoiceHistory.objects.filter(invoice=invoice, is_snapshot=True)
+    assert sorted(snapshots.values_list("version", flat=True)) == [1, 6, 11]
+    states = InvoiceHistory.objects.rebuild(invoice.id, range(1, 13))
+    assert [states[version]["quantity"] for version in range(1, 13)] == list(range(12))
+    assert states[12]["invoice_title"] == "Consulting"
+
+    with CaptureQueriesContext(connection) as early:
+        InvoiceHistory.objects.rebuild(invoice.id, [2])
+    with CaptureQueriesContext(connection) as late:
+        InvoiceHistory.objects.rebuild(invoice.id, [12])
+    assert len(early) == len(late) == 2
+
+
+def test_create_invoice_history_task_names_the_given_fields(invoice, admin_profile):
+    create_invoice_history(invoice.id, admin_profile.user_id, [])
+    create_invoice_history(invoice.id, admin_profile.user_id, ["due_date", "name"])
+
+    latest = InvoiceHistory.objects.filter(invoice=invoice).first()
+    assert latest.version == 2
+    assert latest.details == "Due Date and Name have changed."
+    assert latest.updated_by == admin_profile.user
+
+
+def test_history_is_paged_by_version(invoice, admin_profile):
+    InvoiceHistory.objects.record(invoice)
+    edit(invoice, 4, admin_profile.user)
+
+    rows, history_next = InvoiceHistory.objects.page(invoice, 2)
+    assert [row.version for row in rows] == [5, 4]
+    assert history_next == 4
+
+    rows, history_next = InvoiceHistory.objects.page(invoice, 2, before=2)
+    assert [row.version for row in rows] == [1]
+    assert history_next is None
+
+    data = InvoiceHistorySerializer(rows, many=True).data[0]
+    assert data["version"] == 1
+    assert data["quantity"] == 0
+    assert data["email"] == "billing@acme.test"
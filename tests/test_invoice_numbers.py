@@ -0,0 +1,114 @@
+import datetime
+import importlib
+import threading
+
+import pytest
+from django.apps import apps
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from invoices.models import Invoice, InvoiceSequence, assign_invoice_numbers
+
+DAY = datetime.date(2026, 3, 1)
+
+
+def make_invoice(org, **kwargs):
+    return Invoice(
+        invoice_title="Consulting", name="Acme", email="billing@acme.test", org=org, **kwargs
+    )
+
+
+def test_numbers_are_sequential_per_org(org):
+    other = type(org).objects.create(name="Other Org")
+
+    assert InvoiceSequence.allocate(org.id, day=DAY) == ["010320260001"]
+    assert InvoiceSequence.allocate(org.id, count=3, day=DAY) == [
+        "010320260002",
+        "010320260003",
+        "010320260004",
+    ]
+    assert InvoiceSequence.allocate(other.id, day=DAY) == ["010320260001"]
+    assert InvoiceSequence.allocate(None, day=DAY) == ["010320260001"]
+
+
+def test_save_numbers_new_invoices_only(org):
+    invoice = make_invoice(org)
+    invoice.save()
+    kept = make_invoice(org, invoice_number="INV-7")
+    kept.save()
+
+    today = datetime.date.today().strftime("%d%m%Y")
+    assert invoice.invoice_number == today + "0001"
+    assert kept.invoice_number == "INV-7"
+
+
+def test_allocation_cost_does_not_grow_with_the_sequence(org):
+    InvoiceSequence.allocate(org.id, day=DAY)
+    with CaptureQueriesContext(connection) as early:
+        InvoiceSequence.allocate(org.id, day=DAY)
+    InvoiceSequence.allocate(org.id, count=500, day=DAY)
+    with CaptureQueriesContext(connection) as late:
+        assert InvoiceSequence.allocate(org.id, day=DAY) == ["010320260503"]
+
+    assert len(late) == len(early)
+
+
+def test_assign_invoice_numbers_allocates_one_block_per_org(org):
+    other = type(org).objects.create(name="Other Org")
+    invoices = [make_invoice(org), make_invoice(other), make_invoice(org)]
+
+    assign_invoice_numbers(invoices)
+    Invoice.objects.bulk_create(invoices)
+
+    today = datetime.date.today().strftime("%d%m%Y")
+    assert [invoice.invoice_number for invoice in invoices] == [
+        today + "0001",
+        today + "0001",
+        today + "0002",
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.skipif(
+    not connection.features.has_select_for_update, reason="needs row locking, e.g. Postgres"
+)
+def test_concurrent_allocations_never_collide(org):
+    numbers = []
+    errors = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        try:
+            barrier.wait()
+            for _ in range(10):
+                numbers.extend(InvoiceSequence.allocate(org.id, count=2, day=DAY))
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(numbers) == len(set(numbers)) == 160
+    assert InvoiceSequence.objects.get(org=org, day=DAY).last_value == 160
+
+
+def test_migration_continues_todays_numbers_of_the_old_generator(org):
+    other = type(org).objects.create(name="Other Org")
+    today = datetime.date.today().strftime("%d%m%Y")
+    for number in ("0001", "0003"):
+        make_invoice(org, invoice_number=today + number).save()
+    make_invoice(other, invoice_number=today + "0002").save()
+    make_invoice(other, invoice_number="INV-7").save()
+    InvoiceSequence.objects.all().delete()
+
+    migration = importlib.import_module("invoices.migrations.0006_seed_invoice_sequences")
+    migration.seed_todays_sequences(apps, None)
+
+    assert InvoiceSequence.allocate(org.id) == [today + "0004"]
+    assert InvoiceSequence.allocate(other.id) == [today + "0003"]
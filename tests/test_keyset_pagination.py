@@ -0,0 +1,106 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from common.models import Profile, User
+from contacts.models import Contact
+from leads.models import Lead
+
+CONTACTS_URL = "/api/contacts/"
+LEADS_URL = reverse("common_urls:api_leads:lead-list")
+
+
+def make_contacts(org, count):
+    contacts = [
+        Contact.objects.create(
+            first_name="Contact %s" % i, last_name="Doe",
+            primary_email="contact%s@test.com" % i, org=org,
+        )
+        for i in range(count)
+    ]
+    # identical timestamps force the id tie-breaker to be used
+    Contact.objects.filter(id__in=[c.id for c in contacts[:5]]).update(
+        created_at=timezone.now()
+    )
+    return contacts
+
+
+def walk(client, url, list_key, cursor_param="cursor", **params):
+    seen, cursor = [], None
+    while True:
+        query = dict(params, pagination="cursor", limit=4)
+        if cursor:
+            query[cursor_param] = cursor
+        data = client.get(url, query).json()
+        page, cursor = list_key(data)
+        seen.extend(item["id"] for item in page)
+        if cursor is None:
+            return seen
+
+
+def test_cursor_walks_every_contact_once(api_client, org):
+    contacts = make_contacts(org, 13)
+    seen = walk(
+        api_client, CONTACTS_URL, lambda d: (d["contact_obj_list"], d["offset"])
+    )
+    expected = Contact.objects.filter(org=org).order_by("-created_at", "-id")
+    assert seen == [str(pk) for pk in expected.values_list("id", flat=True)]
+    assert len(set(seen)) == len(contacts)
+
+
+def test_offset_mode_is_unchanged(api_client, org):
+    make_contacts(org, 13)
+    data = api_client.get(CONTACTS_URL, {"limit": 10}).json()
+    assert data["contacts_count"] == 13
+    assert data["offset"] == 10
+    data = api_client.get(CONTACTS_URL, {"limit": 10, "offset": 10}).json()
+    assert len(data["contact_obj_list"]) == 3
+    assert data["offset"] is None
+
+
+def test_open_and_closed_leads_have_separate_cursors(api_client, org):
+    for i in range(6):
+        Lead.objects.create(title="open %s" % i, org=org, status="assigned")
+        Lead.objects.create(title="closed %s" % i, org=org, status="closed")
+
+    open_ids = walk(
+        api_client, LEADS_URL,
+        lambda d: (d["open_leads"]["open_leads"], d["open_leads"]["offset"]),
+        cursor_param="open_cursor", include_metadata="false",
+    )
+    closed_ids = walk(
+        api_client, LEADS_URL,
+        lambda d: (d["close_leads"]["close_leads"], d["close_leads"]["offset"]),
+        cursor_param="close_cursor", include_metadata="false",
+    )
+    assert len(set(open_ids)) == 6
+    assert len(set(closed_ids)) == 6
+    assert not set(open_ids) & set(closed_ids)
+
+
+def test_invalid_cursor_is_rejected(api_client, org):
+    response = api_client.get(CONTACTS_URL, {"cursor": "not-a-cursor"})
+    assert response.status_code == 404
+
+
+def test_lead_counts_match_the_distinct_pages(org, admin_profile):
+    user = User.objects.create_user(email="member@test.com", password="testpass123")
+    member = Profile.objects.create(user=user, org=org, role="USER")
+    lead = Lead.objects.create(title="shared", org=org, status="assigned")
+    lead.assigned_to.add(member, admin_profile)
+    Lead.objects.filter(id=lead.id).update(created_by=user)
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION="Bearer %s" % AccessToken.for_user(user), HTTP_ORG=str(org.id)
+    )
+
+    data = client.get(LEADS_URL, {"include_metadata": "false"}).json()
+    assert data["open_leads"]["leads_count"] == len(data["open_leads"]["open_leads"]) == 1
+
+    with CaptureQueriesContext(connection) as ctx:
+        data = client.get(LEADS_URL, {"pagination": "cursor", "include_metadata": "false"}).json()
+    assert data["open_leads"]["leads_count"] is None
+    assert not [q for q in ctx.captured_queries if "COUNT(" in q["sql"].upper()]
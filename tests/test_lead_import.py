@@ -0,0 +1,127 @@
+import datetime
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+
+from leads import views
+from leads.importer import LeadImporter, fail_stalled_imports
+from leads.models import Lead, LeadImport
+from leads.tasks import import_leads
+
+UPLOAD_URL = reverse("common_urls:api_leads:lead-upload")
+
+CSV = (
+    "Title,First Name,Email,Country,Status\n"
+    "Existing,Old,old@example.com,IN,assigned\n"
+    "Lead A,Ann,ann@example.com,in,assigned\n"
+    "Lead B,Bob,not-an-email,IN,\n"
+    "Lead C,Cid,ann@example.com,,\n"
+    ",,,,\n"
+    "Lead D,Dee,dee@example.com,India,closed\n"
+    "Lead E,Eve,eve@example.com,XX,\n"
+)
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+def test_importer_dedupes_validates_and_reports_progress(org, admin_profile):
+    Lead.objects.create(title="Existing", org=org)
+    lead_import = LeadImport.objects.create(org=org, file_name="leads.csv")
+    lead_import.file.save("leads.csv", ContentFile(CSV.encode()))
+
+    LeadImporter(lead_import, chunk_size=2).run()
+
+    lead_import.refresh_from_db()
+    assert lead_import.status == "completed"
+    assert lead_import.total_rows == 6
+    assert lead_import.created_count == 2
+    assert lead_import.duplicate_count == 2
+    assert lead_import.error_count == 2
+    assert lead_import.rows_per_second is not None
+    leads = Lead.objects.filter(org=org).exclude(title="Existing")
+    assert {(lead.title, lead.country) for lead in leads} == {("Lead A", "IN"), ("Lead D", "IN")}
+    errors = list(lead_import.row_errors.values_list("row_number", "errors"))
+    assert errors == [
+        (4, {"email": "Enter a valid email address."}),
+        (8, {"country": "Unknown country."}),
+    ]
+
+
+def test_imported_leads_keep_the_uploader_without_a_current_user(org, admin_profile):
+    lead_import = LeadImport.objects.create(org=org, file_name="leads.csv")
+    lead_import.file.save("leads.csv", ContentFile(b"title\nLead A\n"))
+    # uploaded through the API, run by a worker with no request
+    LeadImport.objects.filter(pk=lead_import.pk).update(created_by=admin_profile.user)
+
+    LeadImporter(LeadImport.objects.get(pk=lead_import.pk)).run()
+
+    lead = Lead.objects.get(org=org, title="Lead A")
+    assert lead.created_by_id == admin_profile.user_id
+    lead_import = LeadImport.objects.get(pk=lead_import.pk)
+    assert (lead_import.status, lead_import.created_by_id) == ("completed", admin_profile.user_id)
+
+
+def test_import_fails_on_missing_headers(org):
+    lead_import = LeadImport.objects.create(org=org, file_name="leads.csv")
+    lead_import.file.save("leads.csv", ContentFile(b"name,email\nA,a@example.com\n"))
+
+    LeadImporter(lead_import).run()
+
+    assert lead_import.status == "failed"
+    assert lead_import.message == "Missing headers: title"
+
+
+def test_upload_queues_import_and_exposes_progress(api_client, org, monkeypatch):
+    monkeypatch.setattr(views.import_leads, "delay", import_leads)
+    upload = SimpleUploadedFile("leads.csv", CSV.encode(), content_type="text/csv")
+
+    response = api_client.post(UPLOAD_URL, {"leads_file": upload}, format="multipart")
+    assert response.status_code == 202
+    import_id = response.json()["import"]["id"]
+
+    detail = api_client.get(
+        reverse("common_urls:api_leads:lead-import-detail", args=[import_id])
+    ).json()
+    assert detail["status"] == "completed"
+    assert detail["created_count"] == 3
+    assert detail["processed_rows"] == 6
+
+    errors = api_client.get(
+        reverse("common_urls:api_leads:lead-import-errors", args=[import_id]),
+        {"limit": 1},
+    ).json()
+    assert errors["count"] == 2
+    assert errors["results"][0]["row_number"] == 4
+
+    imports = api_client.get(reverse("common_urls:api_leads:lead-import-list")).json()
+    assert [item["id"] for item in imports["imports"]] == [import_id]
+
+
+def test_upload_rejects_missing_headers(api_client):
+    upload = SimpleUploadedFile("leads.csv", b"name\nA\n", content_type="text/csv")
+    response = api_client.post(UPLOAD_URL, {"leads_file": upload}, format="multipart")
+    assert response.status_code == 400
+
+
+def test_stalled_imports_are_failed(org, settings):
+    settings.LEAD_IMPORT_STALL_TIMEOUT = 600
+    stalled = LeadImport.objects.create(org=org, file_name="a.csv", status="processing")
+    running = LeadImport.objects.create(org=org, file_name="b.csv", status="processing")
+    pending = LeadImport.objects.create(org=org, file_name="c.csv")
+    LeadImport.objects.filter(id__in=[stalled.id, pending.id]).update(
+        updated_at=timezone.now() - datetime.timedelta(hours=1)
+    )
+
+    assert fail_stalled_imports() == 1
+
+    stalled.refresh_from_db()
+    assert stalled.status == "failed" and stalled.finished_at is not None
+    assert "upload the file again" in stalled.message
+    assert LeadImport.objects.get(id=running.id).status == "processing"
+    assert LeadImport.objects.get(id=pending.id).status == "pending"
@@ -0,0 +1,72 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import Tags
+from common.models import Attachments, Comment
+from contacts.models import Contact
+from leads.models import Lead
+from teams.models import Teams
+
+LIST_URL = reverse("common_urls:api_leads:lead-list")
+
+
+def make_leads(org, profile, count):
+    contact = Contact.objects.create(
+        first_name="Jane", last_name="Doe", primary_email="jane@example.com", org=org
+    )
+    team = Teams.objects.create(name="Sales", description="", org=org)
+    team.users.add(profile)
+    tag = Tags.objects.create(name="hot")
+    for i in range(count):
+        lead = Lead.objects.create(title="Lead %s" % i, org=org, country="IN")
+        lead.contacts.add(contact)
+        lead.assigned_to.add(profile)
+        lead.teams.add(team)
+        lead.tags.add(tag)
+        Attachments.objects.create(
+            lead=lead, file_name="brief.pdf", attachment="attachments/brief.pdf"
+        )
+        Comment.objects.create(lead=lead, comment="call back", commented_by=profile)
+
+
+def count_queries(client, limit):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(
+            LIST_URL, {"flat": "true", "include_metadata": "false", "limit": limit}
+        )
+    assert response.status_code == 200
+    return len(ctx), response.json()
+
+
+def test_flat_list_side_loads_related_objects(api_client, org, admin_profile):
+    make_leads(org, admin_profile, 3)
+
+    data = api_client.get(LIST_URL, {"flat": "true", "include_metadata": "false"}).json()
+    leads = data["open_leads"]["open_leads"]
+    assert len(leads) == 3
+    lookups = data["lookups"]
+    assert len(lookups["contacts"]) == 1
+    assert len(lookups["teams"]) == 1
+    assert len(lookups["tags"]) == 1
+    assert len(lookups["attachments"]) == 3
+    assert len(lookups["comments"]) == 3
+    for lead in leads:
+        assert lead["country"] == "India"
+        assert str(lead["contacts"][0]) in lookups["contacts"]
+        assert str(lead["assigned_to"][0]) in lookups["profiles"]
+        assert len(lead["lead_comments"]) == 1
+    profile = lookups["profiles"][str(admin_profile.id)]
+    assert profile["user_details"]["email"] == "admin@test.com"
+
+
+def test_flat_list_query_count_does_not_grow_with_page_size(api_client, org, admin_profile):
+    make_leads(org, admin_profile, 12)
+    # warm the profile cache so both requests take the same path
+    count_queries(api_client, 1)
+
+    small, small_data = count_queries(api_client, 2)
+    large, large_data = count_queries(api_client, 10)
+    assert len(small_data["open_leads"]["open_leads"]) == 2
+    assert len(large_data["open_leads"]["open_leads"]) == 10
+    assert small == large
@@ -0,0 +1,61 @@
+from django.urls import reverse
+
+from accounts.models import Tags
+from contacts.models import Contact
+from leads.models import Company, Lead
+
+LIST_URL = reverse("common_urls:api_leads:lead-list")
+METADATA_URL = reverse("common_urls:api_leads:lead-metadata")
+
+
+def test_list_without_metadata_returns_only_leads(api_client, org):
+    Lead.objects.create(title="Lead 1", org=org, status="assigned")
+    Company.objects.create(name="ACME", org=org)
+
+    data = api_client.get(LIST_URL, {"include_metadata": "false"}).json()
+    assert data["open_leads"]["leads_count"] == 1
+    assert "metadata_etag" in data
+    for key in ("contacts", "companies", "tags", "users", "countries", "industries"):
+        assert key not in data
+
+    full = api_client.get(LIST_URL).json()
+    assert full["companies"][0]["name"] == "ACME"
+    assert full["metadata_etag"] == data["metadata_etag"]
+
+
+def test_metadata_is_conditional_on_etag(api_client, org):
+    response = api_client.get(METADATA_URL)
+    assert response.status_code == 200
+    etag = response["ETag"]
+
+    response = api_client.get(METADATA_URL, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    Company.objects.create(name="New Co", org=org)
+    response = api_client.get(METADATA_URL, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert [c["name"] for c in response.json()["companies"]] == ["New Co"]
+
+
+def test_metadata_tags_are_scoped_to_org_leads(api_client, org):
+    lead = Lead.objects.create(title="Tagged", org=org)
+    etag = api_client.get(METADATA_URL)["ETag"]
+    Tags.objects.create(name="unused")
+
+    response = api_client.get(METADATA_URL, HTTP_IF_NONE_MATCH=etag)
+    assert response.json()["tags"] == []
+
+    lead.tags.add(Tags.objects.create(name="hot"))
+    tags = api_client.get(METADATA_URL).json()["tags"]
+    assert [tag["name"] for tag in tags] == ["hot"]
+
+
+def test_metadata_reflects_new_contacts(api_client, org):
+    etag = api_client.get(METADATA_URL)["ETag"]
+    Contact.objects.create(
+        first_name="Jane", last_name="Doe", primary_email="jane@test.com", org=org
+    )
+    response = api_client.get(METADATA_URL, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.json()["contacts"][0]["first_name"] == "Jane"
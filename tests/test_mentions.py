@@ -0,0 +1,82 @@
+from django.core import mail
+from django.urls import reverse
+
+from common.mentions import parse_mentions, resolve_mentions
+from common.models import Comment, CommentMention, Org, Profile, User
+from common.tasks import send_email_user_mentions
+
+MENTIONS_URL = reverse("common_urls:common:mentions")
+
+
+def member(org, email, **kwargs):
+    user = User.objects.create_user(email=email, password="testpass123")
+    return Profile.objects.create(user=user, org=org, **kwargs)
+
+
+def test_parse_mentions_finds_handles_and_emails():
+    text = "ping @Jane, @bob@example.com and @jane. not a@b or @@"
+
+    assert parse_mentions(text) == ["jane", "bob@example.com"]
+
+
+def test_resolves_every_mention_in_one_query(org, django_assert_num_queries):
+    jane = member(org, "jane@example.com")
+    bob = member(org, "bob@example.com")
+    member(org, "max@example.com")
+    member(org, "max@other.com")
+    member(org, "ann@example.com", is_active=False)
+    member(Org.objects.create(name="Other Org"), "eve@example.com")
+
+    with django_assert_num_queries(1):
+        profiles = resolve_mentions(
+            ["jane", "bob@example.com", "max", "ann", "eve", "nobody"], org.id
+        )
+
+    assert profiles == [jane, bob]
+
+
+def test_comment_saves_keep_the_mention_index_current(admin_profile):
+    jane = member(admin_profile.org, "jane@example.com")
+    bob = member(admin_profile.org, "bob@example.com")
+    comment = Comment.objects.create(comment="@jane @bob look", commented_by=admin_profile)
+
+    assert set(comment.mentions.values_list("profile", flat=True)) == {jane.id, bob.id}
+    assert CommentMention.objects.get(profile=jane).created_at == comment.created_at
+
+    comment.comment = "only @bob"
+    comment.save()
+    assert list(comment.mentions.values_list("profile", flat=True)) == [bob.id]
+
+    comment.comment = "nobody"
+    comment.save()
+    assert not comment.mentions.exists()
+
+
+def test_mention_emails_go_out_in_one_batch(admin_profile, settings):
+    settings.NOTIFICATION_BATCH_SIZE = 10
+    member(admin_profile.org, "jane@example.com")
+    member(admin_profile.org, "bob@example.com")
+    comment = Comment.objects.create(comment="@jane @bob look", commented_by=admin_profile)
+
+    stats = send_email_user_mentions(comment.id, "leads")
+
+    assert stats["sent"] == 2 and len(stats["batches"]) == 1
+    assert sorted(m.to[0] for m in mail.outbox) == ["bob@example.com", "jane@example.com"]
+    assert mail.outbox[0].subject == "New comment on Lead. "
+
+
+def test_mentions_endpoint_lists_comments_mentioning_me(api_client, admin_profile):
+    other = member(admin_profile.org, "jane@example.com")
+    first = Comment.objects.create(comment="@admin hello", commented_by=other)
+    Comment.objects.create(comment="@jane hello", commented_by=admin_profile)
+    second = Comment.objects.create(comment="again @admin", commented_by=other)
+
+    response = api_client.get(MENTIONS_URL, {"limit": 1})
+    assert response.status_code == 200
+    body = response.json()
+    assert [row["id"] for row in body["results"]] == [str(second.id)]
+    assert body["results"][0]["commented_by"] == "jane@example.com"
+
+    response = api_client.get(MENTIONS_URL, {"limit": 1, "offset": body["offset"]})
+    assert [row["id"] for row in response.json()["results"]] == [str(first.id)]
+    assert response.json()["offset"] is None
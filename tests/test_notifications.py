@@ -0,0 +1,54 @@
+from common.models import Profile, User
+from common.notifications import profile_recipients, send_notification
+from contacts.models import Contact
+from contacts.tasks import send_email_to_assigned_user
+
+
+def make_profiles(org, count):
+    return [
+        Profile.objects.create(
+            user=User.objects.create(email="user%s@test.com" % i), org=org, role="USER"
+        )
+        for i in range(count)
+    ]
+
+
+def test_recipients_are_resolved_in_one_query(org, django_assert_num_queries):
+    profiles = make_profiles(org, 3)
+    with django_assert_num_queries(1):
+        users = profile_recipients([profile.id for profile in profiles])
+        assert sorted(user.email for user in users) == [
+            "user0@test.com", "user1@test.com", "user2@test.com"
+        ]
+
+
+def test_assignment_mail_is_sent_in_batches(org, settings, mailoutbox):
+    settings.NOTIFICATION_BATCH_SIZE = 2
+    profiles = make_profiles(org, 3)
+    contact = Contact.objects.create(
+        first_name="Jane", last_name="Doe", primary_email="jane@example.com", org=org
+    )
+
+    stats = send_email_to_assigned_user(
+        [profile.id for profile in profiles] + [profiles[0].id], contact.id
+    )
+
+    assert stats["recipients"] == stats["sent"] == 3
+    assert [batch["size"] for batch in stats["batches"]] == [2, 1]
+    assert sorted(mail.to[0] for mail in mailoutbox) == [
+        "user0@test.com", "user1@test.com", "user2@test.com"
+    ]
+    assert "Jane" in mailoutbox[0].body
+
+
+def test_identical_personal_context_is_rendered_once(org, mailoutbox):
+    users = [profile.user for profile in make_profiles(org, 3)]
+    stats = send_notification(
+        "Subject",
+        "assigned_to_email_template.html",
+        {"invoice_title": "INV-1"},
+        users,
+        personalize=lambda user: {"user": "team"},
+    )
+    assert stats["renders"] == 1
+    assert len(mailoutbox) == 3
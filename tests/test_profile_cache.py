@@ -0,0 +1,108 @@
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.test import RequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from common.cache import profile_cache
+from common.middleware.get_company import GetProfileAndOrg
+from common.models import Profile
+
+
+@pytest.fixture
+def member(admin_profile):
+    return admin_profile.org, admin_profile.user, admin_profile
+
+
+def resolve(**headers):
+    request = RequestFactory().get("/api/leads/", **headers)
+    GetProfileAndOrg(lambda r: None).process_request(request)
+    return request
+
+
+def auth_headers(user, org):
+    return {
+        "HTTP_AUTHORIZATION": "Bearer %s" % AccessToken.for_user(user),
+        "HTTP_ORG": str(org.id),
+    }
+
+
+def test_profile_is_served_from_cache(member, django_assert_num_queries):
+    org, user, profile = member
+    assert resolve(**auth_headers(user, org)).profile.id == profile.id
+
+    with django_assert_num_queries(0):
+        request = resolve(**auth_headers(user, org))
+    assert request.profile.id == profile.id
+    assert request.profile.org.name == "Test Org"
+    assert not request.profile._state.adding
+
+    # one profile and one user lookup per request
+    stats = profile_cache.stats()
+    assert stats["misses"] == 2
+    assert stats["local_hits"] == 2
+
+
+def test_profile_save_invalidates_entry(member):
+    org, user, profile = member
+    resolve(**auth_headers(user, org))
+
+    profile.is_active = False
+    profile.save()
+    with pytest.raises(PermissionDenied):
+        resolve(**auth_headers(user, org))
+
+
+def test_org_save_refreshes_cached_org(member):
+    org, user, profile = member
+    resolve(**auth_headers(user, org))
+
+    org.name = "Renamed Org"
+    org.save()
+    assert resolve(**auth_headers(user, org)).profile.org.name == "Renamed Org"
+
+
+def test_shared_entry_survives_local_eviction(member, django_assert_num_queries):
+    org, user, profile = member
+    resolve(**auth_headers(user, org))
+    profile_cache.local.clear()
+
+    with django_assert_num_queries(0):
+        assert resolve(**auth_headers(user, org)).profile.id == profile.id
+    assert profile_cache.stats()["shared_hits"] == 2
+
+
+def test_tampered_shared_entry_is_ignored(member):
+    org, user, profile = member
+    resolve(**auth_headers(user, org))
+    profile_cache.local.clear()
+    key = "crm:profile:user:%s:%s" % (user.id, org.id)
+    cache.set(key, cache.get(key) + "tampered")
+
+    assert resolve(**auth_headers(user, org)).profile.id == profile.id
+    # the profile entry is rebuilt, the untouched user entry is still used
+    assert profile_cache.stats()["misses"] == 3
+
+
+def test_api_key_resolves_admin_profile(member, django_assert_num_queries):
+    org, user, profile = member
+    request = resolve(HTTP_TOKEN=org.api_key, HTTP_ORG=str(org.id))
+    assert request.META["org"] == org.id
+    assert request.profile.id == profile.id
+
+    with django_assert_num_queries(0):
+        resolve(HTTP_TOKEN=org.api_key, HTTP_ORG=str(org.id))
+    with pytest.raises(PermissionDenied):
+        resolve(HTTP_TOKEN="not-a-key")
+
+
+def test_process_local_cache_is_not_trusted(member, monkeypatch):
+    org, user, profile = member
+    monkeypatch.setattr(profile_cache, "enabled", None)
+    resolve(**auth_headers(user, org))
+
+    # deactivated by another worker, whose version bump this one never sees
+    Profile.objects.filter(pk=profile.pk).update(is_active=False)
+    with pytest.raises(PermissionDenied):
+        resolve(**auth_headers(user, org))
+    assert profile_cache.stats()["local_hits"] == 0
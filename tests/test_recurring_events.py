@@ -0,0 +1,55 @@
+from datetime import date
+
+from common.models import Profile, User
+from contacts.models import Contact
+from events import views
+from events.models import Event
+from events.recurrence import recurring_dates
+from events.tasks import send_recurring_event_email
+from teams.models import Teams
+
+EVENTS_URL = "/api/events/"
+
+
+def test_recurring_dates_only_fall_on_requested_weekdays():
+    dates = recurring_dates(date(2024, 1, 1), date(2024, 1, 14), ["Monday", "Friday"])
+    assert dates == [date(2024, 1, 1), date(2024, 1, 5), date(2024, 1, 8), date(2024, 1, 12)]
+
+
+def test_recurring_event_is_created_in_bulk_with_one_invitation(
+    api_client, org, admin_profile, monkeypatch, mailoutbox, django_assert_max_num_queries
+):
+    monkeypatch.setattr(views.send_recurring_event_email, "delay", send_recurring_event_email)
+    member = Profile.objects.create(
+        user=User.objects.create(email="member@test.com"), org=org, role="USER"
+    )
+    contact = Contact.objects.create(
+        first_name="Jane", last_name="Doe", primary_email="jane@example.com", org=org
+    )
+    team = Teams.objects.create(name="Sales", description="", org=org)
+    payload = {
+        "name": "Standup",
+        "event_type": "Recurring",
+        "start_date": "2024-01-01",
+        "end_date": "2024-12-31",
+        "start_time": "09:00:00",
+        "end_time": "09:15:00",
+        "description": "Daily standup",
+        "recurring_days": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
+        "contacts": [str(contact.id)],
+        "teams": [str(team.id)],
+        "assigned_to": [str(admin_profile.id), str(member.id)],
+    }
+
+    with django_assert_max_num_queries(30):
+        response = api_client.post(EVENTS_URL, payload, format="json")
+    assert response.status_code == 200, response.json()
+
+    events = Event.objects.filter(org=org, name="Standup")
+    assert events.count() == 262
+    assert Event.assigned_to.through.objects.filter(event__in=events).count() == 524
+    assert Event.contacts.through.objects.filter(event__in=events).count() == 262
+    assert Event.teams.through.objects.filter(event__in=events).count() == 262
+    assert sorted(mail.to[0] for mail in mailoutbox) == ["admin@test.com", "member@test.com"]
+    assert "Jan. 1, 2024" in mailoutbox[0].body
+    assert "Dec. 31, 2024" in mailoutbox[0].body
@@ -0,0 +1,98 @@
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from common.benchmark import measure_auth
+from common.cache import profile_cache
+from common.models import Org
+from common.request_auth import get_request_auth
+
+PROFILE_URL = reverse("common_urls:common:profile")
+
+
+def jwt_request(profile, **headers):
+    return APIRequestFactory().get(
+        "/api/profile/",
+        HTTP_AUTHORIZATION="Bearer %s" % AccessToken.for_user(profile.user),
+        HTTP_ORG=str(profile.org_id),
+        **headers,
+    )
+
+
+def test_token_is_resolved_once_per_request(admin_profile, django_assert_num_queries):
+    request = jwt_request(admin_profile)
+
+    auth = get_request_auth(request)
+    with django_assert_num_queries(0):
+        assert get_request_auth(request) is auth
+        assert auth.user == admin_profile.user
+        assert auth.profile == admin_profile
+        assert auth.profile.user is auth.user
+        assert auth.org.id == admin_profile.org_id
+
+
+def test_cached_user_and_profile_need_no_queries(admin_profile, django_assert_num_queries):
+    get_request_auth(jwt_request(admin_profile))
+
+    with django_assert_num_queries(0):
+        auth = get_request_auth(jwt_request(admin_profile))
+    assert auth.user.email == admin_profile.user.email
+    # the password hash is never cached, it loads on demand
+    assert auth.user.check_password("testpass123")
+
+
+def test_user_changes_invalidate_the_cached_user(admin_profile):
+    get_request_auth(jwt_request(admin_profile))
+    admin_profile.user.is_active = False
+    admin_profile.user.save()
+
+    response = APIClient().get(
+        PROFILE_URL,
+        HTTP_AUTHORIZATION="Bearer %s" % AccessToken.for_user(admin_profile.user),
+        HTTP_ORG=str(admin_profile.org_id),
+    )
+    assert response.status_code == 403
+
+
+def test_api_requests_authenticate_through_the_shared_stage(api_client, admin_profile):
+    response = api_client.get(PROFILE_URL)
+
+    assert response.status_code == 200
+    assert response.wsgi_request._crm_auth.profile == admin_profile
+
+
+def test_bad_credentials_are_rejected(admin_profile):
+    client = APIClient()
+    refresh = RefreshToken.for_user(admin_profile.user)
+
+    assert client.get(PROFILE_URL).status_code == 401
+    client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+    assert client.get(PROFILE_URL).status_code == 403
+    client.credentials(HTTP_AUTHORIZATION="Bearer %s" % refresh)
+    assert client.get(PROFILE_URL).status_code == 403
+    client.credentials(
+        HTTP_AUTHORIZATION="Bearer %s" % refresh.access_token,
+        HTTP_ORG=str(Org.objects.create(name="Other Org").id),
+    )
+    assert client.get(PROFILE_URL).status_code == 403
+
+
+def test_api_key_resolves_the_orgs_admin_profile(admin_profile):
+    org = admin_profile.org
+    org.api_key = "secret-key"
+    org.save()
+    profile_cache.reset()
+
+    auth = get_request_auth(APIRequestFactory().get("/api/profile/", HTTP_TOKEN="secret-key"))
+
+    assert auth.org.id == org.id
+    assert auth.profile == admin_profile
+    assert auth.user == admin_profile.user
+
+
+def test_measure_auth_reports_the_pipeline_cost(admin_profile):
+    result = measure_auth(admin_profile, repeat=5, warmup=1)
+
+    assert result["status"] == 200
+    assert result["queries"] == 0
+    assert 0 < result["p50_ms"] <= result["p95_ms"]
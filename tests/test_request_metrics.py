@@ -0,0 +1,58 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from common.metrics import request_metrics
+
+LEADS_URL = reverse("common_urls:api_leads:lead-list")
+METRICS_URL = reverse("common_urls:common:request-metrics")
+LEADS_VIEW = "common_urls:api_leads:lead-list"
+
+
+@pytest.fixture(autouse=True)
+def metrics_enabled(settings):
+    settings.REQUEST_METRICS_ENABLED = True
+    settings.REQUEST_METRICS_TOKEN = "scrape-me"
+    request_metrics.clear()
+    yield
+    request_metrics.clear()
+
+
+def test_requests_are_recorded_per_view_and_org(api_client, org):
+    api_client.get(LEADS_URL)
+    api_client.get(LEADS_URL)
+
+    series = request_metrics.collect()[(LEADS_VIEW, str(org.id))]
+    assert series["requests"] == 2
+    assert series["queries"] >= 2
+    assert series["queries_max"] >= 1
+    assert series["db_time"] > 0
+    assert series["latency_buckets"][-1] == 2
+
+
+def test_metrics_endpoint_serves_prometheus_text(api_client, org):
+    api_client.get(LEADS_URL)
+
+    response = APIClient().get(METRICS_URL, HTTP_X_METRICS_TOKEN="scrape-me")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    body = response.content.decode()
+    labels = 'view="%s",org="%s"' % (LEADS_VIEW, org.id)
+    assert "crm_http_requests_total{%s} 1" % labels in body
+    assert 'crm_http_request_duration_seconds_bucket{%s,le="+Inf"} 1' % labels in body
+
+    assert APIClient().get(METRICS_URL).status_code in (401, 403)
+    assert APIClient().get(METRICS_URL, HTTP_X_METRICS_TOKEN="wrong").status_code in (401, 403)
+
+
+def test_command_lists_top_offenders(api_client):
+    api_client.get(LEADS_URL)
+    out = StringIO()
+
+    call_command("request_metrics", "--top", "5", "--clear", stdout=out)
+
+    assert LEADS_VIEW in out.getvalue()
+    assert request_metrics.collect() == {}
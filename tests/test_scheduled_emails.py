@@ -0,0 +1,74 @@
+import datetime
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from accounts import tasks
+from accounts.models import AccountEmail
+from accounts.scheduler import claim_due_emails
+
+NOW = datetime.datetime(2026, 5, 4, 12, 0, tzinfo=datetime.timezone.utc)
+
+
+def scheduled_email(wall_clock, tz="UTC"):
+    """An email the sender scheduled for ``wall_clock`` in ``tz``."""
+    return AccountEmail.objects.create(
+        message_subject="Hello",
+        message_body="Hi",
+        from_email="sales@example.com",
+        scheduled_later=True,
+        scheduled_date_time=timezone.make_aware(wall_clock),
+        timezone=tz,
+    )
+
+
+@pytest.fixture
+def settings_batch(settings):
+    settings.SCHEDULED_EMAIL_BATCH_SIZE = 2
+    settings.SCHEDULED_EMAIL_MAX_DELAY = 3600
+    return settings
+
+
+def test_due_at_is_the_senders_wall_clock_in_utc(db):
+    email = scheduled_email(datetime.datetime(2026, 5, 4, 9, 30), "America/New_York")
+
+    assert email.due_at == datetime.datetime(2026, 5, 4, 13, 30, tzinfo=datetime.timezone.utc)
+    assert AccountEmail.objects.create(from_email="now@example.com").due_at is None
+
+
+def test_claims_everything_overdue_once_and_expires_stale_emails(db, settings_batch):
+    missed = scheduled_email(datetime.datetime(2026, 5, 4, 11, 20))
+    due = scheduled_email(datetime.datetime(2026, 5, 4, 12, 0))
+    stale = scheduled_email(datetime.datetime(2026, 5, 4, 9, 0))
+    later = scheduled_email(datetime.datetime(2026, 5, 4, 12, 5))
+
+    first = claim_due_emails(now=NOW)
+    second = claim_due_emails(now=NOW)
+
+    assert first == ([missed.id], [stale.id])
+    assert second == ([due.id], [])
+    assert claim_due_emails(now=NOW) == ([], [])
+    missed.refresh_from_db()
+    stale.refresh_from_db()
+    later.refresh_from_db()
+    assert missed.due_at is None and missed.dispatched_at == NOW
+    assert stale.due_at is None and stale.dispatched_at is None
+    assert stale.expired_at == NOW
+    assert later.due_at is not None
+
+    # saving the expired email does not schedule it again
+    stale.message_subject = "Edited"
+    stale.save()
+    assert AccountEmail.objects.get(id=stale.id).due_at is None
+
+
+def test_send_scheduled_emails_queues_every_due_email(db, settings_batch):
+    emails = [scheduled_email(datetime.datetime(2026, 5, 4, 11, minute)) for minute in range(5)]
+
+    with mock.patch.object(tasks.send_email, "delay") as delay, mock.patch(
+        "accounts.scheduler.timezone.now", return_value=NOW
+    ):
+        assert tasks.send_scheduled_emails() == {"sent": 5, "expired": 0}
+
+    assert sorted(call.args[0] for call in delay.call_args_list) == sorted(e.id for e in emails)
@@ -0,0 +1,74 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import Account
+from common.models import Org, Profile, SearchDocument, User
+from contacts.models import Contact
+from leads.models import Lead
+
+SEARCH_URL = reverse("common_urls:common:search")
+
+
+def titles(response):
+    assert response.status_code == 200
+    return [(row["entity"], row["title"]) for row in response.json()["results"]]
+
+
+def test_search_documents_follow_saves_and_deletes(api_client, org):
+    lead = Lead.objects.create(title="Acme rollout", org=org, city="Berlin")
+    Account.objects.create(name="Acme GmbH", email="info@acme.test", org=org)
+    Contact.objects.create(
+        first_name="Jane", last_name="Doe", primary_email="jane@acme.test", org=org
+    )
+    Lead.objects.create(
+        title="Acme elsewhere", org=Org.objects.create(name="Other Org")
+    )
+
+    assert sorted(titles(api_client.get(SEARCH_URL, {"q": "acme"}))) == [
+        ("account", "Acme GmbH"), ("contact", "Jane Doe"), ("lead", "Acme rollout")
+    ]
+    assert titles(api_client.get(SEARCH_URL, {"q": "acme berlin"})) == [
+        ("lead", "Acme rollout")
+    ]
+    assert titles(api_client.get(SEARCH_URL, {"q": "acme", "entity": "account"})) == [
+        ("account", "Acme GmbH")
+    ]
+
+    lead.title = "Globex rollout"
+    lead.save()
+    assert titles(api_client.get(SEARCH_URL, {"q": "globex"})) == [
+        ("lead", "Globex rollout")
+    ]
+    lead.delete()
+    assert titles(api_client.get(SEARCH_URL, {"q": "globex"})) == []
+
+
+def test_search_is_permission_filtered_in_one_query(
+    api_client, org, django_assert_num_queries
+):
+    user = User.objects.create(email="user@test.com")
+    member = Profile.objects.create(user=user, org=org, role="USER")
+    mine = Lead.objects.create(title="Acme mine", org=org)
+    mine.assigned_to.add(member)
+    Lead.objects.create(title="Acme theirs", org=org)
+
+    api_client.credentials(
+        HTTP_AUTHORIZATION="Bearer %s" % AccessToken.for_user(user), HTTP_ORG=str(org.id)
+    )
+    assert titles(api_client.get(SEARCH_URL, {"q": "acme"})) == [("lead", "Acme mine")]
+
+    # only the search itself, the user and profile are cached
+    with django_assert_num_queries(1):
+        api_client.get(SEARCH_URL, {"q": "acme"})
+
+
+def test_rebuild_search_index_backfills_bulk_created_records(org):
+    Lead.objects.bulk_create([Lead(title="Bulk %s" % i, org=org) for i in range(3)])
+    assert not SearchDocument.objects.exists()
+
+    call_command("rebuild_search_index", entity=["lead"], stdout=StringIO())
+
+    assert SearchDocument.objects.filter(entity="lead").count() == 3
@@ -0,0 +1,42 @@
+from accounts.models import Account
+from common.models import Profile, User
+from leads.models import Lead
+from teams.models import Teams
+from teams.tasks import TEAM_MEMBER_RELATIONS, remove_users
+
+
+def test_remove_users_deletes_assignments_per_relation(
+    org, admin_profile, django_assert_max_num_queries
+):
+    leaving = Profile.objects.create(
+        user=User.objects.create(email="leaving@test.com"), org=org, role="USER"
+    )
+    team = Teams.objects.create(name="Sales", description="", org=org)
+    other_team = Teams.objects.create(name="Support", description="", org=org)
+    leads = [Lead.objects.create(title="Lead %s" % i, org=org) for i in range(20)]
+    for lead in leads:
+        lead.teams.add(team)
+        lead.assigned_to.add(leaving, admin_profile)
+    account = Account.objects.create(name="ACME", org=org)
+    account.teams.add(team)
+    account.assigned_to.add(leaving)
+    untouched = Lead.objects.create(title="Other team", org=org)
+    untouched.teams.add(other_team)
+    untouched.assigned_to.add(leaving)
+
+    # team + profiles lookups, one DELETE per relation, savepoint
+    with django_assert_max_num_queries(len(TEAM_MEMBER_RELATIONS) + 4):
+        stats = remove_users([str(leaving.id)], str(team.id))
+
+    assert stats["leads"]["removed"] == 20
+    assert stats["accounts"]["removed"] == 1
+    assert stats["cases"]["removed"] == 0
+    assert all("seconds" in relation for relation in stats.values())
+    assert not Lead.assigned_to.through.objects.filter(
+        lead__in=leads, profile=leaving
+    ).exists()
+    assert Lead.assigned_to.through.objects.filter(
+        lead__in=leads, profile=admin_profile
+    ).count() == 20
+    assert list(untouched.assigned_to.all()) == [leaving]
+    assert not account.assigned_to.exists()
@@ -0,0 +1,98 @@
+import io
+
+import pytest
+from billiard.pool import Pool
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from common import signals, thumbnails
+from common.models import Attachments
+from common.serializer import AttachmentsSerializer
+from common.tasks import generate_attachment_thumbnails
+
+
+@pytest.fixture
+def media(settings, tmp_path, monkeypatch):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.ATTACHMENT_THUMBNAIL_SIZE = 32
+    settings.ATTACHMENT_PREVIEW_SIZE = 128
+    settings.THUMBNAIL_WORKERS = 0
+    monkeypatch.setattr(
+        signals.generate_attachment_thumbnails, "delay", generate_attachment_thumbnails
+    )
+    return tmp_path
+
+
+def png(width, height):
+    output = io.BytesIO()
+    Image.new("RGBA", (width, height), (200, 10, 10, 128)).save(output, "PNG")
+    return output.getvalue()
+
+
+def upload(name, content, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        attachment = Attachments.objects.create(
+            file_name=name, attachment=SimpleUploadedFile(name, content)
+        )
+    attachment.refresh_from_db()
+    return attachment
+
+
+def test_image_uploads_get_thumbnails(media, db, django_capture_on_commit_callbacks):
+    attachment = upload("photo.png", png(800, 400), django_capture_on_commit_callbacks)
+
+    assert set(attachment.thumbnails) == {"thumbnail", "preview"}
+    sizes = {}
+    for name, path in attachment.thumbnails.items():
+        assert path.startswith(attachment.attachment.name.rsplit(".", 1)[0])
+        with Image.open(media / path) as image:
+            sizes[name] = (image.format, image.size, image.mode)
+    assert sizes == {
+        "thumbnail": ("WEBP", (32, 16), "RGBA"),
+        "preview": ("WEBP", (128, 64), "RGBA"),
+    }
+    urls = AttachmentsSerializer(attachment).data["thumbnails"]
+    assert urls["thumbnail"].endswith(".thumbnail.webp")
+
+
+def test_other_files_are_not_rendered(media, db, django_capture_on_commit_callbacks):
+    attachment = upload("notes.txt", b"hello", django_capture_on_commit_callbacks)
+
+    assert attachment.thumbnails == {}
+    assert AttachmentsSerializer(attachment).data["thumbnails"] == {}
+
+
+def test_stored_thumbnails_are_reused(media, db, django_capture_on_commit_callbacks, monkeypatch):
+    attachment = upload("photo.png", png(64, 64), django_capture_on_commit_callbacks)
+
+    def fail(*args):
+        raise AssertionError("rendered again")
+
+    monkeypatch.setattr(thumbnails, "render", fail)
+    names = thumbnails.generate_thumbnails(attachment.attachment, "image")
+    assert names == attachment.thumbnails
+
+
+def test_rendering_runs_in_the_process_pool(settings):
+    settings.THUMBNAIL_WORKERS = 1
+    rendered = thumbnails.render(png(300, 300), "image", {"thumbnail": 50})
+
+    with Image.open(io.BytesIO(rendered["thumbnail"])) as image:
+        assert image.size == (50, 50)
+
+
+def render_in_worker():
+    return thumbnails.render(png(300, 300), "image", {"thumbnail": 50})
+
+
+def test_prefork_workers_render_in_process(settings):
+    # celery's default pool, whose daemonic processes cannot start children
+    settings.THUMBNAIL_WORKERS = 1
+    pool = Pool(1)
+    try:
+        rendered = pool.apply(render_in_worker)
+    finally:
+        pool.terminate()
+
+    with Image.open(io.BytesIO(rendered["thumbnail"])) as image:
+        assert image.size == (50, 50)
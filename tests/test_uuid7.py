@@ -0,0 +1,31 @@
+import time
+
+from common.benchmark import measure_pk_inserts
+from common.ids import uuid7, uuid7_time
+from common.models import User
+from leads.models import Lead
+
+
+def test_uuid7_is_time_ordered_and_unique():
+    ids = [uuid7() for _ in range(20000)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    assert {value.version for value in ids} == {7}
+    assert abs(uuid7_time(ids[-1]) - time.time()) < 1
+
+
+def test_new_rows_get_increasing_ids(org):
+    leads = [Lead.objects.create(title="Lead %s" % i, org=org) for i in range(5)]
+    user = User.objects.create_user(email="new@example.com", password="x")
+
+    assert [lead.id for lead in leads] == sorted(lead.id for lead in leads)
+    assert list(Lead.objects.order_by("-id")) == leads[::-1]
+    assert user.id.version == 7
+
+
+def test_measure_pk_inserts_reports_throughput(db):
+    result = measure_pk_inserts("uuid7", rows=500, batch_size=100)
+
+    assert result["rows"] == 500
+    assert result["rows_per_s"] > 0 and result["tail_rows_per_s"] > 0